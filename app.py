@@ -1,12 +1,84 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, Response, stream_with_context, session, make_response
 from flask_sqlalchemy import SQLAlchemy
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+import click
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from functools import wraps
+import hashlib
+import os
+from sqlalchemy import func, and_, bindparam
+from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import OperationalError
+from sayfalama import keyset_sayfa, imlec_oku, limit_oku
+import istatistik
+import migrasyon
+import veritabani
+import disa_aktarim
+import ice_aktarim
+import onbellek
+import olay_akisi
+import metrikler
+import arama
+import gunluk_ozet
+import tembel_yukleme
+from telefon import telefon_anahtari
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'gizli-anahtar-buraya'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///kurye.db'
-db = SQLAlchemy(app)
+app.config['SQLALCHEMY_DATABASE_URI'] = veritabani.VARSAYILAN_URL
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = veritabani.motor_secenekleri()
+app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config.setdefault('RAPOR_ONBELLEK_BOYUTU', 128)
+app.config.setdefault('RAPOR_ONBELLEK_SURESI', 300)
+app.config.setdefault('SATIR_ONBELLEK_BOYUTU', 2000)
+# Süreç başına açık canlı pano akışı sınırı (0: sınırsız)
+app.config.setdefault('AZAMI_AKIS', 16)
+
+# Derlenmiş şablonlar yeniden başlatmalar arasında diskte saklanır
+JINJA_ONBELLEK_DIZINI = os.environ.get('KURYE_JINJA_ONBELLEK', os.path.join(app.root_path, '.jinja_onbellek'))
+os.makedirs(JINJA_ONBELLEK_DIZINI, exist_ok=True)
+app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(JINJA_ONBELLEK_DIZINI)}
+
+
+class KuryeSQLAlchemy(SQLAlchemy):
+    # Motor her süreçte ilk kullanımda tembel olarak kurulur; pragmalar da
+    # o anda bağlanır, böylece fork sonrası açılan bağlantılar da ayarlı olur
+    def create_engine(self, sa_url, engine_opts):
+        engine = veritabani.pragmalari_kur(super().create_engine(sa_url, engine_opts))
+        return metrikler.motoru_izle(engine)
+
+
+db = KuryeSQLAlchemy(app)
+
+# Rota süreleri, SQL sayıları ve /metrics uç noktası
+metrik_kaydi = metrikler.uygulamaya_bagla(app, metrikler.MetrikKaydi(os.environ.get('KURYE_METRIK_DIZINI')))
+
+# İstek başına tembel yükleme (N+1) denetimi; testlerde ve debug'da açılır
+tembel_denetci = tembel_yukleme.uygulamaya_bagla(app, db.session)
+
+def onbellekleri_kur():
+    # Önbellekler app.config'ten kurulur; uygulama_olustur ayarları uyguladıktan
+    # sonra yeniden çağırır
+    global rapor_onbellegi, satir_onbellegi
+    rapor_onbellegi = onbellek.RaporOnbellegi(
+        app.config['RAPOR_ONBELLEK_BOYUTU'],
+        app.config['RAPOR_ONBELLEK_SURESI']
+    )
+    # Satır HTML'i satırın gösterilen değerleriyle anahtarlanır; değer değişince
+    # anahtar da değiştiği için ayrıca geçersiz kılmaya gerek yoktur
+    satir_onbellegi = onbellek.RaporOnbellegi(app.config['SATIR_ONBELLEK_BOYUTU'], sure=3600)
+
+onbellekleri_kur()
+
+# Süreç başına tek yoklayıcı; motor fork sonrası tembel kurulduğu için çağrılabilir verilir
+olay_yayini = olay_akisi.OlayYayini(lambda: db.get_engine(app))
+
+# Raporların etkilendiği tablolar
+RAPOR_BAGIMLILIKLARI = {
+    'kurye_performans': ('kurye', 'teslimat'),
+    'teslimat_istatistikleri': ('kurye', 'teslimat')
+}
 
 class Kurye(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -21,20 +93,218 @@ class Teslimat(db.Model):
     adres = db.Column(db.String(200), nullable=False)
     musteri_adi = db.Column(db.String(100), nullable=False)
     musteri_telefon = db.Column(db.String(20), nullable=False)
+    musteri_telefon_anahtar = db.Column(db.String(20))
     baslangic_zamani = db.Column(db.DateTime, nullable=False)
     bitis_zamani = db.Column(db.DateTime)
     durum = db.Column(db.String(20), default='Devam Ediyor')
     ucret = db.Column(db.Float)
     kurye = db.relationship('Kurye', backref=db.backref('teslimatlar', lazy=True))
 
-with app.app_context():
-    db.create_all()
+    @db.validates('musteri_telefon')
+    def _telefon_anahtari_guncelle(self, anahtar, deger):
+        self.musteri_telefon_anahtar = telefon_anahtari(deger)
+        return deger
+
+def sema_hazirla():
+    # Tabloları oluşturur ve bekleyen migrasyonları uygular; süreç başına değil
+    # sunucu açılışında bir kez çalıştırılmalıdır
+    with app.app_context():
+        db.create_all()
+        uygulanan = migrasyon.migrasyonlari_uygula(db.engine)
+        # Açılışta kullanılan bağlantılar fork ile işçilere kopyalanmasın
+        db.engine.dispose()
+        return uygulanan
+
+
+@app.cli.command('ozet-yeniden-olustur')
+def ozet_yeniden_olustur_komutu():
+    # Günlük özet tablosunu ham teslimat ve gider kayıtlarından baştan hesaplar
+    with app.app_context():
+        with db.engine.begin() as baglanti:
+            gunluk_ozet.tetikleyicileri_kur(baglanti)
+            satir = gunluk_ozet.yeniden_olustur(baglanti)
+            # Önbellekteki raporlar yeni özetten hesaplansın
+            onbellek.surum_artir(baglanti, ('teslimat',))
+    click.echo(f'Günlük özet yeniden oluşturuldu: {satir} satır')
+
+
+@app.cli.command('sema-hazirla')
+def sema_hazirla_komutu():
+    uygulanan = sema_hazirla()
+    for surum, aciklama in uygulanan:
+        click.echo(f'Migrasyon uygulandı: {surum} - {aciklama}')
+    if not uygulanan:
+        click.echo('Şema güncel')
+
+
+def uygulama_olustur(ayarlar=None, sema_kontrolu=True):
+    # Üretim giriş noktası (wsgi.py, gunicorn). Süreçte tek uygulama vardır:
+    # modüldeki app yapılandırılıp döner. Ayarlar ortam değişkenlerinden ve
+    # verilen sözlükten okunur; önbellekler bu ayarlarla yeniden kurulur,
+    # motor ilk istekte kurulur. İstek almaya başlamış uygulamanın ayarları
+    # sessizce değişmesin diye ikinci yapılandırma reddedilir.
+    if app.got_first_request:
+        raise RuntimeError('Uygulama istek almaya başladıktan sonra yeniden yapılandırılamaz')
+    if os.environ.get('KURYE_DB_URI'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['KURYE_DB_URI']
+    if os.environ.get('KURYE_GIZLI_ANAHTAR'):
+        app.config['SECRET_KEY'] = os.environ['KURYE_GIZLI_ANAHTAR']
+    if os.environ.get('KURYE_AZAMI_AKIS'):
+        app.config['AZAMI_AKIS'] = int(os.environ['KURYE_AZAMI_AKIS'])
+    if ayarlar:
+        app.config.update(ayarlar)
+    onbellekleri_kur()
+    if sema_kontrolu:
+        for surum, aciklama in sema_hazirla():
+            app.logger.info('Migrasyon uygulandı: %s - %s', surum, aciklama)
+    return app
+
+def teslimat_olayi(tur, *idler):
+    # Canlı panoya gidecek olay; commit ile aynı işlemde yazılır
+    olay_akisi.olay_yaz(db.session, tur, idler or (None,))
+
+# Şablonlar değiştiğinde (yeni sürüm) eski ETag'ler geçersiz olsun
+ETAG_TOHUMU = str(max(
+    (os.path.getmtime(os.path.join(app.root_path, 'templates', ad))
+     for ad in os.listdir(os.path.join(app.root_path, 'templates'))),
+    default=0
+))
+
+def kosullu_get(*tablolar):
+    # Veri sürümü değişmediyse If-None-Match isteğine ORM ve Jinja'ya
+    # dokunmadan 304 döner
+    def dekorator(gorunum):
+        @wraps(gorunum)
+        def sarmalayici(*args, **kwargs):
+            # Bekleyen flash mesajı varsa sayfa mutlaka yeniden çizilmeli
+            if '_flashes' in session:
+                return gorunum(*args, **kwargs)
+
+            with db.engine.connect() as baglanti:
+                surum = onbellek.surumleri_oku(baglanti, tablolar)
+            etag = hashlib.sha1(repr((
+                ETAG_TOHUMU, request.full_path, surum, datetime.now().date()
+            )).encode()).hexdigest()
+
+            if request.if_none_match.contains(etag):
+                yanit = Response(status=304)
+            else:
+                yanit = make_response(gorunum(*args, **kwargs))
+            yanit.set_etag(etag)
+            yanit.headers['Cache-Control'] = 'private, no-cache'
+            return yanit
+        return sarmalayici
+    return dekorator
+
+@app.errorhandler(OperationalError)
+def veritabani_hatasi(hata):
+    # Yazma kilidi busy_timeout içinde alınamadıysa 500 yerine 503 + Retry-After:
+    # istemci (ve yük testi) bunu geçici bir yoğunluk olarak görür
+    db.session.rollback()
+    if 'locked' not in str(hata.orig):
+        raise hata
+    mesaj = 'Veritabanı şu anda meşgul, lütfen tekrar deneyin'
+    if request.path.startswith('/api/'):
+        yanit = make_response(jsonify({'hata': mesaj}), 503)
+    else:
+        yanit = make_response(mesaj, 503)
+    yanit.headers['Retry-After'] = '1'
+    return yanit
+
+def onbellekli_rapor(ad, parametreler, hesapla):
+    surum = onbellek.surumleri_oku(db.session, RAPOR_BAGIMLILIKLARI[ad])
+    anahtar = (ad, parametreler)
+    sonuc = rapor_onbellegi.getir(anahtar, surum)
+    if sonuc is None:
+        sonuc = hesapla()
+        rapor_onbellegi.koy(anahtar, surum, sonuc)
+    return sonuc
+
+def satir_parcasi(sablon, anahtar, **baglam):
+    html = satir_onbellegi.getir((sablon, anahtar), 0)
+    if html is None:
+        html = Markup(app.jinja_env.get_template(sablon).render(**baglam))
+        satir_onbellegi.koy((sablon, anahtar), 0, html)
+    return html
+
+@app.template_global()
+def kurye_satiri_html(kurye):
+    anahtar = (kurye.id, kurye.ad, kurye.telefon, kurye.kayit_tarihi)
+    return satir_parcasi('_kurye_satiri.html', anahtar, kurye=kurye)
+
+@app.template_global()
+def teslimat_satiri_html(teslimat):
+    anahtar = (
+        teslimat.id, teslimat.kurye.ad, teslimat.musteri_adi, teslimat.adres,
+        teslimat.musteri_telefon, teslimat.baslangic_zamani, teslimat.bitis_zamani,
+        teslimat.durum, teslimat.ucret
+    )
+    return satir_parcasi('_teslimat_satiri.html', anahtar, teslimat=teslimat)
+
+def duzenleme_verisi(kuryeler, teslimatlar):
+    # Ortak düzenleme pencerelerini dolduran veri adası (index.html)
+    return {
+        'kuryeler': {k.id: [k.ad, k.telefon] for k in kuryeler},
+        'teslimatlar': {
+            t.id: [t.adres, t.musteri_adi, t.musteri_telefon, t.baslangic_zamani.strftime('%Y-%m-%dT%H:%M')]
+            for t in teslimatlar
+        }
+    }
 
 @app.route('/')
+@kosullu_get('kurye', 'teslimat')
 def ana_sayfa():
-    kuryeler = Kurye.query.filter_by(aktif=True).all()
-    teslimatlar = Teslimat.query.all()
-    return render_template('index.html', kuryeler=kuryeler, teslimatlar=teslimatlar)
+    limit = limit_oku(request.args.get('limit'))
+    durum = request.args.get('durum') or None
+    kurye_filtre = imlec_oku(request.args.get('kurye_id'))
+
+    # Form ve filtre seçimleri için yalnızca id ve ad
+    kurye_secenekleri = db.session.query(Kurye.id, Kurye.ad)\
+        .filter(Kurye.aktif == True)\
+        .order_by(Kurye.ad)\
+        .all()
+
+    kurye_sayfasi = keyset_sayfa(
+        Kurye.query.filter_by(aktif=True),
+        Kurye.id,
+        sonra=imlec_oku(request.args.get('kurye_sonra')),
+        once=imlec_oku(request.args.get('kurye_once')),
+        limit=limit
+    )
+
+    # Satırlar kurye adını gösterir; kurye aynı sorguda yüklenir
+    teslimat_sorgu = Teslimat.query.options(joinedload(Teslimat.kurye))
+    if durum:
+        teslimat_sorgu = teslimat_sorgu.filter(Teslimat.durum == durum)
+    if kurye_filtre:
+        teslimat_sorgu = teslimat_sorgu.filter(Teslimat.kurye_id == kurye_filtre)
+    teslimat_sayfasi = keyset_sayfa(
+        teslimat_sorgu,
+        Teslimat.id,
+        sonra=imlec_oku(request.args.get('teslimat_sonra')),
+        once=imlec_oku(request.args.get('teslimat_once')),
+        limit=limit
+    )
+
+    # Sayfa bağlantılarında korunacak filtreler
+    filtreler = {k: v for k, v in {
+        'durum': durum,
+        'kurye_id': kurye_filtre,
+        'limit': request.args.get('limit')
+    }.items() if v}
+
+    return render_template(
+        'index.html',
+        kurye_secenekleri=kurye_secenekleri,
+        kuryeler=kurye_sayfasi.ogeler,
+        kurye_sayfasi=kurye_sayfasi,
+        teslimatlar=teslimat_sayfasi.ogeler,
+        teslimat_sayfasi=teslimat_sayfasi,
+        duzenleme_verisi=duzenleme_verisi(kurye_sayfasi.ogeler, teslimat_sayfasi.ogeler),
+        filtreler=filtreler,
+        durum=durum,
+        kurye_filtre=kurye_filtre
+    )
 
 @app.route('/kurye/ekle', methods=['POST'])
 def kurye_ekle():
@@ -79,14 +349,149 @@ def teslimat_ekle():
         baslangic_zamani=baslangic_zamani
     )
     db.session.add(yeni_teslimat)
+    db.session.flush()
+    teslimat_olayi('ekle', yeni_teslimat.id)
     db.session.commit()
     flash('Teslimat başarıyla eklendi!', 'success')
     return redirect(url_for('ana_sayfa'))
 
+TESLIMAT_DURUMLARI = ('Devam Ediyor', 'Tamamlandı')
+# JSONL'de sayı / liste gibi gelebilen, metin olması gereken alanlar
+TESLIMAT_METIN_ALANLARI = (
+    'adres', 'musteri_adi', 'musteri_telefon', 'baslangic_zamani', 'bitis_zamani',
+    'durum', 'kurye_telefon'
+)
+# Zorunlu metin alanları ve kolon uzunlukları (içe aktarma ve API ortak)
+TESLIMAT_METIN_UZUNLUKLARI = {'adres': 200, 'musteri_adi': 100, 'musteri_telefon': 20}
+KURYE_METIN_UZUNLUKLARI = {'ad': 100, 'telefon': 20}
+
+def zaman_oku(deger):
+    if not isinstance(deger, str):
+        raise ice_aktarim.SatirHatasi(f'Geçersiz zaman: {deger!r}')
+    for bicim in ('%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(deger.strip(), bicim)
+        except ValueError:
+            continue
+    raise ice_aktarim.SatirHatasi(f'Geçersiz zaman: {deger}')
+
+def metin_oku(deger, alan, uzunluk):
+    if deger is None or (isinstance(deger, str) and not deger.strip()):
+        raise ice_aktarim.SatirHatasi(f'{alan} boş olamaz')
+    if not isinstance(deger, str):
+        raise ice_aktarim.SatirHatasi(f'{alan} metin olmalı')
+    return deger.strip()[:uzunluk]
+
+def ucret_oku(deger):
+    if deger is None or deger == '':
+        return None
+    if isinstance(deger, bool) or not isinstance(deger, (int, float, str)):
+        raise ice_aktarim.SatirHatasi('ucret sayı olmalı')
+    try:
+        return float(deger)
+    except ValueError:
+        raise ice_aktarim.SatirHatasi(f'Geçersiz ücret: {deger}')
+
+def kurye_haritasi():
+    # İçe aktarma boyunca bellekte tutulan id / telefon -> kurye_id eşlemesi
+    haritalar = {'id': set(), 'telefon': {}}
+    for kurye_id, telefon in db.session.query(Kurye.id, Kurye.telefon).filter(Kurye.aktif == True):
+        haritalar['id'].add(kurye_id)
+        haritalar['telefon'][telefon.strip()] = kurye_id
+    return haritalar
+
+def teslimat_satiri_dogrulayici(haritalar):
+    def dogrula(satir):
+        satir = {k: (v.strip() if isinstance(v, str) else v) for k, v in satir.items() if k}
+        for alan in TESLIMAT_METIN_ALANLARI:
+            if satir.get(alan) is not None and not isinstance(satir[alan], str):
+                raise ice_aktarim.SatirHatasi(f'{alan} metin olmalı')
+        if isinstance(satir.get('kurye_id'), (bool, list, dict)):
+            raise ice_aktarim.SatirHatasi('kurye_id sayı olmalı')
+
+        kurye_id = None
+        if satir.get('kurye_id') not in (None, ''):
+            kurye_id = int(satir['kurye_id'])
+            if kurye_id not in haritalar['id']:
+                raise ice_aktarim.SatirHatasi(f'Kurye bulunamadı: {kurye_id}')
+        elif satir.get('kurye_telefon'):
+            kurye_id = haritalar['telefon'].get(satir['kurye_telefon'])
+            if kurye_id is None:
+                raise ice_aktarim.SatirHatasi(f'Telefonla kurye bulunamadı: {satir["kurye_telefon"]}')
+        else:
+            raise ice_aktarim.SatirHatasi('kurye_id veya kurye_telefon gerekli')
+
+        metinler = {
+            alan: metin_oku(satir.get(alan), alan, uzunluk)
+            for alan, uzunluk in TESLIMAT_METIN_UZUNLUKLARI.items()
+        }
+        if not satir.get('baslangic_zamani'):
+            raise ice_aktarim.SatirHatasi('baslangic_zamani boş olamaz')
+
+        durum = satir.get('durum') or 'Devam Ediyor'
+        if durum not in TESLIMAT_DURUMLARI:
+            raise ice_aktarim.SatirHatasi(f'Geçersiz durum: {durum}')
+
+        return {
+            'kurye_id': kurye_id,
+            **metinler,
+            'musteri_telefon_anahtar': telefon_anahtari(metinler['musteri_telefon']),
+            'baslangic_zamani': zaman_oku(satir['baslangic_zamani']),
+            'bitis_zamani': zaman_oku(satir['bitis_zamani']) if satir.get('bitis_zamani') else None,
+            'durum': durum,
+            'ucret': ucret_oku(satir.get('ucret'))
+        }
+    return dogrula
+
+def teslimatlari_ice_aktar(dosya, bicim):
+    rapor = ice_aktarim.toplu_ekle(
+        db.engine,
+        Teslimat.__table__,
+        ice_aktarim.satirlari_oku(dosya, bicim),
+        teslimat_satiri_dogrulayici(kurye_haritasi())
+    )
+    if rapor['eklenen']:
+        teslimat_olayi('yenile')
+        db.session.commit()
+    return rapor
+
+@app.route('/teslimat/ice-aktar', methods=['POST'])
+def teslimat_ice_aktar():
+    dosya = request.files.get('dosya')
+    if not dosya or not dosya.filename:
+        flash('Lütfen bir dosya seçin!', 'danger')
+        return redirect(url_for('ana_sayfa'))
+    bicim = request.form.get('bicim') or dosya.filename.rsplit('.', 1)[-1].lower()
+    if bicim not in ('csv', 'jsonl'):
+        flash(f'Desteklenmeyen biçim: {bicim}', 'danger')
+        return redirect(url_for('ana_sayfa'))
+
+    rapor = teslimatlari_ice_aktar(dosya.stream, bicim)
+
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify(rapor)
+    flash(f'{rapor["eklenen"]} teslimat içe aktarıldı, {rapor["hatali"]} satır hatalı.',
+          'success' if not rapor['hatali'] else 'warning')
+    for hata in rapor['hatalar'][:10]:
+        flash(f'Satır {hata["satir"]}: {hata["hata"]}', 'danger')
+    return redirect(url_for('ana_sayfa'))
+
+@app.cli.command('teslimat-ice-aktar')
+@click.argument('dosya_yolu', type=click.Path(exists=True, dir_okay=False))
+@click.option('--bicim', type=click.Choice(['csv', 'jsonl']), default=None)
+def teslimat_ice_aktar_komutu(dosya_yolu, bicim):
+    bicim = bicim or dosya_yolu.rsplit('.', 1)[-1].lower()
+    with open(dosya_yolu, encoding='utf-8-sig', newline='') as dosya:
+        rapor = teslimatlari_ice_aktar(dosya, bicim)
+    click.echo(f'Eklenen: {rapor["eklenen"]}, hatalı: {rapor["hatali"]}')
+    for hata in rapor['hatalar']:
+        click.echo(f'  Satır {hata["satir"]}: {hata["hata"]}')
+
 @app.route('/teslimat/sil/<int:id>', methods=['POST'])
 def teslimat_sil(id):
     teslimat = Teslimat.query.get_or_404(id)
     db.session.delete(teslimat)
+    teslimat_olayi('sil', id)
     db.session.commit()
     flash('Teslimat başarıyla silindi!', 'success')
     return redirect(url_for('ana_sayfa'))
@@ -98,6 +503,7 @@ def teslimat_duzenle(id):
     teslimat.musteri_adi = request.form['musteri_adi']
     teslimat.musteri_telefon = request.form['musteri_telefon']
     teslimat.baslangic_zamani = datetime.strptime(request.form['baslangic_zamani'], '%Y-%m-%dT%H:%M')
+    teslimat_olayi('guncelle', id)
     db.session.commit()
     flash('Teslimat başarıyla güncellendi!', 'success')
     return redirect(url_for('ana_sayfa'))
@@ -108,87 +514,552 @@ def teslimat_tamamla(id):
     teslimat.bitis_zamani = datetime.utcnow()
     teslimat.durum = 'Tamamlandı'
     teslimat.ucret = float(request.form['ucret'])
+    teslimat_olayi('tamamla', id)
     db.session.commit()
     flash('Teslimat başarıyla tamamlandı!', 'success')
     return redirect(url_for('ana_sayfa'))
 
+@app.route('/akis/teslimatlar')
+def teslimat_akisi():
+    # Server-Sent Events: tarayıcı yeniden bağlanırken Last-Event-ID gönderir.
+    # Oturum veya veritabanı bağlantısı akış boyunca tutulmaz.
+    sonra = imlec_oku(request.headers.get('Last-Event-ID') or request.args.get('son'))
+    # Açık akışlar işçinin tüm iş parçacıklarını tutmasın diye sayı sınırlıdır
+    if not olay_yayini.yer_al(app.config['AZAMI_AKIS']):
+        yanit = Response(olay_akisi.dolu_yaniti(), status=503, mimetype='text/event-stream')
+        yanit.headers['Retry-After'] = str(olay_akisi.DOLU_BEKLEME)
+        return yanit
+    yanit = Response(olay_yayini.dinle(sonra), mimetype='text/event-stream')
+    yanit.call_on_close(olay_yayini.yer_birak)
+    yanit.headers['Cache-Control'] = 'no-cache'
+    yanit.headers['X-Accel-Buffering'] = 'no'
+    return yanit
+
+@app.route('/teslimat/<int:id>/satir')
+def teslimat_satiri(id):
+    # Canlı panonun yamaladığı tek satır; sayfanın filtresine uymuyorsa 204
+    sorgu = Teslimat.query.options(joinedload(Teslimat.kurye)).filter(Teslimat.id == id)
+    if request.args.get('durum'):
+        sorgu = sorgu.filter(Teslimat.durum == request.args['durum'])
+    kurye_filtre = imlec_oku(request.args.get('kurye_id'))
+    if kurye_filtre:
+        sorgu = sorgu.filter(Teslimat.kurye_id == kurye_filtre)
+    teslimat = sorgu.first()
+    if teslimat is None:
+        return '', 204
+    return teslimat_satiri_html(teslimat)
+
+def tarih_parametresi(deger, bitis=False):
+    # 'YYYY-MM-DD' veya 'YYYY-MM-DDTHH:MM' kabul edilir. Bitiş sınırı hariç
+    # tutulur; yalnızca gün verilmişse o günün tamamı aralığa dahil olur.
+    if not deger:
+        return None
+    for bicim in ('%Y-%m-%dT%H:%M', '%Y-%m-%d'):
+        try:
+            zaman = datetime.strptime(deger, bicim)
+        except ValueError:
+            continue
+        if bitis and bicim == '%Y-%m-%d':
+            zaman += timedelta(days=1)
+        return zaman
+    return None
+
+def kurye_performans_verisi(baslangic=None, bitis=None):
+    # Tüm aktif kuryeler için tek bir gruplu sorgu; ORM nesnesi yerine düz satırlar döner.
+    # Gün sınırındaki aralıklar günlük özetten, diğerleri ham teslimatlardan okunur.
+    if istatistik.gun_hizali(baslangic, bitis):
+        return kurye_performans_ozetten(baslangic, bitis)
+    kosullar = [Teslimat.kurye_id == Kurye.id, Teslimat.durum == 'Tamamlandı']
+    if baslangic:
+        kosullar.append(Teslimat.baslangic_zamani >= baslangic)
+    if bitis:
+        kosullar.append(Teslimat.baslangic_zamani < bitis)
+
+    sure_saat = (func.julianday(Teslimat.bitis_zamani) - func.julianday(Teslimat.baslangic_zamani)) * 24
+
+    return db.session.query(
+        Kurye.id,
+        Kurye.ad,
+        Kurye.telefon,
+        func.count(Teslimat.id).label('toplam_teslimat'),
+        func.coalesce(func.sum(Teslimat.ucret), 0).label('toplam_ucret'),
+        func.coalesce(func.avg(sure_saat), 0).label('ortalama_sure')
+    ).outerjoin(Teslimat, and_(*kosullar))\
+        .filter(Kurye.aktif == True)\
+        .group_by(Kurye.id)\
+        .order_by(Kurye.ad)\
+        .all()
+
+def kurye_performans_ozetten(baslangic=None, bitis=None):
+    ozet = gunluk_ozet.gunluk_ozet.c
+    kosullar = [ozet.kurye_id == Kurye.id, ozet.durum == 'Tamamlandı']
+    if baslangic:
+        kosullar.append(ozet.gun >= istatistik.gun_metni(baslangic))
+    if bitis:
+        kosullar.append(ozet.gun < istatistik.gun_metni(bitis))
+
+    return db.session.query(
+        Kurye.id,
+        Kurye.ad,
+        Kurye.telefon,
+        func.coalesce(func.sum(ozet.adet), 0).label('toplam_teslimat'),
+        func.round(func.coalesce(func.sum(ozet.ciro), 0), 2).label('toplam_ucret'),
+        func.coalesce(func.sum(ozet.sure_toplam) / func.nullif(func.sum(ozet.sure_adet), 0), 0).label('ortalama_sure')
+    ).outerjoin(gunluk_ozet.gunluk_ozet, and_(*kosullar))\
+        .filter(Kurye.aktif == True)\
+        .group_by(Kurye.id)\
+        .order_by(Kurye.ad)\
+        .all()
+
+TESLIMAT_AKTARIM_ALANLARI = [
+    'id', 'kurye_id', 'kurye', 'adres', 'musteri_adi', 'musteri_telefon',
+    'baslangic_zamani', 'bitis_zamani', 'durum', 'ucret'
+]
+
+@app.route('/teslimat/disa-aktar')
+def teslimat_disa_aktar():
+    bicim = request.args.get('bicim', 'csv')
+    if bicim not in disa_aktarim.BICIMLER:
+        return jsonify({'hata': f'Desteklenmeyen biçim: {bicim}'}), 400
+
+    sorgu = db.session.query(
+        Teslimat.id, Teslimat.kurye_id, Kurye.ad, Teslimat.adres, Teslimat.musteri_adi,
+        Teslimat.musteri_telefon, Teslimat.baslangic_zamani, Teslimat.bitis_zamani,
+        Teslimat.durum, Teslimat.ucret
+    ).join(Kurye, Teslimat.kurye_id == Kurye.id)
+
+    kurye_id = imlec_oku(request.args.get('kurye_id'))
+    if kurye_id:
+        sorgu = sorgu.filter(Teslimat.kurye_id == kurye_id)
+    if request.args.get('durum'):
+        sorgu = sorgu.filter(Teslimat.durum == request.args['durum'])
+    baslangic = tarih_parametresi(request.args.get('baslangic'))
+    if baslangic:
+        sorgu = sorgu.filter(Teslimat.baslangic_zamani >= baslangic)
+    bitis = tarih_parametresi(request.args.get('bitis'), bitis=True)
+    if bitis:
+        sorgu = sorgu.filter(Teslimat.baslangic_zamani < bitis)
+
+    mimetype, uzanti = disa_aktarim.BICIMLER[bicim]
+    dosya_adi = f'teslimatlar_{datetime.now().strftime("%Y%m%d_%H%M")}.{uzanti}'
+    return Response(
+        stream_with_context(disa_aktarim.akis(sorgu.order_by(Teslimat.id), TESLIMAT_AKTARIM_ALANLARI, bicim)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={dosya_adi}'}
+    )
+
 @app.route('/rapor/kurye-performans')
+@kosullu_get(*RAPOR_BAGIMLILIKLARI['kurye_performans'])
 def kurye_performans():
-    kuryeler = Kurye.query.filter_by(aktif=True).all()
-    performans = []
-    
-    for kurye in kuryeler:
-        tamamlanan_teslimatlar = Teslimat.query.filter_by(
-            kurye_id=kurye.id,
-            durum='Tamamlandı'
-        ).all()
-        
-        toplam_teslimat = len(tamamlanan_teslimatlar)
-        toplam_ucret = sum(t.ucret for t in tamamlanan_teslimatlar if t.ucret)
-        ortalama_sure = 0
-        
-        if tamamlanan_teslimatlar:
-            toplam_sure = sum(
-                (t.bitis_zamani - t.baslangic_zamani).total_seconds() / 3600
-                for t in tamamlanan_teslimatlar
-                if t.bitis_zamani
-            )
-            ortalama_sure = toplam_sure / toplam_teslimat
-        
-        performans.append({
-            'kurye': kurye,
-            'toplam_teslimat': toplam_teslimat,
-            'toplam_ucret': toplam_ucret,
-            'ortalama_sure': round(ortalama_sure, 2)
-        })
-    
-    return render_template('kurye_performans.html', performans=performans)
+    baslangic = tarih_parametresi(request.args.get('baslangic'))
+    bitis = tarih_parametresi(request.args.get('bitis'), bitis=True)
+
+    performans = onbellekli_rapor('kurye_performans', (baslangic, bitis), lambda: [{
+        'kurye_id': satir.id,
+        'ad': satir.ad,
+        'telefon': satir.telefon,
+        'toplam_teslimat': satir.toplam_teslimat,
+        'toplam_ucret': satir.toplam_ucret,
+        'ortalama_sure': round(satir.ortalama_sure, 2)
+    } for satir in kurye_performans_verisi(baslangic, bitis)])
+
+    return render_template(
+        'kurye_performans.html',
+        performans=performans,
+        baslangic=request.args.get('baslangic', ''),
+        bitis=request.args.get('bitis', '')
+    )
 
 @app.route('/rapor/teslimat-istatistikleri')
+@kosullu_get(*RAPOR_BAGIMLILIKLARI['teslimat_istatistikleri'])
 def teslimat_istatistikleri():
     bugun = datetime.now().date()
-    hafta_basi = bugun - timedelta(days=bugun.weekday())
-    ay_basi = bugun.replace(day=1)
-    
-    # Günlük istatistikler
-    gunluk_teslimatlar = Teslimat.query.filter(
-        func.date(Teslimat.baslangic_zamani) == bugun
-    ).all()
-    
-    # Haftalık istatistikler
-    haftalik_teslimatlar = Teslimat.query.filter(
-        func.date(Teslimat.baslangic_zamani) >= hafta_basi
-    ).all()
-    
-    # Aylık istatistikler
-    aylik_teslimatlar = Teslimat.query.filter(
-        func.date(Teslimat.baslangic_zamani) >= ay_basi
-    ).all()
-    
-    istatistikler = {
-        'gunluk': {
-            'toplam': len(gunluk_teslimatlar),
-            'tamamlanan': len([t for t in gunluk_teslimatlar if t.durum == 'Tamamlandı']),
-            'toplam_ucret': sum(t.ucret for t in gunluk_teslimatlar if t.ucret)
-        },
-        'haftalik': {
-            'toplam': len(haftalik_teslimatlar),
-            'tamamlanan': len([t for t in haftalik_teslimatlar if t.durum == 'Tamamlandı']),
-            'toplam_ucret': sum(t.ucret for t in haftalik_teslimatlar if t.ucret)
-        },
-        'aylik': {
-            'toplam': len(aylik_teslimatlar),
-            'tamamlanan': len([t for t in aylik_teslimatlar if t.durum == 'Tamamlandı']),
-            'toplam_ucret': sum(t.ucret for t in aylik_teslimatlar if t.ucret)
-        }
-    }
-    
-    return render_template('teslimat_istatistikleri.html', istatistikler=istatistikler)
+    istatistikler = onbellekli_rapor(
+        'teslimat_istatistikleri', ('ozet', bugun),
+        lambda: istatistik.donem_ozetleri(db.session, bugun)
+    )
+
+    # İsteğe bağlı: seçilen aralık için dönem serisi
+    seri = None
+    seri_hatasi = None
+    aralik = request.args.get('aralik', 'gun')
+    baslangic = tarih_parametresi(request.args.get('baslangic'))
+    bitis = tarih_parametresi(request.args.get('bitis'), bitis=True)
+    kurye_filtre = imlec_oku(request.args.get('kurye_id'))
+    if baslangic and bitis and aralik in istatistik.ARALIKLAR \
+            and istatistik.donem_sayisi(baslangic, bitis, aralik) > istatistik.AZAMI_DONEM:
+        # Sınırsız aralık sayfayı yüzlerce MB'a çıkarır ve önbelleğe de yazılırdı
+        seri_hatasi = f'Seçilen aralık {istatistik.AZAMI_DONEM} dönemden fazla; daha kısa bir aralık veya daha büyük bir dönem seçin.'
+    elif baslangic and bitis and aralik in istatistik.ARALIKLAR:
+        if aralik in istatistik.OZET_ARALIKLARI and istatistik.gun_hizali(baslangic, bitis):
+            hesapla = lambda: istatistik.ozet_serisi(db.session, baslangic, bitis, aralik, kurye_filtre)
+        else:
+            filtreler = [Teslimat.kurye_id == kurye_filtre] if kurye_filtre else []
+            hesapla = lambda: istatistik.zaman_serisi(
+                db.session, Teslimat.baslangic_zamani, baslangic, bitis, aralik, filtreler
+            )
+        seri = onbellekli_rapor(
+            'teslimat_istatistikleri', ('seri', baslangic, bitis, aralik, kurye_filtre), hesapla
+        )
+
+    kurye_secenekleri = db.session.query(Kurye.id, Kurye.ad)\
+        .filter(Kurye.aktif == True)\
+        .order_by(Kurye.ad)\
+        .all()
+
+    return render_template(
+        'teslimat_istatistikleri.html',
+        istatistikler=istatistikler,
+        seri=seri,
+        seri_hatasi=seri_hatasi,
+        aralik=aralik,
+        kurye_secenekleri=kurye_secenekleri,
+        kurye_filtre=kurye_filtre,
+        baslangic=request.args.get('baslangic', ''),
+        bitis=request.args.get('bitis', '')
+    ), 400 if seri_hatasi else 200
 
 @app.route('/musteri/gecmis/<telefon>')
+@kosullu_get('kurye', 'teslimat')
 def musteri_gecmis(telefon):
-    teslimatlar = Teslimat.query.filter_by(musteri_telefon=telefon).all()
-    return render_template('musteri_gecmis.html', teslimatlar=teslimatlar)
+    anahtar = telefon_anahtari(telefon)
+
+    # Özet başlık: satırları yüklemeden tek toplama sorgusu
+    ozet = db.session.query(
+        func.count(Teslimat.id).label('siparis_sayisi'),
+        func.coalesce(func.sum(Teslimat.ucret), 0).label('toplam_harcama'),
+        func.max(Teslimat.baslangic_zamani).label('son_siparis')
+    ).filter(Teslimat.musteri_telefon_anahtar == anahtar).one()
+
+    sayfa = keyset_sayfa(
+        Teslimat.query.options(joinedload(Teslimat.kurye)).filter(Teslimat.musteri_telefon_anahtar == anahtar),
+        Teslimat.id,
+        sonra=imlec_oku(request.args.get('sonra')),
+        once=imlec_oku(request.args.get('once')),
+        limit=limit_oku(request.args.get('limit'))
+    )
+    return render_template(
+        'musteri_gecmis.html',
+        telefon=telefon,
+        ozet=ozet,
+        teslimatlar=sayfa.ogeler,
+        sayfa=sayfa
+    )
+
+def teslimat_arama(metin, limit):
+    # FTS5 dizininden alaka sırasıyla id'ler, ardından tek sorguda satırlar
+    idler = arama.ara(db.session.connection(), 'teslimat_ara', metin, limit)
+    if not idler:
+        return []
+    teslimatlar = Teslimat.query.options(joinedload(Teslimat.kurye)).filter(Teslimat.id.in_(idler)).all()
+    return arama.sirala(teslimatlar, idler)
+
+@app.route('/ara')
+def teslimat_ara():
+    metin = request.args.get('q', '').strip()
+    teslimatlar = teslimat_arama(metin, limit_oku(request.args.get('limit'))) if metin else []
+    return render_template('arama.html', metin=metin, teslimatlar=teslimatlar)
+
+# --- JSON API (v1) ---
+
+KURYE_API_ALANLARI = ('id', 'ad', 'telefon', 'kayit_tarihi', 'aktif')
+TESLIMAT_API_ALANLARI = (
+    'id', 'kurye_id', 'adres', 'musteri_adi', 'musteri_telefon',
+    'baslangic_zamani', 'bitis_zamani', 'durum', 'ucret'
+)
+
+def api_hatasi(mesaj, durum=400):
+    return jsonify({'hata': mesaj}), durum
+
+def json_degeri(deger):
+    if isinstance(deger, datetime):
+        return deger.isoformat()
+    return deger
+
+def api_alanlari(izinli):
+    # ?alanlar=id,ad ile seyrek alan seçimi; id imleç için her zaman döner
+    istenen = [a for a in (request.args.get('alanlar') or '').split(',') if a]
+    gecersiz = [a for a in istenen if a not in izinli]
+    if gecersiz:
+        raise ice_aktarim.SatirHatasi(f'Geçersiz alan: {", ".join(gecersiz)}')
+    return ['id'] + [a for a in (istenen or izinli) if a != 'id']
+
+def api_liste(model, izinli, sorgu_filtreleri):
+    try:
+        alanlar = api_alanlari(izinli)
+    except ice_aktarim.SatirHatasi as e:
+        return api_hatasi(str(e))
+    sorgu = db.session.query(*[getattr(model, a) for a in alanlar]).filter(*sorgu_filtreleri)
+    sayfa = keyset_sayfa(
+        sorgu,
+        model.id,
+        sonra=imlec_oku(request.args.get('sonra')),
+        once=imlec_oku(request.args.get('once')),
+        limit=limit_oku(request.args.get('limit'))
+    )
+    return jsonify({
+        'veri': [{a: json_degeri(d) for a, d in zip(alanlar, satir)} for satir in sayfa.ogeler],
+        'sonraki': sayfa.sonraki,
+        'onceki': sayfa.onceki
+    })
+
+def nesne_json(nesne, alanlar):
+    return {a: json_degeri(getattr(nesne, a)) for a in alanlar}
+
+def api_govdesi():
+    govde = request.get_json(silent=True)
+    if not isinstance(govde, dict):
+        raise ice_aktarim.SatirHatasi('JSON nesnesi bekleniyor')
+    return govde
+
+@app.route('/api/v1/kuryeler')
+def api_kuryeler():
+    filtreler = []
+    if request.args.get('aktif', '1') != 'hepsi':
+        filtreler.append(Kurye.aktif == (request.args.get('aktif', '1') == '1'))
+    return api_liste(Kurye, KURYE_API_ALANLARI, filtreler)
+
+@app.route('/api/v1/kuryeler/<int:id>')
+def api_kurye(id):
+    kurye = db.session.get(Kurye, id)
+    if not kurye:
+        return api_hatasi('Kurye bulunamadı', 404)
+    return jsonify(nesne_json(kurye, KURYE_API_ALANLARI))
+
+@app.route('/api/v1/kuryeler', methods=['POST'])
+def api_kurye_ekle():
+    try:
+        govde = api_govdesi()
+        degerler = {
+            alan: metin_oku(govde.get(alan), alan, uzunluk)
+            for alan, uzunluk in KURYE_METIN_UZUNLUKLARI.items()
+        }
+    except ice_aktarim.SatirHatasi as e:
+        return api_hatasi(str(e))
+    kurye = Kurye(**degerler)
+    db.session.add(kurye)
+    db.session.commit()
+    return jsonify(nesne_json(kurye, KURYE_API_ALANLARI)), 201
+
+@app.route('/api/v1/kuryeler/<int:id>', methods=['PATCH'])
+def api_kurye_guncelle(id):
+    kurye = db.session.get(Kurye, id)
+    if not kurye:
+        return api_hatasi('Kurye bulunamadı', 404)
+    try:
+        govde = api_govdesi()
+        degerler = {
+            alan: metin_oku(govde[alan], alan, uzunluk)
+            for alan, uzunluk in KURYE_METIN_UZUNLUKLARI.items() if alan in govde
+        }
+        if 'aktif' in govde:
+            if not isinstance(govde['aktif'], bool):
+                raise ice_aktarim.SatirHatasi('aktif true veya false olmalı')
+            degerler['aktif'] = govde['aktif']
+    except ice_aktarim.SatirHatasi as e:
+        return api_hatasi(str(e))
+    for alan, deger in degerler.items():
+        setattr(kurye, alan, deger)
+    db.session.commit()
+    return jsonify(nesne_json(kurye, KURYE_API_ALANLARI))
+
+@app.route('/api/v1/kuryeler/<int:id>', methods=['DELETE'])
+def api_kurye_sil(id):
+    kurye = db.session.get(Kurye, id)
+    if not kurye:
+        return api_hatasi('Kurye bulunamadı', 404)
+    kurye.aktif = False
+    db.session.commit()
+    return '', 204
+
+@app.route('/api/v1/teslimatlar')
+def api_teslimatlar():
+    filtreler = []
+    if request.args.get('durum'):
+        filtreler.append(Teslimat.durum == request.args['durum'])
+    kurye_id = imlec_oku(request.args.get('kurye_id'))
+    if kurye_id:
+        filtreler.append(Teslimat.kurye_id == kurye_id)
+    if request.args.get('musteri_telefon'):
+        filtreler.append(Teslimat.musteri_telefon_anahtar == telefon_anahtari(request.args['musteri_telefon']))
+    return api_liste(Teslimat, TESLIMAT_API_ALANLARI, filtreler)
+
+@app.route('/api/v1/teslimatlar/<int:id>')
+def api_teslimat(id):
+    teslimat = db.session.get(Teslimat, id)
+    if not teslimat:
+        return api_hatasi('Teslimat bulunamadı', 404)
+    return jsonify(nesne_json(teslimat, TESLIMAT_API_ALANLARI))
+
+@app.route('/api/v1/ara')
+def api_ara():
+    metin = request.args.get('q', '').strip()
+    if not metin:
+        return api_hatasi('q parametresi gerekli')
+    try:
+        alanlar = api_alanlari(TESLIMAT_API_ALANLARI)
+    except ice_aktarim.SatirHatasi as e:
+        return api_hatasi(str(e))
+    teslimatlar = teslimat_arama(metin, limit_oku(request.args.get('limit')))
+    return jsonify({'veri': [nesne_json(teslimat, alanlar) for teslimat in teslimatlar]})
+
+@app.route('/api/v1/teslimatlar', methods=['POST'])
+def api_teslimat_ekle():
+    # Tek nesne veya {"ogeler": [...]}: hepsi tek işlemde eklenir
+    govde = request.get_json(silent=True)
+    tekil = isinstance(govde, dict) and 'ogeler' not in govde
+    if tekil:
+        ogeler = [govde]
+    else:
+        ogeler = govde.get('ogeler') if isinstance(govde, dict) else None
+    if not isinstance(ogeler, list):
+        return api_hatasi('JSON nesnesi veya {"ogeler": [...]} bekleniyor')
+
+    dogrula = teslimat_satiri_dogrulayici(kurye_haritasi())
+    tablo = Teslimat.__table__
+    sonuclar = []
+    for sira, oge in enumerate(ogeler):
+        try:
+            if not isinstance(oge, dict):
+                raise ice_aktarim.SatirHatasi('JSON nesnesi bekleniyor')
+            degerler = dogrula(oge)
+        except (ValueError, KeyError, TypeError) as e:
+            sonuclar.append({'i': sira, 'hata': str(e)})
+            continue
+        sonuc = db.session.execute(tablo.insert(), degerler)
+        sonuclar.append({'i': sira, 'id': sonuc.inserted_primary_key[0]})
+
+    eklenenler = [s['id'] for s in sonuclar if 'id' in s]
+    if eklenenler:
+        teslimat_olayi('ekle', *eklenenler)
+    db.session.commit()
+
+    if tekil:
+        if 'hata' in sonuclar[0]:
+            return api_hatasi(sonuclar[0]['hata'])
+        return jsonify(nesne_json(db.session.get(Teslimat, sonuclar[0]['id']), TESLIMAT_API_ALANLARI)), 201
+    return jsonify({'sonuclar': sonuclar})
+
+@app.route('/api/v1/teslimatlar/<int:id>', methods=['PATCH'])
+def api_teslimat_guncelle(id):
+    teslimat = db.session.get(Teslimat, id)
+    if not teslimat:
+        return api_hatasi('Teslimat bulunamadı', 404)
+    try:
+        govde = api_govdesi()
+        # İçe aktarma doğrulayıcısıyla aynı kurallar; değerler önce okunur,
+        # biri hatalıysa nesneye hiçbiri yazılmaz
+        degerler = {
+            alan: metin_oku(govde[alan], alan, uzunluk)
+            for alan, uzunluk in TESLIMAT_METIN_UZUNLUKLARI.items() if alan in govde
+        }
+        if 'baslangic_zamani' in govde:
+            degerler['baslangic_zamani'] = zaman_oku(govde['baslangic_zamani'])
+        if 'ucret' in govde:
+            degerler['ucret'] = ucret_oku(govde['ucret'])
+        for alan, deger in degerler.items():
+            setattr(teslimat, alan, deger)
+    except (ValueError, TypeError) as e:
+        db.session.rollback()
+        return api_hatasi(str(e))
+    teslimat_olayi('guncelle', id)
+    db.session.commit()
+    return jsonify(nesne_json(teslimat, TESLIMAT_API_ALANLARI))
+
+@app.route('/api/v1/teslimatlar/<int:id>', methods=['DELETE'])
+def api_teslimat_sil(id):
+    sonuc = db.session.execute(Teslimat.__table__.delete().where(Teslimat.id == id))
+    if not sonuc.rowcount:
+        return api_hatasi('Teslimat bulunamadı', 404)
+    teslimat_olayi('sil', id)
+    db.session.commit()
+    return '', 204
+
+def api_toplu_ogeler():
+    govde = request.get_json(silent=True)
+    ogeler = govde.get('ogeler') if isinstance(govde, dict) else None
+    if not isinstance(ogeler, list):
+        raise ice_aktarim.SatirHatasi('{"ogeler": [...]} bekleniyor')
+    return ogeler
+
+@app.route('/api/v1/teslimatlar/toplu-tamamla', methods=['POST'])
+def api_teslimat_toplu_tamamla():
+    # {"ogeler": [{"id": 1, "ucret": 45.0}, ...]} tek işlemde tamamlanır
+    try:
+        ogeler = api_toplu_ogeler()
+    except ice_aktarim.SatirHatasi as e:
+        return api_hatasi(str(e))
+
+    # Önce her öğe (id, ucret) olarak çözülür; in_() yalnızca geçerli id'lerle kurulur
+    cozulen = []
+    for oge in ogeler:
+        ham_id = oge.get('id') if isinstance(oge, dict) else None
+        if isinstance(ham_id, bool) or not isinstance(ham_id, (int, str)):
+            ham_id = None
+        try:
+            if ham_id is None:
+                raise ValueError
+            teslimat_id = int(ham_id)
+            ucret = ucret_oku(oge.get('ucret'))
+            if ucret is None:
+                raise ValueError
+        except ice_aktarim.SatirHatasi as e:
+            cozulen.append({'id': ham_id, 'hata': str(e)})
+            continue
+        except ValueError:
+            cozulen.append({'id': ham_id, 'hata': 'id ve ucret gerekli'})
+            continue
+        cozulen.append((teslimat_id, ucret))
+
+    istenen = [oge[0] for oge in cozulen if isinstance(oge, tuple)]
+    mevcut = dict(db.session.query(Teslimat.id, Teslimat.durum).filter(Teslimat.id.in_(istenen)).all())
+
+    simdi = datetime.utcnow()
+    guncellemeler = []
+    sonuclar = []
+    for oge in cozulen:
+        if isinstance(oge, dict):
+            sonuclar.append(oge)
+            continue
+        teslimat_id, ucret = oge
+        if teslimat_id not in mevcut:
+            sonuclar.append({'id': teslimat_id, 'hata': 'bulunamadı'})
+        elif mevcut[teslimat_id] == 'Tamamlandı':
+            sonuclar.append({'id': teslimat_id, 'hata': 'zaten tamamlandı'})
+        else:
+            guncellemeler.append({'b_id': teslimat_id, 'b_ucret': ucret})
+            mevcut[teslimat_id] = 'Tamamlandı'
+            sonuclar.append({'id': teslimat_id, 'tamam': True})
+
+    if guncellemeler:
+        tablo = Teslimat.__table__
+        db.session.execute(
+            tablo.update()
+            .where(tablo.c.id == bindparam('b_id'))
+            .values(durum='Tamamlandı', ucret=bindparam('b_ucret'), bitis_zamani=simdi),
+            guncellemeler
+        )
+        teslimat_olayi('tamamla', *[g['b_id'] for g in guncellemeler])
+    db.session.commit()
+    return jsonify({'tamamlanan': len(guncellemeler), 'sonuclar': sonuclar})
+
+@app.route('/api/v1/teslimatlar/toplu-sil', methods=['POST'])
+def api_teslimat_toplu_sil():
+    # {"ogeler": [1, 2, 3]}
+    try:
+        ogeler = [int(oge) for oge in api_toplu_ogeler()]
+    except (ice_aktarim.SatirHatasi, TypeError, ValueError) as e:
+        return api_hatasi(str(e))
+    mevcut = {satir.id for satir in db.session.query(Teslimat.id).filter(Teslimat.id.in_(ogeler))}
+    if mevcut:
+        db.session.execute(Teslimat.__table__.delete().where(Teslimat.id.in_(mevcut)))
+        teslimat_olayi('sil', *sorted(mevcut))
+    db.session.commit()
+    return jsonify({
+        'silinen': len(mevcut),
+        'sonuclar': [{'id': i, 'tamam': True} if i in mevcut else {'id': i, 'hata': 'bulunamadı'} for i in ogeler]
+    })
 
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    # Geliştirme sunucusu; üretimde gunicorn -c gunicorn.conf.py kullanılır
+    uygulama_olustur().run(debug=True) 
\ No newline at end of file
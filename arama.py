@@ -0,0 +1,135 @@
+import re
+
+# SQLite FTS5 tam metin araması.
+#
+# Her dizin kaynak tablodaki metin kolonlarının katlanmış bir kopyasını
+# rowid = kaynak id olacak şekilde tutar; tetikleyiciler ekleme, güncelleme ve
+# silmede dizini aynı işlem içinde günceller. Web ve masaüstü aynı teslimat
+# tablosunun farklı kolonlarını kullandığından veritabanında bulunmayan
+# kolonlar dizine boş yazılır.
+#
+# Türkçe büyük/küçük harf: unicode61 'I'yı 'i'ye çevirir ama 'İ' ve 'ı'yı
+# tanımaz; ikisi de hem dizine yazarken (SQL replace) hem sorguda (katla)
+# 'i'ye indirilir. remove_diacritics 2 ile ş/ğ/ç/ö/ü de aksansız eşleşir.
+
+# dizin: (kaynak tablo, kolonlar, bm25 ağırlıkları)
+DIZINLER = {
+    'teslimat_ara': ('teslimat', ('adres', 'musteri_adi', 'urun_adi'), (1.0, 2.0, 1.5)),
+    'musteri_ara': ('musteri', ('ad_soyad', 'adres'), (2.0, 1.0)),
+}
+
+TOKENIZER = 'unicode61 remove_diacritics 2'
+# Kısa önekler için ayrı dizinler; 'kad*' gibi sorgular tüm terimleri taramaz
+ONEKLER = '2 3'
+# Sorguya alınan en fazla kelime
+EN_FAZLA_KELIME = 8
+
+
+def katla(metin):
+    return (metin or '').replace('İ', 'i').replace('ı', 'i').lower()
+
+
+def _katla_sql(ifade):
+    return f"replace(replace(coalesce({ifade}, ''), 'İ', 'i'), 'ı', 'i')"
+
+
+def fts5_var_mi(baglanti):
+    secenekler = {satir[0] for satir in baglanti.exec_driver_sql('PRAGMA compile_options')}
+    return 'ENABLE_FTS5' in secenekler
+
+
+def dizin_var_mi(baglanti, ad):
+    return baglanti.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (ad,)
+    ).first() is not None
+
+
+def _kaynak_kolonlari(baglanti, tablo):
+    return {satir[1] for satir in baglanti.exec_driver_sql(f'PRAGMA table_info("{tablo}")')}
+
+
+def dizin_kur(baglanti, ad):
+    # Tabloyu, tetikleyicileri oluşturur ve mevcut kayıtları dizine alır;
+    # tekrar çalıştırıldığında dizini baştan doldurur
+    tablo, kolonlar, _ = DIZINLER[ad]
+    mevcut = _kaynak_kolonlari(baglanti, tablo)
+    izlenen = ', '.join(kolon for kolon in kolonlar if kolon in mevcut)
+    if not izlenen:
+        return False
+    kolon_listesi = ', '.join(kolonlar)
+
+    def degerler(onek):
+        return ', '.join(_katla_sql(f'{onek}.{kolon}') if kolon in mevcut else "''" for kolon in kolonlar)
+
+    baglanti.exec_driver_sql(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {ad} USING fts5('
+        f"{kolon_listesi}, tokenize = '{TOKENIZER}', prefix = '{ONEKLER}')"
+    )
+    baglanti.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS tr_{ad}_ekle AFTER INSERT ON {tablo} BEGIN '
+        f'INSERT INTO {ad} (rowid, {kolon_listesi}) VALUES (NEW.id, {degerler("NEW")}); '
+        'END'
+    )
+    baglanti.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS tr_{ad}_sil AFTER DELETE ON {tablo} BEGIN '
+        f'DELETE FROM {ad} WHERE rowid = OLD.id; '
+        'END'
+    )
+    baglanti.exec_driver_sql(
+        f'CREATE TRIGGER IF NOT EXISTS tr_{ad}_guncelle AFTER UPDATE OF {izlenen} ON {tablo} BEGIN '
+        f'DELETE FROM {ad} WHERE rowid = OLD.id; '
+        f'INSERT INTO {ad} (rowid, {kolon_listesi}) VALUES (NEW.id, {degerler("NEW")}); '
+        'END'
+    )
+    baglanti.exec_driver_sql(f'DELETE FROM {ad}')
+    baglanti.exec_driver_sql(
+        f'INSERT INTO {ad} (rowid, {kolon_listesi}) '
+        f'SELECT id, {degerler(tablo)} FROM {tablo}'
+    )
+    return True
+
+
+def sorgu_ifadesi(metin):
+    # Kullanıcı metni FTS5 sözdizimine çevrilir: her kelime tırnaklı önek
+    # olarak aranır ve hepsi eşleşmelidir (AND). Operatörler ve tırnaklar atılır.
+    kelimeler = re.findall(r'\w+', katla(metin))[:EN_FAZLA_KELIME]
+    return ' '.join(f'"{kelime}"*' for kelime in kelimeler)
+
+
+def ara(baglanti, ad, metin, limit=50, kosul=None):
+    # Eşleşen kaynak id'lerini alaka sırasıyla döner. kosul kaynak tablo
+    # üzerinde ek SQL filtresidir (ör. 'musteri.aktif = 1').
+    ifade = sorgu_ifadesi(metin)
+    if not ifade:
+        return []
+    tablo, kolonlar, agirliklar = DIZINLER[ad]
+    if not dizin_var_mi(baglanti, ad):
+        return _like_ara(baglanti, tablo, kolonlar, metin, limit, kosul)
+    agirlik_listesi = ', '.join(str(a) for a in agirliklar)
+    sql = (
+        f'SELECT {ad}.rowid FROM {ad} JOIN {tablo} ON {tablo}.id = {ad}.rowid '
+        f'WHERE {ad} MATCH ?' + (f' AND {kosul}' if kosul else '') +
+        f' ORDER BY bm25({ad}, {agirlik_listesi}), {ad}.rowid DESC LIMIT ?'
+    )
+    return [satir[0] for satir in baglanti.exec_driver_sql(sql, (ifade, int(limit)))]
+
+
+def _like_ara(baglanti, tablo, kolonlar, metin, limit, kosul):
+    # FTS5 olmayan SQLite derlemeleri için yavaş ama doğru yedek yol
+    mevcut = [kolon for kolon in kolonlar if kolon in _kaynak_kolonlari(baglanti, tablo)]
+    kelimeler = re.findall(r'\w+', katla(metin))[:EN_FAZLA_KELIME]
+    if not mevcut or not kelimeler:
+        return []
+    birlesik = " || ' ' || ".join(_katla_sql(kolon) for kolon in mevcut)
+    kosullar = [f'lower({birlesik}) LIKE ?' for _ in kelimeler]
+    if kosul:
+        kosullar.append(kosul)
+    sql = f'SELECT id FROM {tablo} WHERE {" AND ".join(kosullar)} ORDER BY id DESC LIMIT ?'
+    parametreler = tuple(f'%{kelime}%' for kelime in kelimeler) + (int(limit),)
+    return [satir[0] for satir in baglanti.exec_driver_sql(sql, parametreler)]
+
+
+def sirala(nesneler, idler):
+    # id IN (...) ile yüklenen nesneleri arama sırasına dizer
+    sira = {nesne_id: i for i, nesne_id in enumerate(idler)}
+    return sorted(nesneler, key=lambda nesne: sira[nesne.id])
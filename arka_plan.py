@@ -0,0 +1,107 @@
+import itertools
+import logging
+from collections import defaultdict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+import tembel_yukleme
+
+# Masaüstü veritabanı işçisi: sorgular QThreadPool iş parçacıklarında çalışır,
+# arayüz iş parçacığı SQL beklerken donmaz. Her iş kendi oturumunu açar ve
+# bitince kapatır; bağlantılar motorun havuzundan gelir. Sonuç arayüze
+# sinyalle döner ve geri çağırma arayüz iş parçacığında çalışır.
+#
+# İşler kanallara ayrılır (ör. 'teslimat_tablo'). Bir kanala yeni iş
+# gönderildiğinde o kanaldaki eski istekler bayatlar: henüz başlamamışsa hiç
+# çalışmaz, çalışıyorsa sonucu atılır. Hızlı sayfa değiştirmede yalnızca son
+# sayfa çizilir. Boş kanal ('') ile gönderilen işler (yazmalar) bayatlamaz.
+
+# Aynı anda çalışan en fazla iş; SQLite tek yazıcılı olduğundan küçük tutulur
+EN_FAZLA_IS_PARCACIGI = 4
+
+gunluk = logging.getLogger('kurye.arka_plan')
+
+
+class _Is(QRunnable):
+    def __init__(self, isci, kanal, nesil, fonksiyon):
+        super().__init__()
+        self.isci = isci
+        self.kanal = kanal
+        self.nesil = nesil
+        self.fonksiyon = fonksiyon
+
+    def run(self):
+        if not self.isci.guncel_mi(self.kanal, self.nesil):
+            self.isci._sonuc.emit(self.kanal, self.nesil, None, None)
+            return
+        # PyQt havuz iş parçacığına her çağrıda yeni bir Python iş parçacığı
+        # durumu açtığı için threading.local işler arasında korunmaz; oturum
+        # iş başına açılır. Kapatmak açık kalan okuma işlemini de geri alır,
+        # böylece WAL anlık görüntüsü tutulmaz.
+        oturum = self.isci.Session()
+        denetci = tembel_yukleme.varsayilan
+        denetci.basla(self.kanal)
+        try:
+            sonuc = self.fonksiyon(oturum)
+        except Exception as e:
+            self.isci._sonuc.emit(self.kanal, self.nesil, False, e)
+        else:
+            self.isci._sonuc.emit(self.kanal, self.nesil, True, sonuc)
+        finally:
+            oturum.close()
+            denetci.bitir()
+
+
+class VeritabaniIscisi(QObject):
+    # Bekleyen veya çalışan iş varken True
+    mesgul = pyqtSignal(bool)
+    # kanal, nesil, başarılı mı (None: bayat), sonuç veya hata
+    _sonuc = pyqtSignal(str, int, object, object)
+
+    def __init__(self, Session, en_fazla=EN_FAZLA_IS_PARCACIGI, parent=None):
+        super().__init__(parent)
+        self.Session = Session
+        self.havuz = QThreadPool(self)
+        self.havuz.setMaxThreadCount(en_fazla)
+        self._nesiller = defaultdict(int)
+        self._sayac = itertools.count(1)
+        self._geri_cagirmalar = {}
+        self._sonuc.connect(self._tamamlandi)
+
+    def calistir(self, kanal, fonksiyon, tamam=None, hata=None):
+        # fonksiyon(oturum) işçide çalışır; tamam(sonuc) / hata(istisna)
+        # arayüz iş parçacığında çağrılır
+        nesil = next(self._sayac)
+        if kanal:
+            self._nesiller[kanal] = nesil
+        if not self._geri_cagirmalar:
+            self.mesgul.emit(True)
+        self._geri_cagirmalar[(kanal, nesil)] = (tamam, hata)
+        self.havuz.start(_Is(self, kanal, nesil, fonksiyon))
+        return nesil
+
+    def iptal(self, kanal):
+        self._nesiller[kanal] = next(self._sayac)
+
+    def guncel_mi(self, kanal, nesil):
+        return not kanal or self._nesiller.get(kanal) == nesil
+
+    @pyqtSlot(str, int, object, object)
+    def _tamamlandi(self, kanal, nesil, basarili, sonuc):
+        tamam, hata = self._geri_cagirmalar.pop((kanal, nesil), (None, None))
+        if not self._geri_cagirmalar:
+            self.mesgul.emit(False)
+        if basarili is None or not self.guncel_mi(kanal, nesil):
+            return
+        if basarili:
+            if tamam is not None:
+                tamam(sonuc)
+        elif hata is not None:
+            hata(sonuc)
+        else:
+            gunluk.error('%s işi başarısız: %s', kanal, sonuc, exc_info=sonuc)
+
+    def kapat(self):
+        # Kuyruktaki okumalar bayatlatılır ve başlamadan döner; kanalsız
+        # yazmalar atılmaz, tamamlanmaları beklenir
+        for kanal in list(self._nesiller):
+            self.iptal(kanal)
+        self.havuz.waitForDone()
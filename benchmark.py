@@ -0,0 +1,269 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from urllib.parse import quote
+from sqlalchemy import event
+
+# Web rotaları için tekrarlanabilir ölçüm takımı.
+#
+#   python benchmark.py uret bench.db --teslimat 100000
+#   python benchmark.py calistir bench.db --cikti taban.json
+#   python benchmark.py calistir bench.db --cikti yeni.json
+#   python benchmark.py karsilastir taban.json yeni.json
+#
+# Üretici aynı tohumla her seferinde aynı veriyi üretir. Ölçümler Flask test
+# istemcisiyle yapılır; rapor ve satır önbellekleri her çalıştırmadan önce
+# boşaltılır, yani sonuçlar soğuk (hesaplanan) yolu gösterir.
+
+# Üretilen verinin bittiği gün; rota parametreleri buna göre seçilir
+REFERANS_ZAMAN = datetime(2024, 6, 1)
+GUN_SAYISI = 365
+PARTI = 10000
+
+HACIMLER = {'10k': 10000, '100k': 100000, '1m': 1000000}
+
+
+def _telefon(sira):
+    return f'05{30 + sira % 70:02d} {sira // 10000 % 1000:03d} {sira % 10000:04d}'
+
+
+def veri_uret(yol, teslimat_sayisi, kurye_sayisi=300, musteri_sayisi=None, tohum=42):
+    from app import app, uygulama_olustur, db, Kurye, Teslimat
+    from telefon import telefon_anahtari
+
+    if os.path.exists(yol):
+        raise SystemExit(f'{yol} zaten var; üretici yalnızca boş veritabanına yazar')
+    uygulama_olustur({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(yol)}'})
+    rastgele = random.Random(tohum)
+    musteri_sayisi = musteri_sayisi or max(teslimat_sayisi // 8, 100)
+
+    # Müşteri telefonları çarpık dağılır: az sayıda müşteri siparişlerin çoğunu verir
+    musteriler = [(f'Müşteri {i}', _telefon(i)) for i in range(musteri_sayisi)]
+    agirliklar = []
+    toplam = 0
+    for sira in range(1, musteri_sayisi + 1):
+        toplam += 1 / sira ** 1.1
+        agirliklar.append(toplam)
+
+    with app.app_context():
+        engine = db.engine
+        baslangic = REFERANS_ZAMAN - timedelta(days=GUN_SAYISI)
+        with engine.begin() as baglanti:
+            baglanti.execute(Kurye.__table__.insert(), [{
+                'ad': f'Kurye {i}',
+                'telefon': _telefon(900000 + i),
+                'kayit_tarihi': baslangic,
+                'aktif': rastgele.random() > 0.05
+            } for i in range(kurye_sayisi)])
+
+        eklenen = 0
+        while eklenen < teslimat_sayisi:
+            satirlar = []
+            for _ in range(min(PARTI, teslimat_sayisi - eklenen)):
+                ad, telefon = rastgele.choices(musteriler, cum_weights=agirliklar)[0]
+                zaman = baslangic + timedelta(seconds=rastgele.randrange(GUN_SAYISI * 86400))
+                tamamlandi = zaman < REFERANS_ZAMAN - timedelta(hours=3) or rastgele.random() < 0.3
+                satirlar.append({
+                    'kurye_id': rastgele.randint(1, kurye_sayisi),
+                    'adres': f'{rastgele.randint(1, 200)}. Sokak No:{rastgele.randint(1, 99)}',
+                    'musteri_adi': ad,
+                    'musteri_telefon': telefon,
+                    'musteri_telefon_anahtar': telefon_anahtari(telefon),
+                    'baslangic_zamani': zaman,
+                    'bitis_zamani': zaman + timedelta(minutes=rastgele.lognormvariate(3.5, 0.4)) if tamamlandi else None,
+                    'durum': 'Tamamlandı' if tamamlandi else 'Devam Ediyor',
+                    'ucret': round(rastgele.uniform(30, 150), 2) if tamamlandi else None
+                })
+            with engine.begin() as baglanti:
+                baglanti.execute(Teslimat.__table__.insert(), satirlar)
+            eklenen += len(satirlar)
+            print(f'\r{eklenen}/{teslimat_sayisi} teslimat', end='', file=sys.stderr)
+        print(file=sys.stderr)
+        with engine.connect() as baglanti:
+            baglanti.exec_driver_sql('ANALYZE')
+    return teslimat_sayisi
+
+
+def rotalar():
+    # (ad, url); tarih parametreleri REFERANS_ZAMAN'a göre sabittir
+    son_gun = (REFERANS_ZAMAN - timedelta(days=1)).strftime('%Y-%m-%d')
+    son_hafta = (REFERANS_ZAMAN - timedelta(days=7)).strftime('%Y-%m-%d')
+    son_ay = (REFERANS_ZAMAN - timedelta(days=30)).strftime('%Y-%m-%d')
+    return [
+        ('ana_sayfa', '/'),
+        ('ana_sayfa_durum', '/?durum=Devam+Ediyor'),
+        ('ana_sayfa_kurye', '/?kurye_id=7'),
+        ('ana_sayfa_derin', '/?teslimat_sonra=1000'),
+        ('kurye_performans', '/rapor/kurye-performans'),
+        ('kurye_performans_hafta', f'/rapor/kurye-performans?baslangic={son_hafta}&bitis={son_gun}'),
+        ('teslimat_istatistikleri', '/rapor/teslimat-istatistikleri'),
+        ('teslimat_istatistikleri_seri',
+         f'/rapor/teslimat-istatistikleri?baslangic={son_ay}&bitis={son_gun}&aralik=gun'),
+        ('musteri_gecmis_sik', '/musteri/gecmis/' + quote(_telefon(0))),
+        ('musteri_gecmis_seyrek', '/musteri/gecmis/' + quote(_telefon(99))),
+        ('api_teslimatlar', '/api/v1/teslimatlar?limit=100'),
+    ]
+
+
+def _onbellekleri_bosalt():
+    from app import rapor_onbellegi, satir_onbellegi
+    rapor_onbellegi.temizle()
+    satir_onbellegi.temizle()
+
+
+def calistir(yol, tekrar=5, secilen=None):
+    from app import app, db, uygulama_olustur
+
+    uygulama_olustur({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(yol)}'})
+    istemci = app.test_client()
+    sayac = {'sql': 0}
+
+    with app.app_context():
+        engine = db.engine
+        with engine.connect() as baglanti:
+            teslimat_sayisi = baglanti.exec_driver_sql('SELECT count(*) FROM teslimat').scalar()
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _say(*args):
+        sayac['sql'] += 1
+
+    sonuclar = {}
+    for ad, url in rotalar():
+        if secilen and ad not in secilen:
+            continue
+        # Isınma: bağlantı havuzu, derlenmiş şablonlar ve SQLite sayfa önbelleği
+        _onbellekleri_bosalt()
+        yanit = istemci.get(url)
+        if yanit.status_code != 200:
+            raise SystemExit(f'{ad}: {url} -> {yanit.status_code}')
+
+        sureler = []
+        for _ in range(tekrar):
+            _onbellekleri_bosalt()
+            sayac['sql'] = 0
+            baslangic = time.perf_counter()
+            yanit = istemci.get(url)
+            yanit.get_data()
+            sureler.append(time.perf_counter() - baslangic)
+            sql_sayisi = sayac['sql']
+
+        # Bellek ölçümü ayrı çalıştırmada; tracemalloc süreleri bozmasın
+        _onbellekleri_bosalt()
+        tracemalloc.start()
+        istemci.get(url).get_data()
+        _, tepe = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        sureler.sort()
+        sonuclar[ad] = {
+            'url': url,
+            'medyan_ms': round(statistics.median(sureler) * 1000, 3),
+            'en_az_ms': round(sureler[0] * 1000, 3),
+            'en_cok_ms': round(sureler[-1] * 1000, 3),
+            'sql_sayisi': sql_sayisi,
+            'tepe_bellek_kb': round(tepe / 1024, 1),
+            'yanit_bayt': len(yanit.get_data())
+        }
+        print(f'{ad:32} {sonuclar[ad]["medyan_ms"]:10.2f} ms  {sql_sayisi:4} sql  '
+              f'{sonuclar[ad]["tepe_bellek_kb"]:10.1f} KB', file=sys.stderr)
+
+    return {
+        'meta': {
+            'veritabani': os.path.basename(yol),
+            'teslimat_sayisi': teslimat_sayisi,
+            'tekrar': tekrar,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'zaman': datetime.now().isoformat(timespec='seconds')
+        },
+        'sonuclar': sonuclar
+    }
+
+
+def karsilastir(taban, yeni, esik=0.2, en_az_ms=1.0):
+    # Gerilemeler: süre veya bellekte esik oranından fazla artış, SQL sayısında herhangi bir artış
+    gerilemeler = []
+    satirlar = []
+    for ad, eski in taban['sonuclar'].items():
+        simdi = yeni['sonuclar'].get(ad)
+        if simdi is None:
+            continue
+        notlar = []
+        if simdi['medyan_ms'] > eski['medyan_ms'] * (1 + esik) and simdi['medyan_ms'] - eski['medyan_ms'] > en_az_ms:
+            notlar.append('süre')
+        if simdi['sql_sayisi'] > eski['sql_sayisi']:
+            notlar.append('sql')
+        if simdi['tepe_bellek_kb'] > eski['tepe_bellek_kb'] * (1 + esik) and simdi['tepe_bellek_kb'] - eski['tepe_bellek_kb'] > 64:
+            notlar.append('bellek')
+        if notlar:
+            gerilemeler.append((ad, notlar))
+        degisim = (simdi['medyan_ms'] - eski['medyan_ms']) / eski['medyan_ms'] * 100 if eski['medyan_ms'] else 0
+        satirlar.append(
+            f'{"!!" if notlar else "  "} {ad:32} {eski["medyan_ms"]:9.2f} -> {simdi["medyan_ms"]:9.2f} ms '
+            f'({degisim:+6.1f}%)  sql {eski["sql_sayisi"]} -> {simdi["sql_sayisi"]}  '
+            f'bellek {eski["tepe_bellek_kb"]} -> {simdi["tepe_bellek_kb"]} KB'
+            + (f'  [{", ".join(notlar)}]' if notlar else '')
+        )
+    if taban['meta'].get('teslimat_sayisi') != yeni['meta'].get('teslimat_sayisi'):
+        satirlar.insert(0, 'Uyarı: iki ölçüm farklı veri hacminde alınmış')
+    return gerilemeler, satirlar
+
+
+def main(argumanlar=None):
+    ayristirici = argparse.ArgumentParser(description='Kurye Takip web rotaları ölçüm takımı')
+    alt = ayristirici.add_subparsers(dest='komut', required=True)
+
+    uret = alt.add_parser('uret', help='Tohumlu sentetik veritabanı üret')
+    uret.add_argument('veritabani')
+    uret.add_argument('--teslimat', default='10k', help='10k, 100k, 1m veya sayı')
+    uret.add_argument('--kurye', type=int, default=300)
+    uret.add_argument('--musteri', type=int, default=None)
+    uret.add_argument('--tohum', type=int, default=42)
+
+    calis = alt.add_parser('calistir', help='Rotaları ölç ve JSON olarak kaydet')
+    calis.add_argument('veritabani')
+    calis.add_argument('--tekrar', type=int, default=5)
+    calis.add_argument('--rota', action='append', help='Yalnızca bu rotalar (tekrarlanabilir)')
+    calis.add_argument('--cikti', help='Sonuç dosyası (varsayılan: standart çıktı)')
+
+    kars = alt.add_parser('karsilastir', help='İki sonuç dosyasını karşılaştır')
+    kars.add_argument('taban')
+    kars.add_argument('yeni')
+    kars.add_argument('--esik', type=float, default=0.2, help='İzin verilen artış oranı (0.2 = %%20)')
+
+    secenekler = ayristirici.parse_args(argumanlar)
+
+    if secenekler.komut == 'uret':
+        adet = HACIMLER.get(secenekler.teslimat.lower())
+        adet = adet or int(secenekler.teslimat)
+        veri_uret(secenekler.veritabani, adet, secenekler.kurye, secenekler.musteri, secenekler.tohum)
+    elif secenekler.komut == 'calistir':
+        sonuc = calistir(secenekler.veritabani, secenekler.tekrar, secenekler.rota)
+        metin = json.dumps(sonuc, ensure_ascii=False, indent=2)
+        if secenekler.cikti:
+            with open(secenekler.cikti, 'w', encoding='utf-8') as dosya:
+                dosya.write(metin + '\n')
+        else:
+            print(metin)
+    else:
+        with open(secenekler.taban, encoding='utf-8') as dosya:
+            taban = json.load(dosya)
+        with open(secenekler.yeni, encoding='utf-8') as dosya:
+            yeni = json.load(dosya)
+        gerilemeler, satirlar = karsilastir(taban, yeni, secenekler.esik)
+        print('\n'.join(satirlar))
+        if gerilemeler:
+            print(f'{len(gerilemeler)} rotada gerileme var')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
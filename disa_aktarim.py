@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from datetime import datetime, date
+
+# Teslimat kayıtlarını CSV / JSONL olarak akış hâlinde dışa aktarır. Sorgu
+# yield_per ile parti parti okunur; bellekte hiçbir zaman bir partiden fazla
+# satır tutulmaz. Üreteçler metin parçaları döndürür, böylece aynı kod hem
+# Flask akış yanıtında hem de masaüstünde dosyaya yazarken kullanılır.
+
+PARTI_BOYUTU = 1000
+
+BICIMLER = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+
+def _deger(deger):
+    if isinstance(deger, (datetime, date)):
+        return deger.isoformat(sep=' ') if isinstance(deger, datetime) else deger.isoformat()
+    return deger
+
+
+def _partiler(sorgu, parti_boyutu, sayac=None):
+    parti = []
+    for satir in sorgu.yield_per(parti_boyutu):
+        parti.append(satir)
+        if len(parti) >= parti_boyutu:
+            if sayac is not None:
+                sayac['satir'] += len(parti)
+            yield parti
+            parti = []
+    if parti:
+        if sayac is not None:
+            sayac['satir'] += len(parti)
+        yield parti
+
+
+def csv_akisi(sorgu, alanlar, parti_boyutu=PARTI_BOYUTU, sayac=None):
+    tampon = io.StringIO()
+    yazici = csv.writer(tampon)
+    yazici.writerow(alanlar)
+    yield tampon.getvalue()
+    for parti in _partiler(sorgu, parti_boyutu, sayac):
+        tampon.seek(0)
+        tampon.truncate()
+        yazici.writerows([_deger(d) for d in satir] for satir in parti)
+        yield tampon.getvalue()
+
+
+def jsonl_akisi(sorgu, alanlar, parti_boyutu=PARTI_BOYUTU, sayac=None):
+    for parti in _partiler(sorgu, parti_boyutu, sayac):
+        yield ''.join(
+            json.dumps(dict(zip(alanlar, (_deger(d) for d in satir))), ensure_ascii=False) + '\n'
+            for satir in parti
+        )
+
+
+def akis(sorgu, alanlar, bicim='csv', parti_boyutu=PARTI_BOYUTU, sayac=None):
+    if bicim == 'csv':
+        return csv_akisi(sorgu, alanlar, parti_boyutu, sayac)
+    if bicim == 'jsonl':
+        return jsonl_akisi(sorgu, alanlar, parti_boyutu, sayac)
+    raise ValueError(f'Desteklenmeyen biçim: {bicim}')
+
+
+def dosyaya_yaz(yol, sorgu, alanlar, bicim='csv', parti_boyutu=PARTI_BOYUTU):
+    sayac = {'satir': 0}
+    with open(yol, 'w', encoding='utf-8', newline='') as dosya:
+        for parca in akis(sorgu, alanlar, bicim, parti_boyutu, sayac):
+            dosya.write(parca)
+    return sayac['satir']
@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+# Üretim sunucusu ayarları: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Kapasite = işçi sayısı x iş parçacığı sayısı. SQLite aynı anda tek yazara
+# izin verdiği için yazma yoğun kurulumlarda iş parçacığı sayısını artırmak
+# yerine işçi sayısını çekirdek sayısına yakın tutun.
+
+bind = os.environ.get('KURYE_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('KURYE_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('KURYE_THREADS', 4))
+
+# Varsayılan gthread: her istek (canlı pano bağlantıları dahil) bir iş
+# parçacığı tutar; bu yüzden işçi başına açık pano akışı iş parçacıklarının
+# yarısıyla sınırlanır, fazlası 503 alıp sonra yeniden dener. gevent isteğe
+# bağlıdır (KURYE_WORKER_CLASS=gevent): boşta bekleyen pano yalnızca bir
+# greenlet tutar ve olay yoklaması hub'ın iş parçacığı havuzunda çalışır,
+# ancak istek içindeki sqlite3 çağrıları greenlet değiştirmez; busy_timeout
+# içinde kilit bekleyen bir yazma o işçideki tüm istekleri dondurur. gevent'te
+# threads kullanılmaz, kapasite işçi sayısı x worker_connections olur.
+worker_class = os.environ.get('KURYE_WORKER_CLASS', 'gthread')
+worker_connections = int(os.environ.get('KURYE_WORKER_CONNECTIONS', 1000))
+os.environ.setdefault('KURYE_AZAMI_AKIS', str(
+    worker_connections // 2 if worker_class == 'gevent' else max(threads // 2, 1)
+))
+
+if worker_class == 'gevent':
+    # preload_app uygulamayı işçiler yamalanmadan önce yükler; modül
+    # düzeyindeki kilitlerin de greenlet uyumlu olması için yama burada yapılır
+    from gevent import monkey
+    monkey.patch_all()
+timeout = int(os.environ.get('KURYE_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Bellek sızıntılarına karşı işçiler belirli istek sayısından sonra yenilenir
+max_requests = 2000
+max_requests_jitter = 200
+
+# Uygulama ana süreçte bir kez yüklenir: şema kontrolü ve migrasyonlar
+# işçi başına değil yalnızca açılışta çalışır
+preload_app = True
+
+# İşçiler metriklerini buraya yazar; /metrics tüm işçilerin toplamını döner
+METRIK_DIZINI = os.environ.setdefault(
+    'KURYE_METRIK_DIZINI', os.path.join(tempfile.gettempdir(), 'kurye-metrikler')
+)
+
+accesslog = '-'
+errorlog = '-'
+
+
+def on_starting(server):
+    # Önceki çalıştırmadan kalan işçi dosyaları sayılmasın
+    shutil.rmtree(METRIK_DIZINI, ignore_errors=True)
+    os.makedirs(METRIK_DIZINI, exist_ok=True)
+
+
+def post_fork(server, worker):
+    # Ana süreçte açılmış bağlantılar fork ile kopyalanır; SQLite bağlantıları
+    # süreçler arasında paylaşılamayacağı için her işçi kendi havuzunu açar
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose()
+
+
+def worker_exit(server, worker):
+    # İşçi yenilenirken son metrikleri kaybolmasın
+    from app import metrik_kaydi
+    metrik_kaydi.diske_yaz()
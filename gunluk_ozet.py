@@ -0,0 +1,152 @@
+import sys
+from sqlalchemy import Table, Column, String, Integer, Float, MetaData
+
+# Günlük kurye özet tablosu (gün × kurye × durum).
+#
+# Raporlar ham teslimat satırları yerine bu tabloyu toplar; maliyet teslimat
+# sayısına değil gün sayısına bağlıdır. Tablo teslimat ve kurye_gider
+# tablolarındaki tetikleyicilerle her yazmada artımlı güncellenir (eski
+# değerler düşülür, yeniler eklenir). Giderler durum = '' satırlarında tutulur.
+#
+# Web ve masaüstü teslimat tablosunun zaman kolonu farklıdır
+# (baslangic_zamani / tarih); süre yalnızca bitis_zamani olan şemada tutulur.
+
+metadata = MetaData()
+
+gunluk_ozet = Table(
+    'gunluk_ozet', metadata,
+    Column('gun', String(10), primary_key=True),
+    Column('kurye_id', Integer, primary_key=True),
+    Column('durum', String(20), primary_key=True),
+    Column('adet', Integer, nullable=False, default=0),
+    Column('ciro', Float, nullable=False, default=0),
+    # Saat cinsinden toplam teslimat süresi ve süresi bilinen teslimat sayısı
+    Column('sure_toplam', Float, nullable=False, default=0),
+    Column('sure_adet', Integer, nullable=False, default=0),
+    Column('gider', Float, nullable=False, default=0)
+)
+
+GIDER_DURUMU = ''
+
+ZAMAN_KOLONLARI = ('baslangic_zamani', 'tarih')
+
+_GUNCELLE = (
+    'ON CONFLICT (gun, kurye_id, durum) DO UPDATE SET '
+    'adet = adet + excluded.adet, ciro = ciro + excluded.ciro, '
+    'sure_toplam = sure_toplam + excluded.sure_toplam, '
+    'sure_adet = sure_adet + excluded.sure_adet, gider = gider + excluded.gider'
+)
+
+
+def _kolonlar(baglanti, tablo):
+    return {satir[1] for satir in baglanti.exec_driver_sql(f'PRAGMA table_info("{tablo}")')}
+
+
+def _teslimat_ifadeleri(kolonlar, onek):
+    # Özet kolonlarının teslimat satırından hesaplanan SQL ifadeleri
+    zaman = next((k for k in ZAMAN_KOLONLARI if k in kolonlar), None)
+    if zaman is None:
+        return None
+    ifadeler = {
+        'gun': f'date({onek}{zaman})',
+        'kurye_id': f'{onek}kurye_id',
+        'durum': f"coalesce({onek}durum, 'Devam Ediyor')",
+        'ciro': f'coalesce({onek}ucret, 0)',
+        'sure_toplam': '0',
+        'sure_adet': '0',
+        'izlenen': [zaman, 'kurye_id', 'durum', 'ucret'],
+    }
+    if zaman == 'baslangic_zamani' and 'bitis_zamani' in kolonlar:
+        ifadeler['sure_toplam'] = f'coalesce((julianday({onek}bitis_zamani) - julianday({onek}baslangic_zamani)) * 24, 0)'
+        ifadeler['sure_adet'] = f'({onek}bitis_zamani IS NOT NULL)'
+        ifadeler['izlenen'].append('bitis_zamani')
+    return ifadeler
+
+
+def _teslimat_satiri(ifadeler, isaret):
+    # isaret '-' ise satırın katkısı düşülür
+    return (
+        'INSERT INTO gunluk_ozet (gun, kurye_id, durum, adet, ciro, sure_toplam, sure_adet, gider) '
+        f"VALUES ({ifadeler['gun']}, {ifadeler['kurye_id']}, {ifadeler['durum']}, {isaret}1, "
+        f"{isaret}{ifadeler['ciro']}, {isaret}{ifadeler['sure_toplam']}, {isaret}{ifadeler['sure_adet']}, 0) "
+        f'{_GUNCELLE}; '
+    )
+
+
+def _gider_satiri(onek, isaret):
+    return (
+        'INSERT INTO gunluk_ozet (gun, kurye_id, durum, adet, ciro, sure_toplam, sure_adet, gider) '
+        f"VALUES (date({onek}tarih), {onek}kurye_id, '{GIDER_DURUMU}', 0, 0, 0, 0, {isaret}coalesce({onek}miktar, 0)) "
+        f'{_GUNCELLE}; '
+    )
+
+
+def tetikleyicileri_kur(baglanti):
+    gunluk_ozet.create(baglanti, checkfirst=True)
+    kolonlar = _kolonlar(baglanti, 'teslimat')
+    yeni = _teslimat_ifadeleri(kolonlar, 'NEW.')
+    eski = _teslimat_ifadeleri(kolonlar, 'OLD.')
+    if yeni:
+        izlenen = ', '.join(yeni['izlenen'])
+        baglanti.exec_driver_sql(
+            'CREATE TRIGGER IF NOT EXISTS tr_gunluk_ozet_teslimat_ekle AFTER INSERT ON teslimat BEGIN '
+            + _teslimat_satiri(yeni, '') + 'END'
+        )
+        baglanti.exec_driver_sql(
+            'CREATE TRIGGER IF NOT EXISTS tr_gunluk_ozet_teslimat_sil AFTER DELETE ON teslimat BEGIN '
+            + _teslimat_satiri(eski, '-') + 'END'
+        )
+        baglanti.exec_driver_sql(
+            f'CREATE TRIGGER IF NOT EXISTS tr_gunluk_ozet_teslimat_guncelle AFTER UPDATE OF {izlenen} ON teslimat BEGIN '
+            + _teslimat_satiri(eski, '-') + _teslimat_satiri(yeni, '') + 'END'
+        )
+    if {'tarih', 'kurye_id', 'miktar'} <= _kolonlar(baglanti, 'kurye_gider'):
+        baglanti.exec_driver_sql(
+            'CREATE TRIGGER IF NOT EXISTS tr_gunluk_ozet_gider_ekle AFTER INSERT ON kurye_gider BEGIN '
+            + _gider_satiri('NEW.', '') + 'END'
+        )
+        baglanti.exec_driver_sql(
+            'CREATE TRIGGER IF NOT EXISTS tr_gunluk_ozet_gider_sil AFTER DELETE ON kurye_gider BEGIN '
+            + _gider_satiri('OLD.', '-') + 'END'
+        )
+        baglanti.exec_driver_sql(
+            'CREATE TRIGGER IF NOT EXISTS tr_gunluk_ozet_gider_guncelle '
+            'AFTER UPDATE OF tarih, kurye_id, miktar ON kurye_gider BEGIN '
+            + _gider_satiri('OLD.', '-') + _gider_satiri('NEW.', '') + 'END'
+        )
+
+
+def yeniden_olustur(baglanti):
+    # Özeti ham tablolardan baştan hesaplar; tetikleyiciler kurulmadan önceki
+    # veriler veya elle yapılan toplu düzeltmeler için
+    gunluk_ozet.create(baglanti, checkfirst=True)
+    baglanti.exec_driver_sql('DELETE FROM gunluk_ozet')
+    ifadeler = _teslimat_ifadeleri(_kolonlar(baglanti, 'teslimat'), '')
+    if ifadeler:
+        baglanti.exec_driver_sql(
+            'INSERT INTO gunluk_ozet (gun, kurye_id, durum, adet, ciro, sure_toplam, sure_adet, gider) '
+            f"SELECT {ifadeler['gun']}, kurye_id, {ifadeler['durum']}, count(*), sum({ifadeler['ciro']}), "
+            f"sum({ifadeler['sure_toplam']}), sum({ifadeler['sure_adet']}), 0 "
+            f"FROM teslimat WHERE {ifadeler['gun']} IS NOT NULL GROUP BY 1, 2, 3"
+        )
+    if {'tarih', 'kurye_id', 'miktar'} <= _kolonlar(baglanti, 'kurye_gider'):
+        baglanti.exec_driver_sql(
+            'INSERT INTO gunluk_ozet (gun, kurye_id, durum, adet, ciro, sure_toplam, sure_adet, gider) '
+            f"SELECT date(tarih), kurye_id, '{GIDER_DURUMU}', 0, 0, 0, 0, sum(coalesce(miktar, 0)) "
+            'FROM kurye_gider WHERE date(tarih) IS NOT NULL GROUP BY 1, 2'
+        )
+    return baglanti.exec_driver_sql('SELECT count(*) FROM gunluk_ozet').scalar()
+
+
+if __name__ == '__main__':
+    # Kullanım: python gunluk_ozet.py [veritabani_dosyasi]
+    import veritabani
+    import onbellek
+    dosya = sys.argv[1] if len(sys.argv) > 1 else 'kurye.db'
+    engine = veritabani.motor_olustur(f'sqlite:///{dosya}')
+    with engine.begin() as baglanti:
+        tetikleyicileri_kur(baglanti)
+        satir = yeniden_olustur(baglanti)
+        # Web önbelleğindeki raporlar yeni özetten hesaplansın
+        onbellek.surum_artir(baglanti, ('teslimat',))
+        print(f'Günlük özet yeniden oluşturuldu: {satir} satır')
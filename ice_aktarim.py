@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+
+# CSV / JSONL toplu içe aktarma. Satırlar akış hâlinde okunup doğrulanır,
+# geçerli olanlar Core executemany ile parça parça eklenir. Hatalı satırlar
+# tüm işlemi durdurmaz; satır numarası ve mesajıyla rapora yazılır.
+
+PARCA_BOYUTU = 500
+ISLEM_BASINA_PARCA = 20
+
+
+class SatirHatasi(ValueError):
+    pass
+
+
+def satirlari_oku(dosya, bicim='csv'):
+    # dosya: metin veya bayt akışı; (satır_no, sözlük) üretir. Dosya UTF-8
+    # olarak çözülemezse o noktadan sonrası tek bir satır hatası olur; önceki
+    # satırlar yine eklenir.
+    satir_no = 0
+    try:
+        for satir_no, satir in _satirlari_coz(dosya, bicim):
+            yield satir_no, satir
+    except UnicodeDecodeError as e:
+        yield satir_no + 1, SatirHatasi(f'Dosya UTF-8 olarak okunamadı, kalan satırlar atlandı: {e.reason}')
+
+
+def _satirlari_coz(dosya, bicim):
+    if isinstance(dosya, (bytes, str)):
+        dosya = io.BytesIO(dosya) if isinstance(dosya, bytes) else io.StringIO(dosya)
+    if not isinstance(dosya, io.TextIOBase):
+        dosya = io.TextIOWrapper(dosya, encoding='utf-8-sig', newline='')
+
+    if bicim == 'csv':
+        for satir_no, satir in enumerate(csv.DictReader(dosya), start=2):
+            yield satir_no, satir
+    elif bicim == 'jsonl':
+        for satir_no, metin in enumerate(dosya, start=1):
+            metin = metin.strip()
+            if not metin:
+                continue
+            try:
+                satir = json.loads(metin)
+            except ValueError as e:
+                yield satir_no, SatirHatasi(f'Geçersiz JSON: {e}')
+                continue
+            if not isinstance(satir, dict):
+                yield satir_no, SatirHatasi('Her satır bir JSON nesnesi olmalı')
+                continue
+            yield satir_no, satir
+    else:
+        raise ValueError(f'Desteklenmeyen biçim: {bicim}')
+
+
+def toplu_ekle(engine, tablo, satirlar, dogrula, parca_boyutu=PARCA_BOYUTU,
+               islem_basina_parca=ISLEM_BASINA_PARCA):
+    rapor = {'eklenen': 0, 'hatali': 0, 'hatalar': []}
+    parca = []
+    parcalar = []
+
+    def yaz():
+        # Birkaç parça tek işlemde (transaction) eklenir
+        with engine.begin() as baglanti:
+            for p in parcalar:
+                baglanti.execute(tablo.insert(), p)
+                rapor['eklenen'] += len(p)
+        parcalar.clear()
+
+    for satir_no, satir in satirlar:
+        try:
+            if isinstance(satir, Exception):
+                raise satir
+            parca.append(dogrula(satir))
+        except (ValueError, KeyError, TypeError) as e:
+            rapor['hatali'] += 1
+            rapor['hatalar'].append({'satir': satir_no, 'hata': str(e)})
+            continue
+        if len(parca) >= parca_boyutu:
+            parcalar.append(parca)
+            parca = []
+            if len(parcalar) >= islem_basina_parca:
+                yaz()
+
+    if parca:
+        parcalar.append(parca)
+    if parcalar:
+        yaz()
+    return rapor
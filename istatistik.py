@@ -0,0 +1,211 @@
+from datetime import datetime, date, timedelta
+from sqlalchemy import func, case
+from gunluk_ozet import gunluk_ozet, GIDER_DURUMU
+
+# Teslimat istatistikleri için ortak servis. Hem web (baslangic_zamani) hem de
+# masaüstü (tarih) modelleri zaman kolonunu parametre olarak verir.
+#
+# Aralık her zaman yarı açıktır: [baslangic, bitis). Filtre kolonun kendisi
+# üzerinde kurulur (func.date(kolon) gibi sarmalanmaz), böylece zaman
+# kolonundaki indeks kullanılabilir; gruplama yalnızca SELECT tarafında yapılır.
+#
+# Gün ve üstü aralıklar ham satırlar yerine gunluk_ozet tablosundan okunur
+# (ozet_serisi); saatlik seri ve gün ortasında başlayan aralıklar ham tabloya iner.
+
+ARALIKLAR = ('saat', 'gun', 'hafta', 'ay', 'yil')
+OZET_ARALIKLARI = ('gun', 'hafta', 'ay', 'yil')
+# Bir seride üretilecek en fazla dönem (ör. 2000-2100 saatlik ~876k satır olurdu)
+AZAMI_DONEM = 1000
+
+TAMAMLANDI = 'Tamamlandı'
+
+
+def donem_ifadesi(zaman_kolonu, aralik):
+    if aralik == 'saat':
+        return func.strftime('%Y-%m-%d %H:00', zaman_kolonu)
+    if aralik == 'gun':
+        return func.date(zaman_kolonu)
+    if aralik == 'hafta':
+        # Haftanın pazartesi günü
+        return func.date(zaman_kolonu, 'weekday 0', '-6 days')
+    if aralik == 'ay':
+        return func.strftime('%Y-%m-01', zaman_kolonu)
+    if aralik == 'yil':
+        return func.strftime('%Y-01-01', zaman_kolonu)
+    raise ValueError(f'Geçersiz aralık: {aralik}')
+
+
+def donem_baslangici(zaman, aralik):
+    if aralik == 'saat':
+        return zaman.replace(minute=0, second=0, microsecond=0)
+    gun = datetime(zaman.year, zaman.month, zaman.day)
+    if aralik == 'gun':
+        return gun
+    if aralik == 'hafta':
+        return gun - timedelta(days=gun.weekday())
+    if aralik == 'ay':
+        return gun.replace(day=1)
+    if aralik == 'yil':
+        return gun.replace(month=1, day=1)
+    raise ValueError(f'Geçersiz aralık: {aralik}')
+
+
+def sonraki_donem(zaman, aralik):
+    if aralik == 'saat':
+        return zaman + timedelta(hours=1)
+    if aralik == 'gun':
+        return zaman + timedelta(days=1)
+    if aralik == 'hafta':
+        return zaman + timedelta(weeks=1)
+    if aralik == 'yil':
+        return zaman.replace(year=zaman.year + 1)
+    if zaman.month == 12:
+        return zaman.replace(year=zaman.year + 1, month=1)
+    return zaman.replace(month=zaman.month + 1)
+
+
+def donem_etiketi(zaman, aralik):
+    # SQL tarafındaki donem_ifadesi ile aynı biçim
+    if aralik == 'saat':
+        return zaman.strftime('%Y-%m-%d %H:00')
+    return zaman.strftime('%Y-%m-%d')
+
+
+def _zaman(deger):
+    if isinstance(deger, datetime):
+        return deger
+    return datetime(deger.year, deger.month, deger.day)
+
+
+def gun_metni(deger):
+    # gunluk_ozet.gun ile karşılaştırma için 'YYYY-MM-DD'
+    return _zaman(deger).strftime('%Y-%m-%d')
+
+
+def gun_hizali(*zamanlar):
+    # Özet tablosu yalnızca gün sınırlarında başlayıp biten aralıkları karşılar
+    return all(
+        zaman is None or _zaman(zaman) == donem_baslangici(_zaman(zaman), 'gun')
+        for zaman in zamanlar
+    )
+
+
+def donem_sayisi(baslangic, bitis, aralik):
+    # [baslangic, bitis) aralığının kapsadığı dönem sayısı; seri üretmeden hesaplanır
+    baslangic, bitis = donem_baslangici(_zaman(baslangic), aralik), _zaman(bitis)
+    if bitis <= baslangic:
+        return 0
+    if aralik in ('ay', 'yil'):
+        # Dönem başları takvime bağlı; bitişin kendi dönem başına kadar tam dönemler
+        bitis_donemi = donem_baslangici(bitis, aralik)
+        if aralik == 'ay':
+            sayi = (bitis_donemi.year - baslangic.year) * 12 + bitis_donemi.month - baslangic.month
+        else:
+            sayi = bitis_donemi.year - baslangic.year
+        return sayi + (1 if bitis > bitis_donemi else 0)
+    uzunluk = {'saat': timedelta(hours=1), 'gun': timedelta(days=1), 'hafta': timedelta(weeks=1)}[aralik]
+    return -(-(bitis - baslangic) // uzunluk)
+
+
+def _donem_siniri(baslangic, bitis, aralik):
+    if donem_sayisi(baslangic, bitis, aralik) > AZAMI_DONEM:
+        raise ValueError(f'Seçilen aralıkta {AZAMI_DONEM} dönemden fazlası var')
+
+
+def _seri(bulunan, baslangic, bitis, aralik, alanlar):
+    # Boş dönemler de sıfır değerle seriye eklenir
+    seri = []
+    zaman = donem_baslangici(baslangic, aralik)
+    while zaman < bitis:
+        etiket = donem_etiketi(zaman, aralik)
+        satir = bulunan.get(etiket)
+        donem = {'donem': etiket, 'baslangic': zaman}
+        for alan in alanlar:
+            donem[alan] = getattr(satir, alan) if satir else 0
+        seri.append(donem)
+        zaman = sonraki_donem(zaman, aralik)
+    return seri
+
+
+def zaman_serisi(session, zaman_kolonu, baslangic, bitis, aralik='gun', filtreler=()):
+    if aralik not in ARALIKLAR:
+        raise ValueError(f'Geçersiz aralık: {aralik}')
+    _donem_siniri(baslangic, bitis, aralik)
+    baslangic, bitis = _zaman(baslangic), _zaman(bitis)
+    model = zaman_kolonu.class_
+    donem = donem_ifadesi(zaman_kolonu, aralik).label('donem')
+
+    satirlar = session.query(
+        donem,
+        func.count(model.id).label('toplam'),
+        func.sum(case((model.durum == TAMAMLANDI, 1), else_=0)).label('tamamlanan'),
+        func.coalesce(func.sum(model.ucret), 0).label('toplam_ucret')
+    ).filter(
+        zaman_kolonu >= baslangic,
+        zaman_kolonu < bitis,
+        *filtreler
+    ).group_by(donem).all()
+
+    bulunan = {satir.donem: satir for satir in satirlar}
+    return _seri(bulunan, baslangic, bitis, aralik, ('toplam', 'tamamlanan', 'toplam_ucret'))
+
+
+def ozet_serisi(session, baslangic, bitis, aralik='gun', kurye_id=None):
+    # zaman_serisi ile aynı biçim (+ gider), gunluk_ozet üzerinden; maliyet
+    # aralıktaki gün × kurye sayısıyla sınırlıdır
+    if aralik not in OZET_ARALIKLARI:
+        raise ValueError(f'Özet tablosunda geçersiz aralık: {aralik}')
+    _donem_siniri(baslangic, bitis, aralik)
+    baslangic, bitis = _zaman(baslangic), _zaman(bitis)
+    ozet = gunluk_ozet.c
+    donem = donem_ifadesi(ozet.gun, aralik).label('donem')
+    filtreler = [ozet.gun >= gun_metni(baslangic), ozet.gun < gun_metni(bitis)]
+    if kurye_id:
+        filtreler.append(ozet.kurye_id == kurye_id)
+
+    satirlar = session.query(
+        donem,
+        func.coalesce(func.sum(ozet.adet), 0).label('toplam'),
+        func.coalesce(func.sum(case((ozet.durum == TAMAMLANDI, ozet.adet), else_=0)), 0).label('tamamlanan'),
+        # Artımlı toplama/çıkarmadan kalan kuruş altı kayan nokta artıkları atılır
+        func.round(func.coalesce(func.sum(ozet.ciro), 0), 2).label('toplam_ucret'),
+        func.round(func.coalesce(func.sum(ozet.gider), 0), 2).label('gider')
+    ).filter(*filtreler).group_by(donem).all()
+
+    bulunan = {satir.donem: satir for satir in satirlar}
+    return _seri(bulunan, baslangic, bitis, aralik, ('toplam', 'tamamlanan', 'toplam_ucret', 'gider'))
+
+
+def topla(seri, baslangic=None, bitis=None):
+    # Seri içindeki bir alt pencerenin toplamı (ek sorgu yapmadan)
+    baslangic = _zaman(baslangic) if baslangic else None
+    bitis = _zaman(bitis) if bitis else None
+    sonuc = {'toplam': 0, 'tamamlanan': 0, 'toplam_ucret': 0}
+    for donem in seri:
+        if baslangic and donem['baslangic'] < baslangic:
+            continue
+        if bitis and donem['baslangic'] >= bitis:
+            continue
+        # Özet serisindeki gider gibi ek alanlar da toplanır
+        for alan, deger in donem.items():
+            if alan not in ('donem', 'baslangic'):
+                sonuc[alan] = sonuc.get(alan, 0) + deger
+    return sonuc
+
+
+def donem_ozetleri(session, bugun=None):
+    # Günlük / haftalık / aylık / yıllık özet: özet tablosunda yıl başından
+    # bugüne tek geçiş (en fazla 366 gün)
+    bugun = bugun or date.today()
+    hafta_basi = bugun - timedelta(days=bugun.weekday())
+    ay_basi = bugun.replace(day=1)
+    yil_basi = bugun.replace(month=1, day=1)
+    yarin = bugun + timedelta(days=1)
+
+    seri = ozet_serisi(session, min(hafta_basi, yil_basi), yarin, 'gun')
+    return {
+        'gunluk': topla(seri, bugun),
+        'haftalik': topla(seri, hafta_basi),
+        'aylik': topla(seri, ay_basi),
+        'yillik': topla(seri, yil_basi)
+    }
@@ -1,4 +1,7 @@
 import sys
+import time
+# Açılış süresi modül yüklenmeye başladığı andan ölçülür
+_ACILIS_BASLANGICI = time.perf_counter()
 import hashlib
 import os
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
@@ -6,17 +9,50 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                            QTableWidget, QTableWidgetItem, QComboBox, 
                            QMessageBox, QTabWidget, QDateTimeEdit, QSpinBox,
                            QDoubleSpinBox, QDialog, QStackedWidget, QHeaderView,
-                           QFormLayout)
-from PyQt5.QtCore import Qt, QDateTime, QSizeF
-from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
+                           QFormLayout, QFileDialog, QDateEdit, QCheckBox,
+                           QProgressBar)
+from PyQt5.QtCore import Qt, QDateTime, QDate, QSizeF, QTimer
 from PyQt5.QtGui import QTextDocument, QPageSize
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float, ForeignKey, func
-from sqlalchemy.orm import sessionmaker, relationship, declarative_base
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float, ForeignKey, func, and_, case
+from sqlalchemy.orm import sessionmaker, relationship, declarative_base, joinedload
 from datetime import datetime, timedelta
+import istatistik
+import migrasyon
+import veritabani
+import disa_aktarim
+import tembel_yukleme
+import arama
+import gunluk_ozet
+import tablo_modeli
+import arka_plan
+import satir_sayaci
+import sayfalama
 
 Base = declarative_base()
 
+# Arama sonuçlarında sayfalanacak en fazla kayıt (alaka sırasıyla)
+ARAMA_LIMITI = 500
+# Satır sayaçlarının gerçek sayılarla arka planda karşılaştırılma aralığı (ms)
+SAYAC_DENETIM_ARALIGI = 10 * 60 * 1000
+
+# KURYE_ACILIS_OLCUMU=1 ile açılış aşamalarının süreleri stderr'e yazılır
+ACILIS_OLCUMU = os.environ.get('KURYE_ACILIS_OLCUMU', '') not in ('', '0')
+# Giriş ekranının bu süre içinde çizilmesi hedeflenir (ms)
+ACILIS_BUTCESI = 1000
+_son_asama = [_ACILIS_BASLANGICI]
+
+def acilis_olc(asama, butce=None):
+    if not ACILIS_OLCUMU:
+        return
+    simdi = time.perf_counter()
+    toplam = (simdi - _ACILIS_BASLANGICI) * 1000
+    print(f'Açılış: {asama:<24} +{(simdi - _son_asama[0]) * 1000:7.1f} ms  toplam {toplam:7.1f} ms', file=sys.stderr)
+    _son_asama[0] = simdi
+    if butce is not None and toplam > butce:
+        print(f'Açılış: bütçe aşıldı ({toplam:.0f} ms > {butce} ms)', file=sys.stderr)
+
+acilis_olc('modüller yüklendi')
+
 class Yonetici(Base):
     __tablename__ = 'yonetici'
     id = Column(Integer, primary_key=True)
@@ -202,24 +238,32 @@ class GirisEkrani(QWidget):
         self.setLayout(layout)
 
     def giris_yap(self):
-        try:
-            kullanici_adi = self.kullanici_adi.text().strip()
-            sifre = self.sifre.text().strip()
-            
-            if not kullanici_adi or not sifre:
-                QMessageBox.warning(self, 'Uyarı', 'Kullanıcı adı ve şifre boş bırakılamaz!')
-                return
-            
-            yonetici = self.parent.session.query(Yonetici).filter_by(kullanici_adi=kullanici_adi).first()
-            
-            if yonetici and yonetici.sifre_kontrol(sifre):
-                self.parent.giris_yapildi()
-            else:
-                QMessageBox.warning(self, 'Hata', 'Kullanıcı adı veya şifre hatalı!')
-                self.sifre.clear()
-                
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Giriş yapılırken bir hata oluştu: {str(e)}')
+        kullanici_adi = self.kullanici_adi.text().strip()
+        sifre = self.sifre.text().strip()
+        
+        if not kullanici_adi or not sifre:
+            QMessageBox.warning(self, 'Uyarı', 'Kullanıcı adı ve şifre boş bırakılamaz!')
+            return
+        
+        def dogrula(oturum):
+            yonetici = oturum.query(Yonetici).filter_by(kullanici_adi=kullanici_adi).first()
+            return yonetici is not None and yonetici.sifre_kontrol(sifre)
+        
+        # Kilitli veritabanında pencere donmasın; sonuç gelene kadar buton kapalı
+        self.giris_btn.setEnabled(False)
+        self.parent.isci.calistir('giris', dogrula, self.giris_sonucu, self.giris_hatasi)
+
+    def giris_sonucu(self, basarili):
+        self.giris_btn.setEnabled(True)
+        if basarili:
+            self.parent.giris_yapildi()
+        else:
+            QMessageBox.warning(self, 'Hata', 'Kullanıcı adı veya şifre hatalı!')
+            self.sifre.clear()
+
+    def giris_hatasi(self, e):
+        self.giris_btn.setEnabled(True)
+        QMessageBox.critical(self, 'Hata', f'Giriş yapılırken bir hata oluştu: {str(e)}')
 
 class YoneticiPanel(QWidget):
     def __init__(self, parent=None):
@@ -308,51 +352,69 @@ class YoneticiPanel(QWidget):
         dialog.exec_()
 
     def yonetici_kaydet(self, dialog, ad_soyad, kullanici_adi, sifre):
-        try:
+        def kaydet(oturum):
             yeni_yonetici = Yonetici(
                 ad_soyad=ad_soyad,
                 kullanici_adi=kullanici_adi
             )
             yeni_yonetici.sifre_belirle(sifre)
-            self.parent.session.add(yeni_yonetici)
-            self.parent.session.commit()
+            oturum.add(yeni_yonetici)
+
+        def bitti(_):
             dialog.accept()
             self.yonetici_listesi_goster()
             QMessageBox.information(self, 'Başarılı', 'Yönetici başarıyla eklendi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Yönetici eklenirken hata oluştu: {str(e)}')
+
+        self.parent.kayit_yaz(kaydet, bitti, 'Yönetici eklenirken hata oluştu', dialog)
 
     def yonetici_listesi_goster(self):
-        yoneticiler = self.parent.session.query(Yonetici).all()
-        self.yonetici_tablo.setRowCount(len(yoneticiler))
-        
-        for i, yonetici in enumerate(yoneticiler):
-            self.yonetici_tablo.setItem(i, 0, QTableWidgetItem(str(yonetici.id)))
-            self.yonetici_tablo.setItem(i, 1, QTableWidgetItem(yonetici.ad_soyad))
-            self.yonetici_tablo.setItem(i, 2, QTableWidgetItem(yonetici.kullanici_adi))
-            
-            islemler_widget = QWidget()
-            islemler_layout = QHBoxLayout(islemler_widget)
-            islemler_layout.setContentsMargins(5, 2, 5, 2)
-            
-            sil_btn = QPushButton('Sil')
-            sil_btn.clicked.connect(lambda checked, y=yonetici: self.yonetici_sil(y.id))
+        def oku(oturum):
+            return oturum.query(Yonetici.id, Yonetici.ad_soyad, Yonetici.kullanici_adi).all()
+
+        def goster(yoneticiler):
+            self.yonetici_tablo.setRowCount(len(yoneticiler))
             
-            islemler_layout.addWidget(sil_btn)
-            self.yonetici_tablo.setCellWidget(i, 4, islemler_widget)
+            for i, (yonetici_id, ad_soyad, kullanici_adi) in enumerate(yoneticiler):
+                self.yonetici_tablo.setItem(i, 0, QTableWidgetItem(str(yonetici_id)))
+                self.yonetici_tablo.setItem(i, 1, QTableWidgetItem(ad_soyad))
+                self.yonetici_tablo.setItem(i, 2, QTableWidgetItem(kullanici_adi))
+                
+                islemler_widget = QWidget()
+                islemler_layout = QHBoxLayout(islemler_widget)
+                islemler_layout.setContentsMargins(5, 2, 5, 2)
+                
+                sil_btn = QPushButton('Sil')
+                sil_btn.clicked.connect(lambda checked, y=yonetici_id: self.yonetici_sil(y))
+                
+                islemler_layout.addWidget(sil_btn)
+                self.yonetici_tablo.setCellWidget(i, 4, islemler_widget)
+
+        self.parent.isci.calistir(
+            'yonetici_listesi', oku, goster,
+            lambda e: QMessageBox.critical(self, 'Hata', f'Yönetici listesi alınırken hata oluştu: {str(e)}')
+        )
 
     def yonetici_sil(self, yonetici_id):
-        try:
-            yonetici = self.parent.session.get(Yonetici, yonetici_id)
-            if yonetici.id == self.parent.yonetici.id:
-                QMessageBox.warning(self, 'Uyarı', 'Kendi hesabınızı silemezsiniz!')
+        oturumdaki = getattr(self.parent, 'yonetici', None)
+        if oturumdaki is not None and yonetici_id == oturumdaki.id:
+            QMessageBox.warning(self, 'Uyarı', 'Kendi hesabınızı silemezsiniz!')
+            return
+
+        def sil(oturum):
+            yonetici = oturum.get(Yonetici, yonetici_id)
+            if yonetici is None:
+                return False
+            oturum.delete(yonetici)
+            return True
+
+        def bitti(bulundu):
+            if not bulundu:
+                QMessageBox.warning(self, 'Uyarı', 'Yönetici bulunamadı!')
                 return
-            self.parent.session.delete(yonetici)
-            self.parent.session.commit()
             self.yonetici_listesi_goster()
             QMessageBox.information(self, 'Başarılı', 'Yönetici başarıyla silindi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Yönetici silinirken hata oluştu: {str(e)}')
+
+        self.parent.kayit_yaz(sil, bitti, 'Yönetici silinirken hata oluştu')
 
     def tema_ayarlari(self):
         dialog = QDialog(self)
@@ -567,10 +629,18 @@ class KuryeTakipUygulamasi(QMainWindow):
         
         try:
             # Veritabanı bağlantısı
-            self.engine = create_engine('sqlite:///kurye.db', echo=True)
+            self.engine = veritabani.motor_olustur(echo=True)
             Base.metadata.create_all(self.engine)
+            migrasyon.migrasyonlari_uygula(self.engine)
+            acilis_olc('veritabanı hazır')
             self.Session = sessionmaker(bind=self.engine)
-            self.session = self.Session()
+            # KURYE_N1_DENETIMI açıksa liste/rapor eylemlerindeki tembel yüklemeler sayılır
+            tembel_yukleme.varsayilan.izle(self.Session)
+            # Tüm sorgular ve yazmalar arayüzü dondurmadan işçide çalışır;
+            # arayüz iş parçacığında oturum tutulmaz
+            self.isci = arka_plan.VeritabaniIscisi(self.Session, parent=self)
+            # Derin sayfalara OFFSET yerine sayfa sınırı anahtarlarıyla atlanır
+            self.sinir_dizini = sayfalama.SinirDizini()
             
             # İlk yöneticiyi oluştur
             self.ilk_yonetici_olustur()
@@ -617,42 +687,127 @@ class KuryeTakipUygulamasi(QMainWindow):
             
             self.stacked_widget.addWidget(self.ana_ekran)
             
-            # Tab içeriklerini oluştur
-            self.kurye_tab_olustur()
-            self.teslimat_tab_olustur()
-            self.rapor_tab_olustur()
-            self.gider_tab_olustur()
-            self.musteri_tab_olustur()
-            
-            # Tabloları güncelle
-            self.kurye_tablo_guncelle()
-            self.teslimat_tablo_guncelle()
+            # Arka planda sorgu sürerken durum çubuğunda meşgul göstergesi
+            self.mesgul_gostergesi = QProgressBar()
+            self.mesgul_gostergesi.setRange(0, 0)
+            self.mesgul_gostergesi.setMaximumWidth(120)
+            self.mesgul_gostergesi.hide()
+            self.statusBar().addPermanentWidget(self.mesgul_gostergesi)
+            self.isci.mesgul.connect(self.mesgul_gostergesi.setVisible)
+            
+            # Satır sayaçları arka planda düzenli olarak gerçek sayılarla karşılaştırılır
+            self.sayac_zamanlayici = QTimer(self)
+            self.sayac_zamanlayici.setInterval(SAYAC_DENETIM_ARALIGI)
+            self.sayac_zamanlayici.timeout.connect(self.sayaclari_denetle)
+            self.sayac_zamanlayici.start()
+            
+            # Sekmeler ilk açıldıklarında kurulur ve doldurulur; giriş
+            # ekranı bunları beklemez
+            self.sekme_kurucular = {
+                self.kurye_tab: self.kurye_tab_olustur,
+                self.teslimat_tab: self.teslimat_tab_olustur,
+                self.rapor_tab: self.rapor_tab_olustur,
+                self.gider_tab: self.gider_tab_olustur,
+                self.musteri_tab: self.musteri_tab_olustur,
+            }
+            self.tab_widget.currentChanged.connect(self.sekme_etkinlesti)
+            acilis_olc('giriş ekranı kuruldu')
             
         except Exception as e:
             QMessageBox.critical(self, 'Hata', f'Uygulama başlatılırken hata oluştu: {str(e)}')
             sys.exit(1)
 
     def ilk_yonetici_olustur(self):
-        try:
-            yonetici = self.session.query(Yonetici).first()
-            if not yonetici:
+        def olustur(oturum):
+            if oturum.query(Yonetici.id).first() is None:
                 ilk_yonetici = Yonetici(
                     kullanici_adi='admin',
                     ad_soyad='Sistem Yöneticisi'
                 )
                 ilk_yonetici.sifre_belirle('admin123')
-                self.session.add(ilk_yonetici)
-                self.session.commit()
-        except Exception as e:
-            print(f"İlk yönetici oluşturma hatası: {str(e)}")
+                oturum.add(ilk_yonetici)
+                oturum.commit()
+
+        self.isci.calistir(
+            'ilk_yonetici', olustur,
+            hata=lambda e: print(f"İlk yönetici oluşturma hatası: {str(e)}")
+        )
 
     def giris_yapildi(self):
         try:
             self.stacked_widget.setCurrentIndex(1)
+            self.sekme_etkinlesti(self.tab_widget.currentIndex())
         except Exception as e:
             QMessageBox.critical(self, 'Hata', f'Giriş yapılırken hata oluştu: {str(e)}')
             self.stacked_widget.setCurrentIndex(0)
 
+    def kayit_oku(self, kanal, oku, ac, bulunamadi, hata_metni):
+        # Düzenleme ve yazdırma pencereleri kaydı işçide okur. İş bitince
+        # oturum kapanır; kayıt yüklenmiş alanlarıyla (ilişkiler oku içinde
+        # yüklenmelidir) arayüze ayrılmış olarak gelir.
+        def geldi(kayit):
+            if kayit is None:
+                QMessageBox.warning(self, 'Uyarı', bulunamadi)
+            else:
+                ac(kayit)
+
+        self.isci.calistir(
+            kanal, oku, geldi,
+            lambda e: QMessageBox.critical(self, 'Hata', f'{hata_metni}: {str(e)}')
+        )
+
+    def kayit_yaz(self, yaz, tamam, hata_metni, bekleyen=None):
+        # yaz(oturum) işçide çalışır ve işlem burada commit edilir. Yazmalar
+        # kanalsız gönderilir, birbirini bayatlatmaz. Sonuç gelene kadar
+        # bekleyen pencere / düğme kapalı kalır; çift tıklama çift kayıt açmaz.
+        def calistir(oturum):
+            sonuc = yaz(oturum)
+            oturum.commit()
+            return sonuc
+
+        def bitti(sonuc):
+            if bekleyen is not None:
+                bekleyen.setEnabled(True)
+            tamam(sonuc)
+
+        def hata(e):
+            if bekleyen is not None:
+                bekleyen.setEnabled(True)
+            QMessageBox.critical(self, 'Hata', f'{hata_metni}: {str(e)}')
+
+        if bekleyen is not None:
+            bekleyen.setEnabled(False)
+        self.isci.calistir('', calistir, bitti, hata)
+
+    def sayaclari_denetle(self):
+        def denetle(oturum):
+            kayanlar = satir_sayaci.denetle(oturum.connection(), duzelt=True)
+            oturum.commit()
+            return kayanlar
+
+        def bitti(kayanlar):
+            # Düzeltilen sayaçlarla açık tablolar yeniden sayfalanır
+            if kayanlar:
+                for ad in ('kurye', 'teslimat', 'gider', 'musteri'):
+                    if hasattr(self, f'{ad}_modeli'):
+                        getattr(self, f'{ad}_tablo_guncelle')()
+
+        self.isci.calistir('sayac_denetimi', denetle, bitti)
+
+    def sekme_etkinlesti(self, index):
+        kurucu = self.sekme_kurucular.pop(self.tab_widget.widget(index), None)
+        if kurucu is None:
+            return
+        baslangic = time.perf_counter()
+        # Slot içinde yakalanmayan istisna PyQt5'te süreci sonlandırır
+        try:
+            kurucu()
+        except Exception as e:
+            QMessageBox.critical(self, 'Hata', f'{self.tab_widget.tabText(index)} sekmesi kurulurken hata oluştu: {str(e)}')
+            return
+        if ACILIS_OLCUMU:
+            print(f'Sekme: {self.tab_widget.tabText(index)} {(time.perf_counter() - baslangic) * 1000:.1f} ms', file=sys.stderr)
+
     def kurye_tab_olustur(self):
         layout = QVBoxLayout(self.kurye_tab)
         
@@ -664,19 +819,23 @@ class KuryeTakipUygulamasi(QMainWindow):
         self.kurye_telefon = QLineEdit()
         self.kurye_telefon.setPlaceholderText('Telefon')
         
-        kurye_ekle_btn = QPushButton('Kurye Ekle')
-        kurye_ekle_btn.clicked.connect(self.kurye_ekle)
+        self.kurye_ekle_btn = QPushButton('Kurye Ekle')
+        self.kurye_ekle_btn.clicked.connect(self.kurye_ekle)
         
         form_layout.addWidget(self.kurye_ad)
         form_layout.addWidget(self.kurye_telefon)
-        form_layout.addWidget(kurye_ekle_btn)
+        form_layout.addWidget(self.kurye_ekle_btn)
         
         layout.addLayout(form_layout)
         
         # Kurye tablosu
-        self.kurye_tablo = QTableWidget()
-        self.kurye_tablo.setColumnCount(5)
-        self.kurye_tablo.setHorizontalHeaderLabels(['ID', 'Ad', 'Telefon', 'Kayıt Tarihi', 'İşlemler'])
+        self.kurye_modeli = tablo_modeli.SatirModeli([
+            ('ID', None), ('Ad', None), ('Telefon', None),
+            ('Kayıt Tarihi', tablo_modeli.tarih_metni), ('İşlemler', None)
+        ], self.isci, 'kurye_tablo', parent=self)
+        self.kurye_tablo = tablo_modeli.tablo_gorunumu(self.kurye_modeli, [
+            ('Düzenle', self.kurye_duzenle), ('Sil', self.kurye_sil)
+        ])
         
         # Dinamik sütun genişlikleri
         header = self.kurye_tablo.horizontalHeader()
@@ -684,8 +843,6 @@ class KuryeTakipUygulamasi(QMainWindow):
         header.setSectionResizeMode(1, QHeaderView.Stretch)  # Ad
         header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Telefon
         header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Kayıt Tarihi
-        header.setSectionResizeMode(4, QHeaderView.Fixed)  # İşlemler
-        self.kurye_tablo.setColumnWidth(4, 300)
         
         layout.addWidget(self.kurye_tablo)
         
@@ -695,7 +852,7 @@ class KuryeTakipUygulamasi(QMainWindow):
         self.sayfa_spin.setMinimum(1)
         self.sayfa_spin.valueChanged.connect(self.kurye_tablo_guncelle)
         self.sayfa_boyut_combo = QComboBox()
-        self.sayfa_boyut_combo.addItems(['10', '25', '50', '100'])
+        self.sayfa_boyut_combo.addItems(tablo_modeli.SAYFA_BOYUTLARI)
         self.sayfa_boyut_combo.currentTextChanged.connect(self.kurye_tablo_guncelle)
         
         sayfalama_layout.addWidget(QLabel('Sayfa:'))
@@ -705,88 +862,74 @@ class KuryeTakipUygulamasi(QMainWindow):
         sayfalama_layout.addStretch()
         
         layout.addLayout(sayfalama_layout)
+        
+        # İlk güncellemeyi yap
+        self.kurye_tablo_guncelle()
 
     def kurye_tablo_guncelle(self):
-        try:
-            sayfa = self.sayfa_spin.value()
-            sayfa_boyutu = int(self.sayfa_boyut_combo.currentText())
-            offset = (sayfa - 1) * sayfa_boyutu
-            
-            # Toplam kayıt sayısını al
-            toplam_kayit = self.session.query(Kurye).filter_by(aktif=True).count()
-            max_sayfa = (toplam_kayit + sayfa_boyutu - 1) // sayfa_boyutu
-            self.sayfa_spin.setMaximum(max(1, max_sayfa))
-            
-            # Sayfalı veri çek
-            kuryeler = self.session.query(Kurye).filter_by(aktif=True)\
-                .order_by(Kurye.id.desc())\
-                .offset(offset)\
-                .limit(sayfa_boyutu)\
-                .all()
-            
-            self.kurye_tablo.setRowCount(len(kuryeler))
-            
-            for i, kurye in enumerate(kuryeler):
-                self.kurye_tablo.setItem(i, 0, QTableWidgetItem(str(kurye.id)))
-                self.kurye_tablo.setItem(i, 1, QTableWidgetItem(kurye.ad))
-                self.kurye_tablo.setItem(i, 2, QTableWidgetItem(kurye.telefon))
-                self.kurye_tablo.setItem(i, 3, QTableWidgetItem(kurye.kayit_tarihi.strftime('%d.%m.%Y %H:%M')))
-                
-                islemler_widget = QWidget()
-                islemler_layout = QHBoxLayout(islemler_widget)
-                islemler_layout.setContentsMargins(5, 2, 5, 2)
-                
-                duzenle_btn = QPushButton('Düzenle')
-                duzenle_btn.setMinimumWidth(100)
-                duzenle_btn.clicked.connect(lambda checked, k=kurye: self.kurye_duzenle(k.id))
-                
-                sil_btn = QPushButton('Sil')
-                sil_btn.setMinimumWidth(100)
-                sil_btn.clicked.connect(lambda checked, k=kurye: self.kurye_sil(k.id))
-                
-                islemler_layout.addWidget(duzenle_btn)
-                islemler_layout.addWidget(sil_btn)
-                islemler_layout.addStretch()
-                
-                self.kurye_tablo.setCellWidget(i, 4, islemler_widget)
-                
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Kurye tablosu güncellenirken hata oluştu: {str(e)}')
+        def sorgu(oturum):
+            return oturum.query(Kurye.id, Kurye.ad, Kurye.telefon, Kurye.kayit_tarihi)\
+                .filter(Kurye.aktif == True)
 
-    def kurye_ekle(self):
-        try:
-            yeni_kurye = Kurye(
-                ad=self.kurye_ad.text(),
-                telefon=self.kurye_telefon.text()
+        def kaynak(oturum):
+            # Toplam kayıt sayısı tetikleyicilerle tutulan sayaçtan okunur;
+            # sayacın değişim sürümü sayfa sınırı dizinini geçersiz kılar
+            toplam_kayit, surum = satir_sayaci.sayi_ve_degisim(
+                oturum.connection(), 'kurye:aktif',
+                lambda: oturum.query(Kurye).filter_by(aktif=True).count()
             )
-            self.session.add(yeni_kurye)
-            self.session.commit()
-            
+            return toplam_kayit, tablo_modeli.sorgu_getirici(
+                sorgu, Kurye.id, self.sinir_dizini.okuyucu('kurye:aktif', toplam_kayit, surum)
+            )
+
+        # Sayım ve ilk parça işçide okunur; kalan satırlar kaydırıldıkça gelir
+        self.kurye_modeli.sayfa_yukle(
+            kaynak, self.sayfa_spin.value(), self.sayfa_boyut_combo.currentText(),
+            lambda toplam_kayit, sayfa_sayisi: tablo_modeli.sayfa_siniri(self.sayfa_spin, sayfa_sayisi),
+            lambda e: QMessageBox.critical(self, 'Hata', f'Kurye tablosu güncellenirken hata oluştu: {str(e)}')
+        )
+
+    def kurye_ekle(self):
+        ad = self.kurye_ad.text()
+        telefon = self.kurye_telefon.text()
+
+        def ekle(oturum):
+            oturum.add(Kurye(ad=ad, telefon=telefon))
+
+        def bitti(_):
             self.kurye_ad.clear()
             self.kurye_telefon.clear()
             self.kurye_tablo_guncelle()
-            
             QMessageBox.information(self, 'Başarılı', 'Kurye başarıyla eklendi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Kurye eklenirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(ekle, bitti, 'Kurye eklenirken hata oluştu', self.kurye_ekle_btn)
 
     def kurye_sil(self, kurye_id):
-        try:
-            kurye = self.session.get(Kurye, kurye_id)
+        def sil(oturum):
+            kurye = oturum.get(Kurye, kurye_id)
+            if kurye is None:
+                return False
             kurye.aktif = False
-            self.session.commit()
+            return True
+
+        def bitti(bulundu):
+            if not bulundu:
+                QMessageBox.warning(self, 'Uyarı', 'Kurye bulunamadı!')
+                return
             self.kurye_tablo_guncelle()
             QMessageBox.information(self, 'Başarılı', 'Kurye başarıyla silindi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Kurye silinirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(sil, bitti, 'Kurye silinirken hata oluştu')
 
     def kurye_duzenle(self, kurye_id):
+        self.kayit_oku(
+            'duzenle', lambda oturum: oturum.get(Kurye, kurye_id), self.kurye_duzenle_penceresi,
+            'Kurye bulunamadı!', 'Kurye düzenlenirken hata oluştu'
+        )
+
+    def kurye_duzenle_penceresi(self, kurye):
+        kurye_id = kurye.id
         try:
-            kurye = self.session.get(Kurye, kurye_id)
-            if not kurye:
-                QMessageBox.warning(self, 'Uyarı', 'Kurye bulunamadı!')
-                return
-            
             dialog = QDialog(self)
             dialog.setWindowTitle('Kurye Düzenle')
             layout = QVBoxLayout(dialog)
@@ -818,20 +961,23 @@ class KuryeTakipUygulamasi(QMainWindow):
             QMessageBox.critical(self, 'Hata', f'Kurye düzenlenirken hata oluştu: {str(e)}')
 
     def kurye_guncelle(self, kurye_id, ad, telefon, dialog):
-        try:
-            kurye = self.session.get(Kurye, kurye_id)
-            if not kurye:
-                QMessageBox.warning(self, 'Uyarı', 'Kurye bulunamadı!')
-                return
-            
+        def guncelle(oturum):
+            kurye = oturum.get(Kurye, kurye_id)
+            if kurye is None:
+                return False
             kurye.ad = ad
             kurye.telefon = telefon
-            self.session.commit()
+            return True
+
+        def bitti(bulundu):
+            if not bulundu:
+                QMessageBox.warning(self, 'Uyarı', 'Kurye bulunamadı!')
+                return
             self.kurye_tablo_guncelle()
             dialog.accept()
             QMessageBox.information(self, 'Başarılı', 'Kurye başarıyla güncellendi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Kurye güncellenirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(guncelle, bitti, 'Kurye güncellenirken hata oluştu', dialog)
 
     def teslimat_tab_olustur(self):
         layout = QVBoxLayout()
@@ -842,7 +988,7 @@ class KuryeTakipUygulamasi(QMainWindow):
         # Kurye seçimi
         self.teslimat_kurye = QComboBox()
         self.teslimat_kurye.setMinimumWidth(200)
-        self.kurye_listesi_guncelle()
+        self.kurye_listesi_guncelle(self.teslimat_kurye)
         form_layout.addWidget(QLabel('Kurye:'))
         form_layout.addWidget(self.teslimat_kurye)
         
@@ -890,15 +1036,36 @@ class KuryeTakipUygulamasi(QMainWindow):
         """)
         form_layout.addWidget(yazdir_btn)
         
+        # Dışa aktar butonu
+        self.disa_aktar_btn = QPushButton('Dışa Aktar')
+        self.disa_aktar_btn.clicked.connect(self.teslimat_disa_aktar)
+        form_layout.addWidget(self.disa_aktar_btn)
+        
         layout.addLayout(form_layout)
         
+        # Tam metin arama; yazarken kısa bir gecikmeyle uygulanır
+        self.teslimat_arama = QLineEdit()
+        self.teslimat_arama.setPlaceholderText('Adres, müşteri veya ürün ara')
+        self.teslimat_arama.setClearButtonEnabled(True)
+        self.teslimat_arama_zamanlayici = QTimer(self)
+        self.teslimat_arama_zamanlayici.setSingleShot(True)
+        self.teslimat_arama_zamanlayici.setInterval(250)
+        self.teslimat_arama_zamanlayici.timeout.connect(self.teslimat_aramayi_uygula)
+        self.teslimat_arama.textChanged.connect(lambda _: self.teslimat_arama_zamanlayici.start())
+        layout.addWidget(self.teslimat_arama)
+        
         # Teslimat listesi
-        self.teslimat_tablo = QTableWidget()
-        self.teslimat_tablo.setColumnCount(9)
-        self.teslimat_tablo.setHorizontalHeaderLabels(['ID', 'Kurye', 'Ürün', 'Adres', 'Telefon', 'Tarih', 'Durum', 'Ücret', 'İşlemler'])
-        self.teslimat_tablo.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.teslimat_tablo.setSelectionBehavior(QTableWidget.SelectRows)
-        self.teslimat_tablo.setSelectionMode(QTableWidget.SingleSelection)
+        self.teslimat_modeli = tablo_modeli.SatirModeli([
+            ('ID', None), ('Kurye', None), ('Ürün', None), ('Adres', None), ('Telefon', None),
+            ('Tarih', tablo_modeli.tarih_metni), ('Durum', None), ('Ücret', tablo_modeli.para_metni),
+            ('İşlemler', None)
+        ], self.isci, 'teslimat_tablo', parent=self)
+        self.teslimat_tablo = tablo_modeli.tablo_gorunumu(self.teslimat_modeli, [
+            ('Düzenle', self.teslimat_duzenle), ('Sil', self.teslimat_sil)
+        ])
+        header = self.teslimat_tablo.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+        header.setSectionResizeMode(8, QHeaderView.Fixed)  # İşlemler
         
         layout.addWidget(self.teslimat_tablo)
         
@@ -911,7 +1078,7 @@ class KuryeTakipUygulamasi(QMainWindow):
         sayfalama_layout.addWidget(self.teslimat_sayfa)
         
         self.teslimat_sayfa_boyut = QComboBox()
-        self.teslimat_sayfa_boyut.addItems(['10', '25', '50', '100'])
+        self.teslimat_sayfa_boyut.addItems(tablo_modeli.SAYFA_BOYUTLARI)
         self.teslimat_sayfa_boyut.currentTextChanged.connect(self.teslimat_tablo_guncelle)
         sayfalama_layout.addWidget(QLabel('Sayfa Boyutu:'))
         sayfalama_layout.addWidget(self.teslimat_sayfa_boyut)
@@ -976,8 +1143,8 @@ class KuryeTakipUygulamasi(QMainWindow):
             QMessageBox.critical(self, 'Hata', f'Teslimat eklenirken hata oluştu: {str(e)}')
 
     def teslimat_kaydet(self, kurye_id, adres, telefon, urun_adi, ucret, dialog):
-        try:
-            yeni_teslimat = Teslimat(
+        def kaydet(oturum):
+            oturum.add(Teslimat(
                 kurye_id=kurye_id,
                 musteri_id=None,  # Müşteri ID'si opsiyonel
                 adres=adres,
@@ -985,93 +1152,194 @@ class KuryeTakipUygulamasi(QMainWindow):
                 urun_adi=urun_adi,
                 durum='Tamamlandı',
                 ucret=ucret
-            )
-            self.session.add(yeni_teslimat)
-            self.session.flush()  # Değişiklikleri veritabanına yansıt
-            self.session.commit()  # Değişiklikleri kaydet
-            
+            ))
+
+        def bitti(_):
             self.teslimat_adres.clear()
             self.teslimat_telefon.clear()
             self.teslimat_urun.clear()
             self.teslimat_tablo_guncelle()
             dialog.accept()
-            
             QMessageBox.information(self, 'Başarılı', 'Teslimat başarıyla eklendi!')
-        except Exception as e:
-            self.session.rollback()  # Hata durumunda değişiklikleri geri al
-            QMessageBox.critical(self, 'Hata', f'Teslimat eklenirken hata oluştu: {str(e)}')
+
+        # Hata olursa oturum kapanırken işlem geri alınır
+        self.kayit_yaz(kaydet, bitti, 'Teslimat eklenirken hata oluştu', dialog)
+
+    def teslimat_aramayi_uygula(self):
+        # Sayfa 1'e dönülürken valueChanged tabloyu zaten günceller
+        if self.teslimat_sayfa.value() != 1:
+            self.teslimat_sayfa.setValue(1)
+        else:
+            self.teslimat_tablo_guncelle()
 
     def teslimat_tablo_guncelle(self):
+        arama_metni = self.teslimat_arama.text().strip()
+
+        def sorgu(oturum):
+            return oturum.query(
+                Teslimat.id, Kurye.ad, Teslimat.urun_adi, Teslimat.adres, Teslimat.telefon,
+                Teslimat.tarih, Teslimat.durum, Teslimat.ucret
+            ).join(Teslimat.kurye)
+
+        def kaynak(oturum):
+            # Arama sonuçları alaka sırasıyla aynı sayfalama ile gösterilir
+            if arama_metni:
+                idler = arama.ara(oturum.connection(), 'teslimat_ara', arama_metni, ARAMA_LIMITI)
+                return len(idler), tablo_modeli.id_getirici(sorgu, Teslimat.id, idler)
+            toplam_kayit, surum = satir_sayaci.sayi_ve_degisim(
+                oturum.connection(), 'teslimat', lambda: oturum.query(Teslimat).count()
+            )
+            return toplam_kayit, tablo_modeli.sorgu_getirici(
+                sorgu, Teslimat.id, self.sinir_dizini.okuyucu('teslimat', toplam_kayit, surum)
+            )
+
+        def hata(e):
+            QMessageBox.critical(self, 'Hata', f'Teslimat tablosu güncellenirken hata oluştu: {str(e)}')
+            self.teslimat_modeli.temizle()
+
+        self.teslimat_modeli.sayfa_yukle(
+            kaynak, self.teslimat_sayfa.value(), self.teslimat_sayfa_boyut.currentText(),
+            lambda toplam_kayit, sayfa_sayisi: tablo_modeli.sayfa_siniri(self.teslimat_sayfa, sayfa_sayisi),
+            hata
+        )
+
+    def teslimat_disa_aktar(self):
+        # Filtre penceresinin kurye listesi de işçide okunur
+        self.isci.calistir(
+            'disa_aktar',
+            lambda oturum: oturum.query(Kurye.id, Kurye.ad).order_by(Kurye.ad).all(),
+            self.disa_aktarim_penceresi,
+            lambda e: QMessageBox.critical(self, 'Hata', f'Dışa aktarma sırasında hata oluştu: {str(e)}')
+        )
+
+    def disa_aktarim_penceresi(self, kuryeler):
         try:
-            sayfa = self.teslimat_sayfa.value()
-            sayfa_boyutu = int(self.teslimat_sayfa_boyut.currentText())
-            offset = (sayfa - 1) * sayfa_boyutu
-            
-            # Toplam kayıt sayısını al
-            toplam_kayit = self.session.query(Teslimat).count()
-            max_sayfa = (toplam_kayit + sayfa_boyutu - 1) // sayfa_boyutu
-            self.teslimat_sayfa.setMaximum(max(1, max_sayfa))
-            
-            # Sayfalı veri çek
-            teslimatlar = self.session.query(Teslimat)\
-                .join(Kurye)\
-                .order_by(Teslimat.id.desc())\
-                .offset(offset)\
-                .limit(sayfa_boyutu)\
-                .all()
+            dialog = QDialog(self)
+            dialog.setWindowTitle('Teslimatları Dışa Aktar')
+            layout = QFormLayout(dialog)
             
-            self.teslimat_tablo.setRowCount(len(teslimatlar))
-            
-            for i, teslimat in enumerate(teslimatlar):
-                self.teslimat_tablo.setItem(i, 0, QTableWidgetItem(str(teslimat.id)))
-                self.teslimat_tablo.setItem(i, 1, QTableWidgetItem(teslimat.kurye.ad))
-                self.teslimat_tablo.setItem(i, 2, QTableWidgetItem(teslimat.urun_adi))
-                self.teslimat_tablo.setItem(i, 3, QTableWidgetItem(teslimat.adres))
-                self.teslimat_tablo.setItem(i, 4, QTableWidgetItem(teslimat.telefon))
-                self.teslimat_tablo.setItem(i, 5, QTableWidgetItem(teslimat.tarih.strftime('%d.%m.%Y %H:%M')))
-                self.teslimat_tablo.setItem(i, 6, QTableWidgetItem(teslimat.durum))
-                self.teslimat_tablo.setItem(i, 7, QTableWidgetItem(f'₺{teslimat.ucret:.2f}'))
-                
-                islemler_widget = QWidget()
-                islemler_layout = QHBoxLayout(islemler_widget)
-                islemler_layout.setContentsMargins(5, 2, 5, 2)
-                
-                duzenle_btn = QPushButton('Düzenle')
-                duzenle_btn.setMinimumWidth(100)
-                duzenle_btn.clicked.connect(lambda checked, t=teslimat: self.teslimat_duzenle(t.id))
-                
-                islemler_layout.addWidget(duzenle_btn)
-                
-                sil_btn = QPushButton('Sil')
-                sil_btn.setMinimumWidth(100)
-                sil_btn.clicked.connect(lambda checked, t=teslimat: self.teslimat_sil(t.id))
-                
-                islemler_layout.addWidget(sil_btn)
-                islemler_layout.addStretch()
-                
-                self.teslimat_tablo.setCellWidget(i, 8, islemler_widget)
-                
+            # Kurye filtresi
+            kurye_combo = QComboBox()
+            kurye_combo.addItem('Tüm Kuryeler', None)
+            for kurye_id, ad in kuryeler:
+                kurye_combo.addItem(ad, kurye_id)
+            layout.addRow('Kurye:', kurye_combo)
+            
+            # Durum filtresi
+            durum_combo = QComboBox()
+            durum_combo.addItems(['Tümü', 'Devam Ediyor', 'Tamamlandı'])
+            layout.addRow('Durum:', durum_combo)
+            
+            # Tarih aralığı
+            tarih_check = QCheckBox('Tarih aralığı uygula')
+            baslangic_edit = QDateEdit(QDate.currentDate().addMonths(-1))
+            baslangic_edit.setCalendarPopup(True)
+            bitis_edit = QDateEdit(QDate.currentDate())
+            bitis_edit.setCalendarPopup(True)
+            layout.addRow(tarih_check)
+            layout.addRow('Başlangıç:', baslangic_edit)
+            layout.addRow('Bitiş:', bitis_edit)
+            
+            # Biçim
+            bicim_combo = QComboBox()
+            bicim_combo.addItems(list(disa_aktarim.BICIMLER))
+            layout.addRow('Biçim:', bicim_combo)
+            
+            aktar_btn = QPushButton('Aktar')
+            aktar_btn.clicked.connect(dialog.accept)
+            layout.addRow(aktar_btn)
+            
+            if dialog.exec_() != QDialog.Accepted:
+                return
+            
+            bicim = bicim_combo.currentText()
+            yol, _ = QFileDialog.getSaveFileName(
+                self, 'Dışa Aktar',
+                f'teslimatlar_{datetime.now().strftime("%Y%m%d_%H%M")}.{disa_aktarim.BICIMLER[bicim][1]}',
+                f'{bicim.upper()} (*.{disa_aktarim.BICIMLER[bicim][1]})'
+            )
+            if not yol:
+                return
+            
+            # Filtreler arayüzde okunur; sorgu ve dosya yazımı işçide çalışır
+            kurye_id = kurye_combo.currentData()
+            durum = durum_combo.currentText() if durum_combo.currentIndex() > 0 else None
+            aralik = None
+            if tarih_check.isChecked():
+                baslangic = baslangic_edit.date().toPyDate()
+                bitis = bitis_edit.date().toPyDate() + timedelta(days=1)
+                aralik = (
+                    datetime(baslangic.year, baslangic.month, baslangic.day),
+                    datetime(bitis.year, bitis.month, bitis.day)
+                )
         except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Teslimat tablosu güncellenirken hata oluştu: {str(e)}')
-            self.teslimat_tablo.setRowCount(0)
+            QMessageBox.critical(self, 'Hata', f'Dışa aktarma sırasında hata oluştu: {str(e)}')
+            return
+
+        def aktar(oturum):
+            sorgu = oturum.query(
+                Teslimat.id, Teslimat.kurye_id, Kurye.ad, Teslimat.urun_adi, Teslimat.adres,
+                Teslimat.telefon, Teslimat.tarih, Teslimat.durum, Teslimat.ucret
+            ).join(Kurye, Teslimat.kurye_id == Kurye.id)
+            
+            if kurye_id:
+                sorgu = sorgu.filter(Teslimat.kurye_id == kurye_id)
+            if durum:
+                sorgu = sorgu.filter(Teslimat.durum == durum)
+            if aralik:
+                sorgu = sorgu.filter(Teslimat.tarih >= aralik[0], Teslimat.tarih < aralik[1])
+            
+            return disa_aktarim.dosyaya_yaz(
+                yol,
+                sorgu.order_by(Teslimat.id),
+                ['id', 'kurye_id', 'kurye', 'urun_adi', 'adres', 'telefon', 'tarih', 'durum', 'ucret'],
+                bicim
+            )
+
+        def bitti(satir_sayisi):
+            self.disa_aktar_btn.setEnabled(True)
+            QMessageBox.information(self, 'Başarılı', f'{satir_sayisi} teslimat dışa aktarıldı!')
+
+        def hata(e):
+            self.disa_aktar_btn.setEnabled(True)
+            QMessageBox.critical(self, 'Hata', f'Dışa aktarma sırasında hata oluştu: {str(e)}')
+
+        # Aktarım sürerken düğme kapalı kalır, durum çubuğunda meşgul göstergesi döner
+        self.disa_aktar_btn.setEnabled(False)
+        self.isci.calistir('', aktar, bitti, hata)
 
     def teslimat_sil(self, teslimat_id):
-        try:
-            teslimat = self.session.get(Teslimat, teslimat_id)
-            self.session.delete(teslimat)
-            self.session.commit()
+        def sil(oturum):
+            teslimat = oturum.get(Teslimat, teslimat_id)
+            if teslimat is None:
+                return False
+            oturum.delete(teslimat)
+            return True
+
+        def bitti(bulundu):
+            if not bulundu:
+                QMessageBox.warning(self, 'Uyarı', 'Teslimat bulunamadı!')
+                return
             self.teslimat_tablo_guncelle()
             QMessageBox.information(self, 'Başarılı', 'Teslimat başarıyla silindi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Teslimat silinirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(sil, bitti, 'Teslimat silinirken hata oluştu')
 
     def teslimat_duzenle(self, teslimat_id):
+        def oku(oturum):
+            teslimat = oturum.get(Teslimat, teslimat_id, options=[joinedload(Teslimat.kurye)])
+            if teslimat is None:
+                return None
+            return teslimat, oturum.query(Kurye.id, Kurye.ad).filter_by(aktif=True).all()
+
+        self.kayit_oku(
+            'duzenle', oku, lambda sonuc: self.teslimat_duzenle_penceresi(*sonuc),
+            'Teslimat bulunamadı!', 'Teslimat düzenlenirken hata oluştu'
+        )
+
+    def teslimat_duzenle_penceresi(self, teslimat, kuryeler):
+        teslimat_id = teslimat.id
         try:
-            teslimat = self.session.get(Teslimat, teslimat_id)
-            if not teslimat:
-                QMessageBox.warning(self, 'Uyarı', 'Teslimat bulunamadı!')
-                return
-            
             dialog = QDialog(self)
             dialog.setWindowTitle('Teslimat Düzenle')
             layout = QVBoxLayout(dialog)
@@ -1079,9 +1347,8 @@ class KuryeTakipUygulamasi(QMainWindow):
             # Kurye seçimi
             kurye_combo = QComboBox()
             kurye_combo.setMinimumWidth(200)
-            kuryeler = self.session.query(Kurye).filter_by(aktif=True).all()
-            for kurye in kuryeler:
-                kurye_combo.addItem(kurye.ad, kurye.id)
+            for kurye_id, ad in kuryeler:
+                kurye_combo.addItem(ad, kurye_id)
             kurye_combo.setCurrentText(teslimat.kurye.ad)
             layout.addWidget(QLabel('Kurye:'))
             layout.addWidget(kurye_combo)
@@ -1130,85 +1397,81 @@ class KuryeTakipUygulamasi(QMainWindow):
             QMessageBox.critical(self, 'Hata', f'Teslimat düzenlenirken hata oluştu: {str(e)}')
 
     def teslimat_guncelle(self, teslimat_id, kurye_id, adres, telefon, urun_adi, ucret, dialog):
-        try:
-            teslimat = self.session.get(Teslimat, teslimat_id)
-            if not teslimat:
-                QMessageBox.warning(self, 'Uyarı', 'Teslimat bulunamadı!')
-                return
-            
+        def guncelle(oturum):
+            teslimat = oturum.get(Teslimat, teslimat_id)
+            if teslimat is None:
+                return False
             teslimat.kurye_id = kurye_id
             teslimat.adres = adres
             teslimat.telefon = telefon
             teslimat.urun_adi = urun_adi
             teslimat.ucret = ucret
-            self.session.commit()
+            return True
+
+        def bitti(bulundu):
+            if not bulundu:
+                QMessageBox.warning(self, 'Uyarı', 'Teslimat bulunamadı!')
+                return
             self.teslimat_tablo_guncelle()
             dialog.accept()
             QMessageBox.information(self, 'Başarılı', 'Teslimat başarıyla güncellendi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Teslimat güncellenirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(guncelle, bitti, 'Teslimat güncellenirken hata oluştu', dialog)
 
     def kurye_performans_goster(self):
-        try:
-            kuryeler = self.session.query(Kurye).filter_by(aktif=True).all()
+        def oku(oturum):
+            # Teslimat satırları yerine günlük özet tablosu toplanır (gün × kurye)
+            ozet = gunluk_ozet.gunluk_ozet.c
+            tamamlanan = ozet.durum == 'Tamamlandı'
+            return oturum.query(
+                Kurye.ad,
+                func.coalesce(func.sum(case((tamamlanan, ozet.adet), else_=0)), 0),
+                func.coalesce(func.sum(case((tamamlanan, ozet.ciro), else_=0)), 0),
+                func.coalesce(func.sum(ozet.gider), 0)
+            ).outerjoin(gunluk_ozet.gunluk_ozet, ozet.kurye_id == Kurye.id)\
+                .filter(Kurye.aktif == True)\
+                .group_by(Kurye.id)\
+                .order_by(Kurye.id)\
+                .all()
+
+        def goster(kuryeler):
             self.rapor_tablo.setRowCount(len(kuryeler))
-            self.rapor_tablo.setColumnCount(4)
-            self.rapor_tablo.setHorizontalHeaderLabels(['Kurye', 'Toplam Teslimat', 'Toplam Ücret', 'Ortalama Süre'])
-            
-            for i, kurye in enumerate(kuryeler):
-                try:
-                    tamamlanan_teslimatlar = [t for t in kurye.teslimatlar if t.durum == 'Tamamlandı']
-                    
-                    toplam_teslimat = len(tamamlanan_teslimatlar)
-                    toplam_ucret = sum(t.ucret for t in tamamlanan_teslimatlar if t.ucret is not None)
-                    
-                    self.rapor_tablo.setItem(i, 0, QTableWidgetItem(kurye.ad))
-                    self.rapor_tablo.setItem(i, 1, QTableWidgetItem(str(toplam_teslimat)))
-                    self.rapor_tablo.setItem(i, 2, QTableWidgetItem(f'{toplam_ucret:.2f} TL'))
-                    self.rapor_tablo.setItem(i, 3, QTableWidgetItem('--'))
-                except Exception as e:
-                    QMessageBox.warning(self, 'Uyarı', f'Kurye {kurye.ad} için performans hesaplanırken hata oluştu: {str(e)}')
-                    continue
-        except Exception as e:
+            self.rapor_tablo.setColumnCount(5)
+            self.rapor_tablo.setHorizontalHeaderLabels(['Kurye', 'Toplam Teslimat', 'Toplam Ücret', 'Toplam Gider', 'Ortalama Süre'])
+            
+            for i, (ad, toplam_teslimat, toplam_ucret, toplam_gider) in enumerate(kuryeler):
+                self.rapor_tablo.setItem(i, 0, QTableWidgetItem(ad))
+                self.rapor_tablo.setItem(i, 1, QTableWidgetItem(str(toplam_teslimat)))
+                self.rapor_tablo.setItem(i, 2, QTableWidgetItem(f'{toplam_ucret:.2f} TL'))
+                self.rapor_tablo.setItem(i, 3, QTableWidgetItem(f'{toplam_gider:.2f} TL'))
+                self.rapor_tablo.setItem(i, 4, QTableWidgetItem('--'))
+
+        def hata(e):
             QMessageBox.critical(self, 'Hata', f'Performans raporu oluşturulurken hata oluştu: {str(e)}')
             self.rapor_tablo.setRowCount(0)
             self.rapor_tablo.setColumnCount(0)
 
+        # İki rapor aynı tabloya yazar; son tıklanan kazanır
+        self.isci.calistir('rapor', oku, goster, hata)
+
     def teslimat_istatistikleri_goster(self):
-        bugun = datetime.now().date()
-        hafta_basi = bugun - timedelta(days=bugun.weekday())
-        ay_basi = bugun.replace(day=1)
-        
-        gunluk_teslimatlar = self.session.query(Teslimat).filter(
-            func.date(Teslimat.tarih) == bugun
-        ).all()
-        
-        haftalik_teslimatlar = self.session.query(Teslimat).filter(
-            func.date(Teslimat.tarih) >= hafta_basi
-        ).all()
-        
-        aylik_teslimatlar = self.session.query(Teslimat).filter(
-            func.date(Teslimat.tarih) >= ay_basi
-        ).all()
-        
-        self.rapor_tablo.setRowCount(3)
-        self.rapor_tablo.setColumnCount(3)
-        self.rapor_tablo.setHorizontalHeaderLabels(['Periyot', 'Toplam Teslimat', 'Toplam Ücret'])
-        
-        # Günlük istatistikler
-        self.rapor_tablo.setItem(0, 0, QTableWidgetItem('Günlük'))
-        self.rapor_tablo.setItem(0, 1, QTableWidgetItem(str(len(gunluk_teslimatlar))))
-        self.rapor_tablo.setItem(0, 2, QTableWidgetItem(f"{sum(t.ucret for t in gunluk_teslimatlar if t.ucret):.2f} TL"))
-        
-        # Haftalık istatistikler
-        self.rapor_tablo.setItem(1, 0, QTableWidgetItem('Haftalık'))
-        self.rapor_tablo.setItem(1, 1, QTableWidgetItem(str(len(haftalik_teslimatlar))))
-        self.rapor_tablo.setItem(1, 2, QTableWidgetItem(f"{sum(t.ucret for t in haftalik_teslimatlar if t.ucret):.2f} TL"))
-        
-        # Aylık istatistikler
-        self.rapor_tablo.setItem(2, 0, QTableWidgetItem('Aylık'))
-        self.rapor_tablo.setItem(2, 1, QTableWidgetItem(str(len(aylik_teslimatlar))))
-        self.rapor_tablo.setItem(2, 2, QTableWidgetItem(f"{sum(t.ucret for t in aylik_teslimatlar if t.ucret):.2f} TL"))
+        periyotlar = [('gunluk', 'Günlük'), ('haftalik', 'Haftalık'), ('aylik', 'Aylık'), ('yillik', 'Yıllık')]
+
+        def goster(istatistikler):
+            self.rapor_tablo.setRowCount(len(periyotlar))
+            self.rapor_tablo.setColumnCount(4)
+            self.rapor_tablo.setHorizontalHeaderLabels(['Periyot', 'Toplam Teslimat', 'Toplam Ücret', 'Toplam Gider'])
+            
+            for i, (anahtar, periyot) in enumerate(periyotlar):
+                self.rapor_tablo.setItem(i, 0, QTableWidgetItem(periyot))
+                self.rapor_tablo.setItem(i, 1, QTableWidgetItem(str(istatistikler[anahtar]['toplam'])))
+                self.rapor_tablo.setItem(i, 2, QTableWidgetItem(f"{istatistikler[anahtar]['toplam_ucret']:.2f} TL"))
+                self.rapor_tablo.setItem(i, 3, QTableWidgetItem(f"{istatistikler[anahtar]['gider']:.2f} TL"))
+
+        self.isci.calistir(
+            'rapor', istatistik.donem_ozetleri, goster,
+            lambda e: QMessageBox.critical(self, 'Hata', f'Teslimat istatistikleri alınırken hata oluştu: {str(e)}')
+        )
 
     def rapor_tab_olustur(self):
         layout = QVBoxLayout(self.rapor_tab)
@@ -1239,27 +1502,29 @@ class KuryeTakipUygulamasi(QMainWindow):
         
         self.gider_kurye = QComboBox()
         self.gider_kurye.setMinimumWidth(200)
-        self.kurye_listesi_guncelle()
+        self.kurye_listesi_guncelle(self.gider_kurye)
         self.gider_aciklama = QLineEdit()
         self.gider_aciklama.setPlaceholderText('Gider Açıklaması')
         self.gider_miktar = QDoubleSpinBox()
         self.gider_miktar.setRange(0, 10000)
         self.gider_miktar.setPrefix('₺')
         
-        gider_ekle_btn = QPushButton('Gider Ekle')
-        gider_ekle_btn.clicked.connect(self.gider_ekle)
+        self.gider_ekle_btn = QPushButton('Gider Ekle')
+        self.gider_ekle_btn.clicked.connect(self.gider_ekle)
         
         form_layout.addWidget(self.gider_kurye)
         form_layout.addWidget(self.gider_aciklama)
         form_layout.addWidget(self.gider_miktar)
-        form_layout.addWidget(gider_ekle_btn)
+        form_layout.addWidget(self.gider_ekle_btn)
         
         layout.addLayout(form_layout)
         
         # Gider tablosu
-        self.gider_tablo = QTableWidget()
-        self.gider_tablo.setColumnCount(6)
-        self.gider_tablo.setHorizontalHeaderLabels(['ID', 'Kurye', 'Tarih', 'Açıklama', 'Miktar', 'İşlemler'])
+        self.gider_modeli = tablo_modeli.SatirModeli([
+            ('ID', None), ('Kurye', None), ('Tarih', tablo_modeli.tarih_metni),
+            ('Açıklama', None), ('Miktar', tablo_modeli.para_metni), ('İşlemler', None)
+        ], self.isci, 'gider_tablo', parent=self)
+        self.gider_tablo = tablo_modeli.tablo_gorunumu(self.gider_modeli, [('Sil', self.gider_sil)])
         
         # Dinamik sütun genişlikleri
         header = self.gider_tablo.horizontalHeader()
@@ -1268,8 +1533,6 @@ class KuryeTakipUygulamasi(QMainWindow):
         header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Tarih
         header.setSectionResizeMode(3, QHeaderView.Stretch)  # Açıklama
         header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Miktar
-        header.setSectionResizeMode(5, QHeaderView.Fixed)  # İşlemler
-        self.gider_tablo.setColumnWidth(5, 150)
         
         layout.addWidget(self.gider_tablo)
         
@@ -1279,7 +1542,7 @@ class KuryeTakipUygulamasi(QMainWindow):
         self.gider_sayfa_spin.setMinimum(1)
         self.gider_sayfa_spin.valueChanged.connect(self.gider_tablo_guncelle)
         self.gider_sayfa_boyut_combo = QComboBox()
-        self.gider_sayfa_boyut_combo.addItems(['10', '25', '50', '100'])
+        self.gider_sayfa_boyut_combo.addItems(tablo_modeli.SAYFA_BOYUTLARI)
         self.gider_sayfa_boyut_combo.currentTextChanged.connect(self.gider_tablo_guncelle)
         
         sayfalama_layout.addWidget(QLabel('Sayfa:'))
@@ -1294,111 +1557,86 @@ class KuryeTakipUygulamasi(QMainWindow):
         self.gider_tablo_guncelle()
 
     def gider_ekle(self):
-        try:
-            if self.gider_kurye.count() == 0:
-                QMessageBox.warning(self, 'Uyarı', 'Lütfen önce bir kurye ekleyin!')
-                return
-                
-            kurye_id = self.gider_kurye.itemData(self.gider_kurye.currentIndex())
-            if not kurye_id:
-                QMessageBox.warning(self, 'Uyarı', 'Lütfen bir kurye seçin!')
-                return
-                
-            if not self.gider_aciklama.text():
-                QMessageBox.warning(self, 'Uyarı', 'Lütfen gider açıklaması girin!')
-                return
+        if self.gider_kurye.count() == 0:
+            QMessageBox.warning(self, 'Uyarı', 'Lütfen önce bir kurye ekleyin!')
+            return
             
-            yeni_gider = KuryeGider(
-                kurye_id=kurye_id,
-                aciklama=self.gider_aciklama.text(),
-                miktar=self.gider_miktar.value()
-            )
-            self.session.add(yeni_gider)
-            self.session.commit()
+        kurye_id = self.gider_kurye.itemData(self.gider_kurye.currentIndex())
+        if not kurye_id:
+            QMessageBox.warning(self, 'Uyarı', 'Lütfen bir kurye seçin!')
+            return
             
+        if not self.gider_aciklama.text():
+            QMessageBox.warning(self, 'Uyarı', 'Lütfen gider açıklaması girin!')
+            return
+        
+        aciklama = self.gider_aciklama.text()
+        miktar = self.gider_miktar.value()
+
+        def ekle(oturum):
+            oturum.add(KuryeGider(kurye_id=kurye_id, aciklama=aciklama, miktar=miktar))
+
+        def bitti(_):
             self.gider_aciklama.clear()
             self.gider_miktar.setValue(0)
             self.gider_tablo_guncelle()
-            
             QMessageBox.information(self, 'Başarılı', 'Gider başarıyla eklendi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Gider eklenirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(ekle, bitti, 'Gider eklenirken hata oluştu', self.gider_ekle_btn)
 
     def gider_sil(self, gider_id):
-        try:
-            gider = self.session.get(KuryeGider, gider_id)
-            self.session.delete(gider)
-            self.session.commit()
+        def sil(oturum):
+            gider = oturum.get(KuryeGider, gider_id)
+            if gider is None:
+                return False
+            oturum.delete(gider)
+            return True
+
+        def bitti(bulundu):
+            if not bulundu:
+                QMessageBox.warning(self, 'Uyarı', 'Gider bulunamadı!')
+                return
             self.gider_tablo_guncelle()
             QMessageBox.information(self, 'Başarılı', 'Gider başarıyla silindi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Gider silinirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(sil, bitti, 'Gider silinirken hata oluştu')
 
     def gider_tablo_guncelle(self):
-        try:
-            sayfa = self.gider_sayfa_spin.value()
-            sayfa_boyutu = int(self.gider_sayfa_boyut_combo.currentText())
-            offset = (sayfa - 1) * sayfa_boyutu
-            
-            # Toplam kayıt sayısını al
-            toplam_kayit = self.session.query(KuryeGider).count()
-            max_sayfa = (toplam_kayit + sayfa_boyutu - 1) // sayfa_boyutu
-            self.gider_sayfa_spin.setMaximum(max(1, max_sayfa))
-            
-            # Sayfalı veri çek
-            giderler = self.session.query(KuryeGider)\
-                .order_by(KuryeGider.id.desc())\
-                .offset(offset)\
-                .limit(sayfa_boyutu)\
-                .all()
-            
-            self.gider_tablo.setRowCount(len(giderler))
-            
-            for i, gider in enumerate(giderler):
-                self.gider_tablo.setItem(i, 0, QTableWidgetItem(str(gider.id)))
-                self.gider_tablo.setItem(i, 1, QTableWidgetItem(gider.kurye.ad))
-                self.gider_tablo.setItem(i, 2, QTableWidgetItem(gider.tarih.strftime('%d.%m.%Y %H:%M')))
-                self.gider_tablo.setItem(i, 3, QTableWidgetItem(gider.aciklama))
-                self.gider_tablo.setItem(i, 4, QTableWidgetItem(f'₺{gider.miktar:.2f}'))
-                
-                islemler_widget = QWidget()
-                islemler_layout = QHBoxLayout(islemler_widget)
-                islemler_layout.setContentsMargins(5, 2, 5, 2)
-                
-                sil_btn = QPushButton('Sil')
-                sil_btn.setMinimumWidth(100)
-                sil_btn.clicked.connect(lambda checked, g=gider: self.gider_sil(g.id))
-                
-                islemler_layout.addWidget(sil_btn)
-                islemler_layout.addStretch()
-                
-                self.gider_tablo.setCellWidget(i, 5, islemler_widget)
-                
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Gider tablosu güncellenirken hata oluştu: {str(e)}')
+        def sorgu(oturum):
+            return oturum.query(
+                KuryeGider.id, Kurye.ad, KuryeGider.tarih, KuryeGider.aciklama, KuryeGider.miktar
+            ).join(KuryeGider.kurye)
 
-    def kurye_listesi_guncelle(self):
-        try:
-            # Teslimat kurye listesini güncelle
-            if hasattr(self, 'teslimat_kurye'):
-                self.teslimat_kurye.clear()
-                
-            # Gider kurye listesini güncelle
-            if hasattr(self, 'gider_kurye'):
-                self.gider_kurye.clear()
-            
-            kuryeler = self.session.query(Kurye).filter_by(aktif=True).all()
-            
-            if hasattr(self, 'teslimat_kurye'):
-                for kurye in kuryeler:
-                    self.teslimat_kurye.addItem(kurye.ad, kurye.id)
-                    
-            if hasattr(self, 'gider_kurye'):
-                for kurye in kuryeler:
-                    self.gider_kurye.addItem(kurye.ad, kurye.id)
-                    
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Kurye listesi güncellenirken hata oluştu: {str(e)}')
+        def kaynak(oturum):
+            toplam_kayit, surum = satir_sayaci.sayi_ve_degisim(
+                oturum.connection(), 'kurye_gider', lambda: oturum.query(KuryeGider).count()
+            )
+            return toplam_kayit, tablo_modeli.sorgu_getirici(
+                sorgu, KuryeGider.id, self.sinir_dizini.okuyucu('kurye_gider', toplam_kayit, surum)
+            )
+
+        self.gider_modeli.sayfa_yukle(
+            kaynak, self.gider_sayfa_spin.value(), self.gider_sayfa_boyut_combo.currentText(),
+            lambda toplam_kayit, sayfa_sayisi: tablo_modeli.sayfa_siniri(self.gider_sayfa_spin, sayfa_sayisi),
+            lambda e: QMessageBox.critical(self, 'Hata', f'Gider tablosu güncellenirken hata oluştu: {str(e)}')
+        )
+
+    def kurye_listesi_guncelle(self, *kutular):
+        # Verilen kurye seçim kutularını doldurur; verilmezse kurulmuş olanların hepsini
+        if not kutular:
+            kutular = [getattr(self, ad) for ad in ('teslimat_kurye', 'gider_kurye') if hasattr(self, ad)]
+
+        def doldur(kuryeler):
+            for kutu in kutular:
+                kutu.clear()
+                for kurye_id, ad in kuryeler:
+                    kutu.addItem(ad, kurye_id)
+
+        # Her sekme kendi kutusunu ister; istekler birbirini bayatlatmasın diye kanalsız
+        self.isci.calistir(
+            '', lambda oturum: oturum.query(Kurye.id, Kurye.ad).filter_by(aktif=True).all(), doldur,
+            lambda e: QMessageBox.critical(self, 'Hata', f'Kurye listesi güncellenirken hata oluştu: {str(e)}')
+        )
 
     def musteri_tab_olustur(self):
         layout = QVBoxLayout(self.musteri_tab)
@@ -1413,20 +1651,37 @@ class KuryeTakipUygulamasi(QMainWindow):
         self.musteri_adres = QLineEdit()
         self.musteri_adres.setPlaceholderText('Adres')
         
-        musteri_ekle_btn = QPushButton('Müşteri Ekle')
-        musteri_ekle_btn.clicked.connect(self.musteri_ekle)
+        self.musteri_ekle_btn = QPushButton('Müşteri Ekle')
+        self.musteri_ekle_btn.clicked.connect(self.musteri_ekle)
         
         form_layout.addWidget(self.musteri_ad)
         form_layout.addWidget(self.musteri_telefon)
         form_layout.addWidget(self.musteri_adres)
-        form_layout.addWidget(musteri_ekle_btn)
+        form_layout.addWidget(self.musteri_ekle_btn)
         
         layout.addLayout(form_layout)
         
+        # Tam metin arama; yazarken kısa bir gecikmeyle uygulanır
+        self.musteri_arama = QLineEdit()
+        self.musteri_arama.setPlaceholderText('Ad soyad veya adres ara')
+        self.musteri_arama.setClearButtonEnabled(True)
+        self.musteri_arama_zamanlayici = QTimer(self)
+        self.musteri_arama_zamanlayici.setSingleShot(True)
+        self.musteri_arama_zamanlayici.setInterval(250)
+        self.musteri_arama_zamanlayici.timeout.connect(self.musteri_aramayi_uygula)
+        self.musteri_arama.textChanged.connect(lambda _: self.musteri_arama_zamanlayici.start())
+        layout.addWidget(self.musteri_arama)
+        
         # Müşteri tablosu
-        self.musteri_tablo = QTableWidget()
-        self.musteri_tablo.setColumnCount(8)
-        self.musteri_tablo.setHorizontalHeaderLabels(['ID', 'Ad Soyad', 'Telefon', 'Adres', 'Kayıt Tarihi', 'Ürün', 'Ücret', 'İşlemler'])
+        self.musteri_modeli = tablo_modeli.SatirModeli([
+            ('ID', None), ('Ad Soyad', None), ('Telefon', None), ('Adres', None),
+            ('Kayıt Tarihi', tablo_modeli.tarih_metni), ('Ürün', None),
+            ('Ücret', tablo_modeli.para_metni), ('İşlemler', None)
+        ], self.isci, 'musteri_tablo', parent=self)
+        self.musteri_tablo = tablo_modeli.tablo_gorunumu(self.musteri_modeli, [
+            ('Ürün Düzenle', self.musteri_urun_duzenle), ('Düzenle', self.musteri_duzenle),
+            ('Yazdır', self.musteri_yazdir), ('Sil', self.musteri_sil)
+        ])
         
         # Dinamik sütun genişlikleri
         header = self.musteri_tablo.horizontalHeader()
@@ -1437,8 +1692,6 @@ class KuryeTakipUygulamasi(QMainWindow):
         header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Kayıt Tarihi
         header.setSectionResizeMode(5, QHeaderView.Stretch)  # Ürün
         header.setSectionResizeMode(6, QHeaderView.ResizeToContents)  # Ücret
-        header.setSectionResizeMode(7, QHeaderView.Fixed)  # İşlemler
-        self.musteri_tablo.setColumnWidth(7, 300)
         
         layout.addWidget(self.musteri_tablo)
         
@@ -1448,7 +1701,7 @@ class KuryeTakipUygulamasi(QMainWindow):
         self.musteri_sayfa_spin.setMinimum(1)
         self.musteri_sayfa_spin.valueChanged.connect(self.musteri_tablo_guncelle)
         self.musteri_sayfa_boyut_combo = QComboBox()
-        self.musteri_sayfa_boyut_combo.addItems(['10', '25', '50', '100'])
+        self.musteri_sayfa_boyut_combo.addItems(tablo_modeli.SAYFA_BOYUTLARI)
         self.musteri_sayfa_boyut_combo.currentTextChanged.connect(self.musteri_tablo_guncelle)
         
         sayfalama_layout.addWidget(QLabel('Sayfa:'))
@@ -1463,54 +1716,60 @@ class KuryeTakipUygulamasi(QMainWindow):
         self.musteri_tablo_guncelle()
 
     def musteri_ekle(self):
-        try:
-            if not self.musteri_ad.text().strip():
-                QMessageBox.warning(self, 'Uyarı', 'Lütfen müşteri adını girin!')
-                return
-                
-            if not self.musteri_telefon.text().strip():
-                QMessageBox.warning(self, 'Uyarı', 'Lütfen müşteri telefonunu girin!')
-                return
-                
-            if not self.musteri_adres.text().strip():
-                QMessageBox.warning(self, 'Uyarı', 'Lütfen müşteri adresini girin!')
-                return
+        if not self.musteri_ad.text().strip():
+            QMessageBox.warning(self, 'Uyarı', 'Lütfen müşteri adını girin!')
+            return
             
-            yeni_musteri = Musteri(
-                ad_soyad=self.musteri_ad.text().strip(),
-                telefon=self.musteri_telefon.text().strip(),
-                adres=self.musteri_adres.text().strip()
-            )
-            self.session.add(yeni_musteri)
-            self.session.commit()
+        if not self.musteri_telefon.text().strip():
+            QMessageBox.warning(self, 'Uyarı', 'Lütfen müşteri telefonunu girin!')
+            return
             
+        if not self.musteri_adres.text().strip():
+            QMessageBox.warning(self, 'Uyarı', 'Lütfen müşteri adresini girin!')
+            return
+        
+        ad_soyad = self.musteri_ad.text().strip()
+        telefon = self.musteri_telefon.text().strip()
+        adres = self.musteri_adres.text().strip()
+
+        def ekle(oturum):
+            oturum.add(Musteri(ad_soyad=ad_soyad, telefon=telefon, adres=adres))
+
+        def bitti(_):
             self.musteri_ad.clear()
             self.musteri_telefon.clear()
             self.musteri_adres.clear()
             self.musteri_tablo_guncelle()
-            
             QMessageBox.information(self, 'Başarılı', 'Müşteri başarıyla eklendi!')
-        except Exception as e:
-            self.session.rollback()
-            QMessageBox.critical(self, 'Hata', f'Müşteri eklenirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(ekle, bitti, 'Müşteri eklenirken hata oluştu', self.musteri_ekle_btn)
 
     def musteri_sil(self, musteri_id):
-        try:
-            musteri = self.session.get(Musteri, musteri_id)
+        def sil(oturum):
+            musteri = oturum.get(Musteri, musteri_id)
+            if musteri is None:
+                return False
             musteri.aktif = False
-            self.session.commit()
+            return True
+
+        def bitti(bulundu):
+            if not bulundu:
+                QMessageBox.warning(self, 'Uyarı', 'Müşteri bulunamadı!')
+                return
             self.musteri_tablo_guncelle()
             QMessageBox.information(self, 'Başarılı', 'Müşteri başarıyla silindi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Müşteri silinirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(sil, bitti, 'Müşteri silinirken hata oluştu')
 
     def musteri_duzenle(self, musteri_id):
+        self.kayit_oku(
+            'duzenle', lambda oturum: oturum.get(Musteri, musteri_id), self.musteri_duzenle_penceresi,
+            'Müşteri bulunamadı!', 'Müşteri düzenlenirken hata oluştu'
+        )
+
+    def musteri_duzenle_penceresi(self, musteri):
+        musteri_id = musteri.id
         try:
-            musteri = self.session.get(Musteri, musteri_id)
-            if not musteri:
-                QMessageBox.warning(self, 'Uyarı', 'Müşteri bulunamadı!')
-                return
-            
             dialog = QDialog(self)
             dialog.setWindowTitle('Müşteri Düzenle')
             layout = QVBoxLayout(dialog)
@@ -1549,89 +1808,70 @@ class KuryeTakipUygulamasi(QMainWindow):
             QMessageBox.critical(self, 'Hata', f'Müşteri düzenlenirken hata oluştu: {str(e)}')
 
     def musteri_guncelle(self, musteri_id, ad_soyad, telefon, adres, dialog):
-        try:
-            musteri = self.session.get(Musteri, musteri_id)
-            if not musteri:
-                QMessageBox.warning(self, 'Uyarı', 'Müşteri bulunamadı!')
-                return
-            
+        def guncelle(oturum):
+            musteri = oturum.get(Musteri, musteri_id)
+            if musteri is None:
+                return False
             musteri.ad_soyad = ad_soyad
             musteri.telefon = telefon
             musteri.adres = adres
-            self.session.commit()
+            return True
+
+        def bitti(bulundu):
+            if not bulundu:
+                QMessageBox.warning(self, 'Uyarı', 'Müşteri bulunamadı!')
+                return
             self.musteri_tablo_guncelle()
             dialog.accept()
             QMessageBox.information(self, 'Başarılı', 'Müşteri başarıyla güncellendi!')
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Müşteri güncellenirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(guncelle, bitti, 'Müşteri güncellenirken hata oluştu', dialog)
+
+    def musteri_aramayi_uygula(self):
+        # Sayfa 1'e dönülürken valueChanged tabloyu zaten günceller
+        if self.musteri_sayfa_spin.value() != 1:
+            self.musteri_sayfa_spin.setValue(1)
+        else:
+            self.musteri_tablo_guncelle()
 
     def musteri_tablo_guncelle(self):
-        try:
-            sayfa = self.musteri_sayfa_spin.value()
-            sayfa_boyutu = int(self.musteri_sayfa_boyut_combo.currentText())
-            offset = (sayfa - 1) * sayfa_boyutu
-            
-            # Toplam kayıt sayısını al
-            toplam_kayit = self.session.query(Musteri).filter_by(aktif=True).count()
-            max_sayfa = (toplam_kayit + sayfa_boyutu - 1) // sayfa_boyutu
-            self.musteri_sayfa_spin.setMaximum(max(1, max_sayfa))
-            
-            # Sayfalı veri çek
-            musteriler = self.session.query(Musteri).filter_by(aktif=True)\
-                .order_by(Musteri.id.desc())\
-                .offset(offset)\
-                .limit(sayfa_boyutu)\
-                .all()
-            
-            self.musteri_tablo.setRowCount(len(musteriler))
-            
-            for i, musteri in enumerate(musteriler):
-                self.musteri_tablo.setItem(i, 0, QTableWidgetItem(str(musteri.id)))
-                self.musteri_tablo.setItem(i, 1, QTableWidgetItem(musteri.ad_soyad))
-                self.musteri_tablo.setItem(i, 2, QTableWidgetItem(musteri.telefon))
-                self.musteri_tablo.setItem(i, 3, QTableWidgetItem(musteri.adres))
-                self.musteri_tablo.setItem(i, 4, QTableWidgetItem(musteri.kayit_tarihi.strftime('%d.%m.%Y %H:%M')))
-                self.musteri_tablo.setItem(i, 5, QTableWidgetItem(getattr(musteri, 'urun_adi', '')))
-                self.musteri_tablo.setItem(i, 6, QTableWidgetItem(f'₺{getattr(musteri, "ucret", 0):.2f}'))
-                
-                islemler_widget = QWidget()
-                islemler_layout = QHBoxLayout(islemler_widget)
-                islemler_layout.setContentsMargins(5, 2, 5, 2)
-                
-                urun_duzenle_btn = QPushButton('Ürün Düzenle')
-                urun_duzenle_btn.setMinimumWidth(100)
-                urun_duzenle_btn.clicked.connect(lambda checked, m=musteri: self.musteri_urun_duzenle(m.id))
-                
-                duzenle_btn = QPushButton('Düzenle')
-                duzenle_btn.setMinimumWidth(100)
-                duzenle_btn.clicked.connect(lambda checked, m=musteri: self.musteri_duzenle(m.id))
-                
-                yazdir_btn = QPushButton('Yazdır')
-                yazdir_btn.setMinimumWidth(100)
-                yazdir_btn.clicked.connect(lambda checked, m=musteri: self.musteri_yazdir(m.id))
-                
-                sil_btn = QPushButton('Sil')
-                sil_btn.setMinimumWidth(100)
-                sil_btn.clicked.connect(lambda checked, m=musteri: self.musteri_sil(m.id))
-                
-                islemler_layout.addWidget(urun_duzenle_btn)
-                islemler_layout.addWidget(duzenle_btn)
-                islemler_layout.addWidget(yazdir_btn)
-                islemler_layout.addWidget(sil_btn)
-                islemler_layout.addStretch()
-                
-                self.musteri_tablo.setCellWidget(i, 7, islemler_widget)
-                
-        except Exception as e:
-            QMessageBox.critical(self, 'Hata', f'Müşteri tablosu güncellenirken hata oluştu: {str(e)}')
+        arama_metni = self.musteri_arama.text().strip()
+
+        def sorgu(oturum):
+            return oturum.query(
+                Musteri.id, Musteri.ad_soyad, Musteri.telefon, Musteri.adres,
+                Musteri.kayit_tarihi, Musteri.urun_adi, Musteri.ucret
+            )
+
+        def kaynak(oturum):
+            if arama_metni:
+                idler = arama.ara(oturum.connection(), 'musteri_ara', arama_metni, ARAMA_LIMITI,
+                                  kosul='musteri.aktif = 1')
+                return len(idler), tablo_modeli.id_getirici(sorgu, Musteri.id, idler)
+            toplam_kayit, surum = satir_sayaci.sayi_ve_degisim(
+                oturum.connection(), 'musteri:aktif',
+                lambda: oturum.query(Musteri).filter_by(aktif=True).count()
+            )
+            return toplam_kayit, tablo_modeli.sorgu_getirici(
+                lambda o: sorgu(o).filter(Musteri.aktif == True), Musteri.id,
+                self.sinir_dizini.okuyucu('musteri:aktif', toplam_kayit, surum)
+            )
+
+        self.musteri_modeli.sayfa_yukle(
+            kaynak, self.musteri_sayfa_spin.value(), self.musteri_sayfa_boyut_combo.currentText(),
+            lambda toplam_kayit, sayfa_sayisi: tablo_modeli.sayfa_siniri(self.musteri_sayfa_spin, sayfa_sayisi),
+            lambda e: QMessageBox.critical(self, 'Hata', f'Müşteri tablosu güncellenirken hata oluştu: {str(e)}')
+        )
 
     def musteri_urun_duzenle(self, musteri_id):
+        self.kayit_oku(
+            'duzenle', lambda oturum: oturum.get(Musteri, musteri_id), self.musteri_urun_penceresi,
+            'Müşteri bulunamadı!', 'Ürün düzenlenirken hata oluştu'
+        )
+
+    def musteri_urun_penceresi(self, musteri):
+        musteri_id = musteri.id
         try:
-            musteri = self.session.get(Musteri, musteri_id)
-            if not musteri:
-                QMessageBox.warning(self, 'Uyarı', 'Müşteri bulunamadı!')
-                return
-            
             dialog = QDialog(self)
             dialog.setWindowTitle('Ürün ve Ücret Düzenle')
             layout = QVBoxLayout(dialog)
@@ -1666,29 +1906,33 @@ class KuryeTakipUygulamasi(QMainWindow):
             QMessageBox.critical(self, 'Hata', f'Ürün düzenlenirken hata oluştu: {str(e)}')
 
     def musteri_urun_kaydet(self, musteri_id, urun_adi, ucret, dialog):
-        try:
-            musteri = self.session.get(Musteri, musteri_id)
-            if not musteri:
-                QMessageBox.warning(self, 'Uyarı', 'Müşteri bulunamadı!')
-                return
-            
+        def kaydet(oturum):
+            musteri = oturum.get(Musteri, musteri_id)
+            if musteri is None:
+                return False
             musteri.urun_adi = urun_adi.strip()
             musteri.ucret = ucret
-            self.session.commit()
+            return True
+
+        def bitti(bulundu):
+            if not bulundu:
+                QMessageBox.warning(self, 'Uyarı', 'Müşteri bulunamadı!')
+                return
             self.musteri_tablo_guncelle()
             dialog.accept()
             QMessageBox.information(self, 'Başarılı', 'Ürün ve ücret başarıyla güncellendi!')
-        except Exception as e:
-            self.session.rollback()
-            QMessageBox.critical(self, 'Hata', f'Ürün güncellenirken hata oluştu: {str(e)}')
+
+        self.kayit_yaz(kaydet, bitti, 'Ürün güncellenirken hata oluştu', dialog)
 
     def musteri_yazdir(self, musteri_id):
+        self.kayit_oku(
+            'yazdir', lambda oturum: oturum.get(Musteri, musteri_id), self.musteri_fisi_yazdir,
+            'Müşteri bulunamadı!', 'Yazdırma sırasında hata oluştu'
+        )
+
+    def musteri_fisi_yazdir(self, musteri):
+        from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
         try:
-            musteri = self.session.get(Musteri, musteri_id)
-            if not musteri:
-                QMessageBox.warning(self, 'Uyarı', 'Müşteri bulunamadı!')
-                return
-            
             # HTML içeriği
             html = f"""
             <html>
@@ -1822,19 +2066,23 @@ class KuryeTakipUygulamasi(QMainWindow):
             QMessageBox.critical(self, 'Hata', f'Yazdırma sırasında hata oluştu: {str(e)}')
 
     def teslimat_yazdir(self):
+        teslimat_id = tablo_modeli.secili_id(self.teslimat_tablo)
+        if teslimat_id is None:
+            QMessageBox.warning(self, 'Uyarı', 'Lütfen yazdırılacak teslimatı seçin.')
+            return
+
+        self.kayit_oku(
+            'yazdir',
+            lambda oturum: oturum.get(Teslimat, teslimat_id, options=[joinedload(Teslimat.kurye)]),
+            self.teslimat_fisi_onizle,
+            'Teslimat bulunamadı.', 'Teslimat yazdırma işlemi sırasında hata oluştu'
+        )
+
+    def teslimat_fisi_onizle(self, teslimat):
+        # QtWebEngine (Chromium) yalnızca önizleme açılınca yüklenir
+        from PyQt5.QtPrintSupport import QPrinter
+        from PyQt5.QtWebEngineWidgets import QWebEngineView
         try:
-            secili_satir = self.teslimat_tablo.currentRow()
-            if secili_satir < 0:
-                QMessageBox.warning(self, 'Uyarı', 'Lütfen yazdırılacak teslimatı seçin.')
-                return
-                
-            teslimat_id = int(self.teslimat_tablo.item(secili_satir, 0).text())
-            teslimat = self.session.get(Teslimat, teslimat_id)
-            
-            if not teslimat:
-                QMessageBox.warning(self, 'Hata', 'Teslimat bulunamadı.')
-                return
-                
             # HTML içeriği
             html = f"""
             <html>
@@ -2016,6 +2264,7 @@ class KuryeTakipUygulamasi(QMainWindow):
             QMessageBox.critical(self, 'Hata', f'Teslimat yazdırma işlemi sırasında hata oluştu: {str(e)}')
 
     def teslimat_yazdir_onayla(self, document, printer, preview_dialog, hizalama, boyut):
+        from PyQt5.QtPrintSupport import QPrintDialog
         try:
             # Yazdırma dialogu
             print_dialog = QPrintDialog(printer, self)
@@ -2055,17 +2304,9 @@ class KuryeTakipUygulamasi(QMainWindow):
 
     def closeEvent(self, event):
         try:
-            if hasattr(self, 'session'):
-                try:
-                    self.session.flush()
-                    self.session.commit()
-                except Exception as e:
-                    print(f"Veritabanı kaydetme hatası: {str(e)}")
-                finally:
-                    try:
-                        self.session.close()
-                    except Exception as e:
-                        print(f"Oturum kapatma hatası: {str(e)}")
+            # Kuyruktaki yazmalar beklenir; her iş kendi işlemini commit eder
+            if hasattr(self, 'isci'):
+                self.isci.kapat()
         except Exception as e:
             print(f"Kapatma hatası: {str(e)}")
         finally:
@@ -2073,20 +2314,18 @@ class KuryeTakipUygulamasi(QMainWindow):
 
 if __name__ == '__main__':
     try:
+        # QtWebEngine sonradan (yazdırma önizlemesinde) yüklenebilsin diye
+        # QApplication'dan önce ayarlanmalı
+        QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
         app = QApplication(sys.argv)
         
-        # Veritabanı bağlantısı
-        engine = create_engine('sqlite:///kurye.db', echo=True)
-        
-        # Veritabanı tablolarını oluştur
-        Base.metadata.create_all(engine)
-        
-        # Uygulama penceresini oluştur
+        # Veritabanı hazırlığı (tablolar, migrasyonlar) pencere içinde yapılır
         window = KuryeTakipUygulamasi()
         window.show()
+        QTimer.singleShot(0, lambda: acilis_olc('giriş ekranı çizildi', ACILIS_BUTCESI))
         
         # Uygulama döngüsünü başlat
         sys.exit(app.exec_())
     except Exception as e:
         print(f"Uygulama başlatma hatası: {str(e)}")
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,234 @@
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request, has_request_context, Response, abort
+from flask.signals import signals_available, before_render_template, template_rendered
+from sqlalchemy import event
+
+# İstek metrikleri: rota başına süre, SQL ifadesi sayısı, veritabanı ve şablon
+# süresi, yanıt boyutu. Değerler süreç içinde kilitli sayaçlarda tutulur ve
+# /metrics altında Prometheus metin biçiminde sunulur.
+#
+# gunicorn altında her işçi kendi sayaçlarını birkaç saniyede bir (ve
+# kapanırken) KURYE_METRIK_DIZINI içine <pid>.json olarak yazar; /metrics isteği hangi
+# işçiye düşerse düşsün tüm dosyaları toplayarak döner.
+
+SURE_KOVALARI = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SQL_KOVALARI = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BOYUT_KOVALARI = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# ad: (tür, açıklama, kovalar)
+METRIKLER = {
+    'kurye_istek_toplam': ('counter', 'Rota ve durum koduna göre istek sayısı', None),
+    'kurye_istek_suresi_saniye': ('histogram', 'Rota başına istek süresi', SURE_KOVALARI),
+    'kurye_istek_sql_sayisi': ('histogram', 'İstek başına çalışan SQL ifadesi sayısı', SQL_KOVALARI),
+    'kurye_istek_db_suresi_saniye': ('histogram', 'İstek başına veritabanında geçen süre', SURE_KOVALARI),
+    'kurye_istek_sablon_suresi_saniye': ('histogram', 'İstek başına şablon çizim süresi', SURE_KOVALARI),
+    'kurye_yanit_boyutu_bayt': ('histogram', 'Yanıt gövdesi boyutu (akış yanıtları hariç)', BOYUT_KOVALARI),
+}
+
+YEREL_ADRESLER = ('127.0.0.1', '::1')
+
+
+class MetrikKaydi:
+    def __init__(self, dizin=None, yazma_araligi=5):
+        self.dizin = dizin
+        if dizin:
+            os.makedirs(dizin, exist_ok=True)
+        self.yazma_araligi = yazma_araligi
+        self._kilit = threading.Lock()
+        # (ad, etiketler) -> sayaç değeri veya [kova adetleri..., +Inf, toplam]
+        self._degerler = {}
+        self._kirli = False
+        self._yazici_pid = None
+
+    def artir(self, ad, etiketler, miktar=1):
+        anahtar = (ad, etiketler)
+        with self._kilit:
+            self._degerler[anahtar] = self._degerler.get(anahtar, 0) + miktar
+
+    def gozle(self, ad, etiketler, deger):
+        kovalar = METRIKLER[ad][2]
+        anahtar = (ad, etiketler)
+        with self._kilit:
+            kayit = self._degerler.get(anahtar)
+            if kayit is None:
+                kayit = self._degerler[anahtar] = [0] * (len(kovalar) + 1) + [0]
+            kayit[bisect_left(kovalar, deger)] += 1
+            kayit[-1] += deger
+
+    def goruntu(self):
+        with self._kilit:
+            return [[ad, list(etiketler), list(kayit) if isinstance(kayit, list) else kayit]
+                    for (ad, etiketler), kayit in self._degerler.items()]
+
+    def degisti(self):
+        # İstek sonunda çağrılır; dosyaya yazma süreç başına tek bir arka plan
+        # iş parçacığına bırakılır, boşta kalan işçinin değerleri de güncel kalır
+        if not self.dizin:
+            return
+        self._kirli = True
+        if self._yazici_pid != os.getpid():
+            with self._kilit:
+                if self._yazici_pid == os.getpid():
+                    return
+                self._yazici_pid = os.getpid()
+            threading.Thread(target=self._yazici, name='metrik-yazici', daemon=True).start()
+
+    def _yazici(self):
+        while True:
+            time.sleep(self.yazma_araligi)
+            if self._kirli:
+                self.diske_yaz()
+
+    def diske_yaz(self):
+        if not self.dizin:
+            return
+        self._kirli = False
+        yol = os.path.join(self.dizin, f'{os.getpid()}.json')
+        try:
+            with open(yol + '.tmp', 'w') as dosya:
+                json.dump(self.goruntu(), dosya)
+            os.replace(yol + '.tmp', yol)
+        except OSError:
+            # Metrik yazılamaması isteği bozmamalı
+            pass
+
+    def tum_surecler(self):
+        # Diğer işçilerin son yazdığı değerler + bu sürecin güncel değerleri
+        goruntuler = [self.goruntu()]
+        if self.dizin:
+            kendi = os.path.join(self.dizin, f'{os.getpid()}.json')
+            for yol in glob.glob(os.path.join(self.dizin, '*.json')):
+                if yol == kendi:
+                    continue
+                try:
+                    with open(yol) as dosya:
+                        goruntuler.append(json.load(dosya))
+                except (OSError, ValueError):
+                    continue
+        toplam = {}
+        for goruntu in goruntuler:
+            for ad, etiketler, kayit in goruntu:
+                if ad not in METRIKLER:
+                    continue
+                anahtar = (ad, tuple(tuple(e) for e in etiketler))
+                if isinstance(kayit, list):
+                    mevcut = toplam.setdefault(anahtar, [0] * len(kayit))
+                    toplam[anahtar] = [a + b for a, b in zip(mevcut, kayit)]
+                else:
+                    toplam[anahtar] = toplam.get(anahtar, 0) + kayit
+        return toplam
+
+
+def _etiket_metni(etiketler, ek=()):
+    parcalar = [
+        '{}="{}"'.format(ad, str(deger).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for ad, deger in tuple(etiketler) + tuple(ek)
+    ]
+    return '{' + ','.join(parcalar) + '}' if parcalar else ''
+
+
+def _sayi(deger):
+    return repr(float(deger)) if isinstance(deger, float) else str(deger)
+
+
+def prometheus_metni(degerler):
+    satirlar = []
+    for ad, (tur, aciklama, kovalar) in METRIKLER.items():
+        kayitlar = sorted((etiketler, kayit) for (a, etiketler), kayit in degerler.items() if a == ad)
+        if not kayitlar:
+            continue
+        satirlar.append(f'# HELP {ad} {aciklama}')
+        satirlar.append(f'# TYPE {ad} {tur}')
+        for etiketler, kayit in kayitlar:
+            if tur == 'counter':
+                satirlar.append(f'{ad}{_etiket_metni(etiketler)} {_sayi(kayit)}')
+                continue
+            birikimli = 0
+            for sinir, adet in zip(list(kovalar) + ['+Inf'], kayit[:-1]):
+                birikimli += adet
+                satirlar.append(f'{ad}_bucket{_etiket_metni(etiketler, (("le", sinir),))} {birikimli}')
+            satirlar.append(f'{ad}_sum{_etiket_metni(etiketler)} {_sayi(kayit[-1])}')
+            satirlar.append(f'{ad}_count{_etiket_metni(etiketler)} {birikimli}')
+    return '\n'.join(satirlar) + '\n'
+
+
+def _istek_olcumu():
+    if has_request_context():
+        return g.get('_metrik')
+    return None
+
+
+def motoru_izle(engine):
+    # SQL sayısı ve süresi yalnızca bir isteğin içindeyken sayılır. Başlangıç
+    # zamanı ifadenin yürütme bağlamında tutulur: hata veren ifadede
+    # after_cursor_execute çağrılmaz, bağlamla birlikte zaman da atılır.
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _sorgu_oncesi(baglanti, imlec, ifade, parametreler, baglam, coklu):
+        if baglam is not None:
+            baglam._metrik_baslangic = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _sorgu_sonrasi(baglanti, imlec, ifade, parametreler, baglam, coklu):
+        baslangic = getattr(baglam, '_metrik_baslangic', None)
+        if baslangic is None:
+            return
+        sure = time.perf_counter() - baslangic
+        olcum = _istek_olcumu()
+        if olcum is not None:
+            olcum['sql'] += 1
+            olcum['db'] += sure
+
+    return engine
+
+
+def uygulamaya_bagla(app, kayit):
+    @app.before_request
+    def _istek_basladi():
+        g._metrik = {'baslangic': time.perf_counter(), 'sql': 0, 'db': 0.0, 'sablon': 0.0, 'sablonlar': []}
+
+    @app.after_request
+    def _istek_bitti(yanit):
+        olcum = g.pop('_metrik', None)
+        if olcum is None or request.endpoint == 'metrikler':
+            return yanit
+        # Uç nokta adı kullanılır; URL'deki id'ler etiket sayısını büyütmesin
+        etiketler = (('endpoint', request.endpoint or 'bulunamadi'), ('method', request.method))
+        kayit.artir('kurye_istek_toplam', etiketler + (('durum', yanit.status_code),))
+        kayit.gozle('kurye_istek_suresi_saniye', etiketler, time.perf_counter() - olcum['baslangic'])
+        kayit.gozle('kurye_istek_sql_sayisi', etiketler, olcum['sql'])
+        kayit.gozle('kurye_istek_db_suresi_saniye', etiketler, olcum['db'])
+        kayit.gozle('kurye_istek_sablon_suresi_saniye', etiketler, olcum['sablon'])
+        if not yanit.is_streamed:
+            kayit.gozle('kurye_yanit_boyutu_bayt', etiketler, yanit.calculate_content_length() or 0)
+        kayit.degisti()
+        return yanit
+
+    # Şablon süreleri Flask sinyalleriyle ölçülür (blinker gerekir)
+    if signals_available:
+        def _sablon_basladi(gonderen, template, context, **ek):
+            olcum = _istek_olcumu()
+            if olcum is not None:
+                olcum['sablonlar'].append(time.perf_counter())
+
+        def _sablon_bitti(gonderen, template, context, **ek):
+            olcum = _istek_olcumu()
+            if olcum is not None and olcum['sablonlar']:
+                olcum['sablon'] += time.perf_counter() - olcum['sablonlar'].pop()
+
+        before_render_template.connect(_sablon_basladi, app, weak=False)
+        template_rendered.connect(_sablon_bitti, app, weak=False)
+
+    @app.route('/metrics', endpoint='metrikler')
+    def _metrikler():
+        # Yalnızca yerel erişim; ters vekil /metrics yolunu dışarı açmamalı
+        if request.remote_addr not in app.config.get('METRIK_IZINLI_ADRESLER', YEREL_ADRESLER):
+            abort(404)
+        return Response(prometheus_metni(kayit.tum_surecler()),
+                        mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+    return kayit
@@ -0,0 +1,214 @@
+import sys
+import veritabani
+import onbellek
+import olay_akisi
+import arama
+import gunluk_ozet
+import satir_sayaci
+from telefon import telefon_anahtari
+
+# Sürümlü şema migrasyonları. Web (app.py) ve masaüstü (kurye_takip.py)
+# aynı kurye.db dosyasını paylaşır; ikisi de açılışta create_all() sonrası
+# migrasyonlari_uygula() çağırır. Uygulanan son sürüm SQLite'ın
+# PRAGMA user_version alanında tutulur.
+#
+# İki programın teslimat tablosu farklı kolonlara sahip olduğu için her adım
+# yalnızca veritabanında gerçekten bulunan tablo ve kolonlara dokunur ve
+# tekrar çalıştırılabilir olmalıdır (IF NOT EXISTS).
+
+MIGRASYONLAR = []
+
+
+def migrasyon(surum, aciklama):
+    def kaydet(fonksiyon):
+        MIGRASYONLAR.append((surum, aciklama, fonksiyon))
+        MIGRASYONLAR.sort(key=lambda m: m[0])
+        return fonksiyon
+    return kaydet
+
+
+def sema_surumu(baglanti):
+    return baglanti.exec_driver_sql('PRAGMA user_version').scalar()
+
+
+def tablo_kolonlari(baglanti, tablo):
+    return {satir[1] for satir in baglanti.exec_driver_sql(f'PRAGMA table_info("{tablo}")')}
+
+
+def indeks_olustur(baglanti, ad, tablo, kolonlar, kosul=None):
+    mevcut = tablo_kolonlari(baglanti, tablo)
+    if not mevcut or not set(kolonlar) <= mevcut:
+        return False
+    sql = f'CREATE INDEX IF NOT EXISTS {ad} ON {tablo} ({", ".join(kolonlar)})'
+    if kosul:
+        sql += f' WHERE {kosul}'
+    baglanti.exec_driver_sql(sql)
+    return True
+
+
+def migrasyonlari_uygula(engine):
+    uygulanan = []
+    with engine.begin() as baglanti:
+        mevcut_surum = sema_surumu(baglanti)
+    for surum, aciklama, fonksiyon in MIGRASYONLAR:
+        if surum <= mevcut_surum:
+            continue
+        with engine.begin() as baglanti:
+            fonksiyon(baglanti)
+            baglanti.exec_driver_sql(f'PRAGMA user_version = {int(surum)}')
+        uygulanan.append((surum, aciklama))
+    return uygulanan
+
+
+@migrasyon(1, 'Temel indeksler')
+def _temel_indeksler(baglanti):
+    # Kurye raporları ve kurye filtresi
+    indeks_olustur(baglanti, 'ix_teslimat_kurye_durum', 'teslimat', ['kurye_id', 'durum'])
+    # Durum filtresi (id sırası indeksin içinde gelir)
+    indeks_olustur(baglanti, 'ix_teslimat_durum', 'teslimat', ['durum'])
+    # Müşteri geçmişi: web şemasında musteri_telefon, masaüstünde telefon
+    indeks_olustur(baglanti, 'ix_teslimat_musteri_telefon', 'teslimat', ['musteri_telefon'])
+    indeks_olustur(baglanti, 'ix_teslimat_telefon', 'teslimat', ['telefon'])
+    # Tarih aralığı raporları
+    indeks_olustur(baglanti, 'ix_teslimat_baslangic_zamani', 'teslimat', ['baslangic_zamani'])
+    indeks_olustur(baglanti, 'ix_teslimat_tarih', 'teslimat', ['tarih'])
+    # Aktif kayıt listeleri (kısmi indeks)
+    indeks_olustur(baglanti, 'ix_kurye_aktif_ad', 'kurye', ['ad'], kosul='aktif = 1')
+    indeks_olustur(baglanti, 'ix_musteri_aktif', 'musteri', ['id'], kosul='aktif = 1')
+    indeks_olustur(baglanti, 'ix_musteri_telefon', 'musteri', ['telefon'])
+    # Gider listesi ve kurye bazlı giderler
+    indeks_olustur(baglanti, 'ix_kurye_gider_kurye_tarih', 'kurye_gider', ['kurye_id', 'tarih'])
+
+
+
+@migrasyon(2, 'Veri sürümü sayaçları')
+def _veri_surumu(baglanti):
+    onbellek.veri_surumu.create(baglanti, checkfirst=True)
+    baglanti.execute(
+        onbellek.veri_surumu.insert().prefix_with('OR IGNORE'),
+        [{'tablo': tablo, 'surum': 0} for tablo in onbellek.IZLENEN_TABLOLAR]
+    )
+
+
+
+@migrasyon(3, 'Normalize müşteri telefon anahtarı')
+def _musteri_telefon_anahtari(baglanti):
+    kolonlar = tablo_kolonlari(baglanti, 'teslimat')
+    if 'musteri_telefon' not in kolonlar:
+        return
+    if 'musteri_telefon_anahtar' not in kolonlar:
+        baglanti.exec_driver_sql('ALTER TABLE teslimat ADD COLUMN musteri_telefon_anahtar VARCHAR(20)')
+    # Mevcut kayıtları Python tarafındaki aynı normalizasyonla doldur
+    baglanti.connection.create_function('telefon_anahtari', 1, telefon_anahtari)
+    baglanti.exec_driver_sql(
+        'UPDATE teslimat SET musteri_telefon_anahtar = telefon_anahtari(musteri_telefon) '
+        'WHERE musteri_telefon_anahtar IS NULL'
+    )
+    indeks_olustur(baglanti, 'ix_teslimat_musteri_telefon_anahtar', 'teslimat', ['musteri_telefon_anahtar'])
+    # Müşteri geçmişi artık anahtar üzerinden okunuyor
+    baglanti.exec_driver_sql('DROP INDEX IF EXISTS ix_teslimat_musteri_telefon')
+
+
+@migrasyon(4, 'Teslimat olay akışı')
+def _teslimat_olay(baglanti):
+    olay_akisi.teslimat_olay.create(baglanti, checkfirst=True)
+    # Tablo kendini budar: her 500 olayda bir, son SAKLANAN_OLAY dışındakiler silinir
+    baglanti.exec_driver_sql(
+        'CREATE TRIGGER IF NOT EXISTS tr_teslimat_olay_buda AFTER INSERT ON teslimat_olay '
+        'WHEN NEW.id % 500 = 0 BEGIN '
+        f'DELETE FROM teslimat_olay WHERE id <= NEW.id - {int(olay_akisi.SAKLANAN_OLAY)}; '
+        'END'
+    )
+
+
+@migrasyon(5, 'Tam metin arama dizinleri')
+def _tam_metin_arama(baglanti):
+    # FTS5 derlenmemişse arama LIKE yedeğiyle çalışır
+    if not arama.fts5_var_mi(baglanti):
+        return
+    for ad in arama.DIZINLER:
+        arama.dizin_kur(baglanti, ad)
+
+
+@migrasyon(6, 'Günlük kurye özet tablosu')
+def _gunluk_ozet(baglanti):
+    gunluk_ozet.tetikleyicileri_kur(baglanti)
+    gunluk_ozet.yeniden_olustur(baglanti)
+    # Birincil anahtar gün ile başlar; kurye bazlı raporlar için ayrı indeks
+    indeks_olustur(baglanti, 'ix_gunluk_ozet_kurye_durum_gun', 'gunluk_ozet', ['kurye_id', 'durum', 'gun'])
+
+
+@migrasyon(7, 'Satır sayaçları')
+def _satir_sayaclari(baglanti):
+    satir_sayaci.tetikleyicileri_kur(baglanti)
+    satir_sayaci.yeniden_say(baglanti)
+
+
+@migrasyon(8, 'Satır sayacı değişim sürümü')
+def _satir_sayaci_degisim(baglanti):
+    if 'degisim' not in tablo_kolonlari(baglanti, 'satir_sayaci'):
+        baglanti.exec_driver_sql('ALTER TABLE satir_sayaci ADD COLUMN degisim INTEGER NOT NULL DEFAULT 0')
+    satir_sayaci.tetikleyicileri_kur(baglanti)
+
+
+@migrasyon(9, 'Veri sürümü tetikleyicileri')
+def _veri_surumu_tetikleyicileri(baglanti):
+    # Masaüstü ve komut satırı yazmaları da web önbelleğini geçersiz kılsın
+    onbellek.tetikleyicileri_kur(baglanti)
+
+
+# Sık çalışan sorgular: (ad, tablo, gereken kolonlar, sql, parametreler)
+SICAK_SORGULAR = [
+    ('kurye_tamamlanan', 'teslimat', {'kurye_id', 'durum'},
+     'SELECT id FROM teslimat WHERE kurye_id = ? AND durum = ?', (1, 'Tamamlandı')),
+    ('durum_listesi', 'teslimat', {'durum'},
+     'SELECT * FROM teslimat WHERE durum = ? AND id < ? ORDER BY id DESC LIMIT 25', ('Devam Ediyor', 1000)),
+    ('musteri_gecmisi_web', 'teslimat', {'musteri_telefon_anahtar'},
+     'SELECT * FROM teslimat WHERE musteri_telefon_anahtar = ? AND id < ? ORDER BY id DESC LIMIT 25',
+     ('5321112233', 1000)),
+    ('musteri_gecmisi_masaustu', 'teslimat', {'telefon'},
+     'SELECT * FROM teslimat WHERE telefon = ?', ('05321112233',)),
+    ('tarih_araligi_web', 'teslimat', {'baslangic_zamani'},
+     'SELECT count(*) FROM teslimat WHERE baslangic_zamani >= ? AND baslangic_zamani < ?',
+     ('2024-01-01 00:00:00', '2024-02-01 00:00:00')),
+    ('tarih_araligi_masaustu', 'teslimat', {'tarih'},
+     'SELECT count(*) FROM teslimat WHERE tarih >= ? AND tarih < ?',
+     ('2024-01-01 00:00:00', '2024-02-01 00:00:00')),
+    ('aktif_kuryeler', 'kurye', {'aktif', 'ad'},
+     'SELECT id, ad FROM kurye WHERE aktif = ? ORDER BY ad', (1,)),
+    ('aktif_musteri_sayisi', 'musteri', {'aktif'},
+     'SELECT count(*) FROM musteri WHERE aktif = ?', (1,)),
+    ('kurye_giderleri', 'kurye_gider', {'kurye_id'},
+     'SELECT * FROM kurye_gider WHERE kurye_id = ?', (1,)),
+]
+
+
+def sorgu_planlarini_denetle(engine, sorgular=None):
+    # Her sorgu için (ad, tablo taraması var mı, plan satırları) döner
+    sonuc = []
+    with engine.connect() as baglanti:
+        for ad, tablo, gereken, sql, parametreler in sorgular or SICAK_SORGULAR:
+            if not gereken <= tablo_kolonlari(baglanti, tablo):
+                continue
+            plan = [satir[3] for satir in baglanti.exec_driver_sql('EXPLAIN QUERY PLAN ' + sql, parametreler)]
+            # İndeks üzerinden yapılan taramalar (kısmi/kapsayan indeks) sorun sayılmaz
+            tarama = any(
+                adim.startswith('SCAN') and 'USING' not in adim and 'CONSTANT ROW' not in adim
+                for adim in plan
+            )
+            sonuc.append((ad, tarama, plan))
+    return sonuc
+
+
+if __name__ == '__main__':
+    # Kullanım: python migrasyon.py [veritabani_dosyasi] [--uygula]
+    argumanlar = [a for a in sys.argv[1:] if not a.startswith('--')]
+    dosya = argumanlar[0] if argumanlar else 'kurye.db'
+    engine = veritabani.motor_olustur(f'sqlite:///{dosya}')
+    if '--uygula' in sys.argv:
+        for surum, aciklama in migrasyonlari_uygula(engine):
+            print(f'Migrasyon uygulandı: {surum} - {aciklama}')
+    with engine.connect() as baglanti:
+        print(f'Şema sürümü: {sema_surumu(baglanti)} / {MIGRASYONLAR[-1][0]}')
+    for ad, tarama, plan in sorgu_planlarini_denetle(engine):
+        print(f'[{"TARAMA" if tarama else "İNDEKS"}] {ad}: {" | ".join(plan)}')
@@ -0,0 +1,199 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from sqlalchemy import Table, Column, String, Integer, DateTime, MetaData, select, func
+
+# Teslimat değişiklik akışı (Server-Sent Events).
+#
+# Yazan rotalar değişikliği teslimat_olay tablosuna kendi işlemleri içinde
+# yazar; böylece olay yalnızca commit başarılı olursa görünür ve tüm işçi
+# süreçleri aynı sırayı görür. Her süreçte tek bir okuyucu iş parçacığı
+# tabloyu kısa aralıklarla yoklar ve son olayları bellekte tutar; bağlı
+# istemciler veritabanına değil bu tampona bakar.
+#
+# Açık akış sayısı süreç başına sınırlıdır: gthread işçilerinde her akış bir
+# iş parçacığı tutar; sınır dolunca yeni bağlantı 503 ile geri çevrilir ve
+# istemci bir süre sonra yeniden dener.
+
+metadata = MetaData()
+
+teslimat_olay = Table(
+    'teslimat_olay', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('tur', String(20), nullable=False),
+    Column('teslimat_id', Integer),
+    Column('zaman', DateTime, nullable=False, default=datetime.utcnow)
+)
+
+OLAY_TURLERI = ('ekle', 'guncelle', 'tamamla', 'sil', 'yenile')
+
+# Tabloda tutulan olay sayısı; daha eskiden bağlanan istemci sayfayı yeniler
+SAKLANAN_OLAY = 5000
+TAMPON_BOYUTU = 1000
+YOKLAMA_ARALIGI = 1.0
+# Tek bağlantının açık kalma süresi; istemci Last-Event-ID ile yeniden bağlanır
+AKIS_SURESI = 300
+NABIZ_ARALIGI = 15
+YENIDEN_BAGLANMA_MS = 3000
+# Sınır dolduğunda istemcinin yeniden denemeden önce beklediği süre
+DOLU_BEKLEME = 30
+
+
+def olay_yaz(baglanti, tur, teslimat_idleri=(None,)):
+    if tur not in OLAY_TURLERI:
+        raise ValueError(f'Bilinmeyen olay türü: {tur}')
+    # Eski olaylar migrasyondaki tetikleyiciyle budanır
+    simdi = datetime.utcnow()
+    baglanti.execute(
+        teslimat_olay.insert(),
+        [{'tur': tur, 'teslimat_id': teslimat_id, 'zaman': simdi} for teslimat_id in teslimat_idleri]
+    )
+
+
+def olaylari_oku(baglanti, sonra, limit=TAMPON_BOYUTU):
+    return [tuple(satir) for satir in baglanti.execute(
+        select(teslimat_olay.c.id, teslimat_olay.c.tur, teslimat_olay.c.teslimat_id)
+        .where(teslimat_olay.c.id > sonra)
+        .order_by(teslimat_olay.c.id)
+        .limit(limit)
+    )]
+
+
+def son_olay_id(baglanti):
+    return baglanti.execute(select(func.max(teslimat_olay.c.id))).scalar() or 0
+
+
+def _engelsiz(fonksiyon, *argumanlar):
+    # gevent işçilerinde sqlite3 çağrıları greenlet değiştirmez; yoklama o
+    # işçideki tüm akışları dondurmasın diye hub'ın iş parçacığı havuzunda
+    # çalıştırılır
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('threading'):
+        import gevent
+        return gevent.get_hub().threadpool.apply(fonksiyon, argumanlar)
+    return fonksiyon(*argumanlar)
+
+
+def dolu_yaniti():
+    # 503 gövdesi; EventSource 200 dışı yanıtta kendiliğinden yeniden bağlanmaz,
+    # pano betiği bu süreyi bekleyip yeniden dener
+    return f'retry: {DOLU_BEKLEME * 1000}\n\n'
+
+
+def sse_mesaji(olay):
+    olay_id, tur, teslimat_id = olay
+    veri = json.dumps({'tur': tur, 'id': teslimat_id})
+    return f'id: {olay_id}\nevent: teslimat\ndata: {veri}\n\n'
+
+
+class OlayYayini:
+    def __init__(self, engine_getir, aralik=YOKLAMA_ARALIGI, tampon_boyutu=TAMPON_BOYUTU):
+        # engine_getir: motor süreç başına tembel kurulduğu için çağrılabilir
+        self._engine_getir = engine_getir
+        self.aralik = aralik
+        self._olaylar = deque(maxlen=tampon_boyutu)
+        self._kosul = threading.Condition()
+        self._son_id = None
+        self._dinleyici = 0
+        self._akis = 0
+        self._is_parcacigi = None
+        self._pid = None
+
+    def yer_al(self, azami):
+        # Yanıt dönmeden çağrılır; yer, yanıt kapanınca yer_birak ile bırakılır
+        with self._kosul:
+            if azami and self._akis >= azami:
+                return False
+            self._akis += 1
+            return True
+
+    def yer_birak(self):
+        with self._kosul:
+            self._akis -= 1
+
+    def _oku(self, fonksiyon, *argumanlar):
+        def calistir():
+            with self._engine_getir().connect() as baglanti:
+                return fonksiyon(baglanti, *argumanlar)
+        return _engelsiz(calistir)
+
+    def _baslat(self):
+        # Kilit altında çağrılır. Fork sonrası ana süreçten kalan durum geçersizdir.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._is_parcacigi = None
+        if self._is_parcacigi is not None and self._is_parcacigi.is_alive():
+            return
+        # Boşta geçen süredeki olaylar tampona alınmaz; geride kalan istemci
+        # veritabanından okur
+        self._son_id = self._oku(son_olay_id)
+        self._olaylar.clear()
+        self._is_parcacigi = threading.Thread(target=self._yokla, name='olay-yoklayici', daemon=True)
+        self._is_parcacigi.start()
+
+    def _yokla(self):
+        while True:
+            with self._kosul:
+                if not self._dinleyici:
+                    # Dinleyen kalmadıysa dur; sıradaki abone yeniden başlatır
+                    self._is_parcacigi = None
+                    return
+                son_id = self._son_id
+            try:
+                yeni = self._oku(olaylari_oku, son_id)
+            except Exception:
+                yeni = []
+            if yeni:
+                with self._kosul:
+                    self._olaylar.extend(yeni)
+                    self._son_id = yeni[-1][0]
+                    self._kosul.notify_all()
+            if len(yeni) < TAMPON_BOYUTU:
+                time.sleep(self.aralik)
+
+    def _tampondan(self, sonra):
+        # Kilit altında çağrılır; tampon yetmiyorsa None döner
+        if sonra < self._son_id and (not self._olaylar or self._olaylar[0][0] > sonra + 1):
+            return None
+        return [olay for olay in self._olaylar if olay[0] > sonra]
+
+    def dinle(self, sonra=None, sure=AKIS_SURESI):
+        # SSE metin parçaları üretir; bağlantı 'sure' saniye sonra kapanır
+        yield f'retry: {YENIDEN_BAGLANMA_MS}\n\n'
+        with self._kosul:
+            self._dinleyici += 1
+            try:
+                self._baslat()
+            except Exception:
+                self._dinleyici -= 1
+                raise
+            if sonra is None or sonra > self._son_id:
+                sonra = self._son_id
+        try:
+            bitis = time.monotonic() + sure
+            while time.monotonic() < bitis:
+                with self._kosul:
+                    olaylar = self._tampondan(sonra)
+                    if olaylar == []:
+                        self._kosul.wait(min(NABIZ_ARALIGI, max(bitis - time.monotonic(), 0)))
+                        olaylar = self._tampondan(sonra)
+                    son_id = self._son_id
+                if olaylar is None:
+                    # İstemci çok geride: kaçırılanlar tampondan taşmış
+                    olaylar = self._oku(olaylari_oku, sonra)
+                    if not olaylar or olaylar[0][0] > sonra + 1:
+                        yield sse_mesaji((son_id, 'yenile', None))
+                        return
+                if olaylar:
+                    sonra = olaylar[-1][0]
+                    yield ''.join(sse_mesaji(olay) for olay in olaylar)
+                else:
+                    # Nabız: kopmuş bağlantılar yazma hatasıyla fark edilir
+                    yield ': nabiz\n\n'
+        finally:
+            with self._kosul:
+                self._dinleyici -= 1
@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import Table, Column, String, Integer, MetaData, select, update
+
+# Rapor sonuç önbelleği ve tablo başına veri sürümü sayaçları.
+#
+# İzlenen tablolardaki her ekleme, güncelleme ve silme, tetikleyicilerle aynı
+# işlem (transaction) içinde o tablonun sayacını bir artırır; böylece web
+# rotaları, masaüstü uygulaması ve komut satırı araçları aynı şekilde
+# önbelleği geçersiz kılar. Önbellek girdisi hesaplandığı andaki sayaçlarla
+# saklanır ve yalnızca sayaçlar hâlâ aynıysa kullanılır. Sayaçlar
+# veritabanında tutulduğu için aynı dosyayı paylaşan tüm süreçler birbirinin
+# yazmalarını görür. Tablo yazmadan türetilen veriyi değiştirenler (ör. özet
+# tablosunu baştan kuranlar) surum_artir() çağırır.
+
+metadata = MetaData()
+
+veri_surumu = Table(
+    'veri_surumu', metadata,
+    Column('tablo', String(50), primary_key=True),
+    Column('surum', Integer, nullable=False, default=0)
+)
+
+IZLENEN_TABLOLAR = ('kurye', 'teslimat', 'musteri', 'kurye_gider')
+
+
+def tetikleyicileri_kur(baglanti):
+    # Veritabanında bulunan izlenen tablolar için; tekrar çalıştırılabilir
+    for tablo in IZLENEN_TABLOLAR:
+        if not baglanti.exec_driver_sql(f'PRAGMA table_info("{tablo}")').first():
+            continue
+        for olay in ('INSERT', 'UPDATE', 'DELETE'):
+            baglanti.exec_driver_sql(
+                f'CREATE TRIGGER IF NOT EXISTS tr_veri_surumu_{tablo}_{olay.lower()} '
+                f'AFTER {olay} ON {tablo} BEGIN '
+                f"UPDATE veri_surumu SET surum = surum + 1 WHERE tablo = '{tablo}'; END"
+            )
+
+
+def surumleri_oku(baglanti, tablolar):
+    satirlar = dict(baglanti.execute(
+        select(veri_surumu.c.tablo, veri_surumu.c.surum)
+        .where(veri_surumu.c.tablo.in_(tablolar))
+    ).all())
+    return tuple(satirlar.get(tablo, 0) for tablo in tablolar)
+
+
+def surum_artir(baglanti, tablolar):
+    baglanti.execute(
+        update(veri_surumu)
+        .where(veri_surumu.c.tablo.in_(tablolar))
+        .values(surum=veri_surumu.c.surum + 1)
+    )
+
+
+class RaporOnbellegi:
+    def __init__(self, azami_boyut=128, sure=300):
+        self.azami_boyut = azami_boyut
+        self.sure = sure
+        self._girdiler = OrderedDict()
+        self._kilit = threading.Lock()
+
+    def getir(self, anahtar, surum):
+        with self._kilit:
+            girdi = self._girdiler.get(anahtar)
+            if girdi is None:
+                return None
+            girdi_surumu, zaman, deger = girdi
+            if girdi_surumu != surum or time.monotonic() - zaman > self.sure:
+                del self._girdiler[anahtar]
+                return None
+            self._girdiler.move_to_end(anahtar)
+            return deger
+
+    def koy(self, anahtar, surum, deger):
+        with self._kilit:
+            self._girdiler[anahtar] = (surum, time.monotonic(), deger)
+            self._girdiler.move_to_end(anahtar)
+            while len(self._girdiler) > self.azami_boyut:
+                self._girdiler.popitem(last=False)
+
+    def temizle(self):
+        with self._kilit:
+            self._girdiler.clear()
+
+    def __len__(self):
+        return len(self._girdiler)
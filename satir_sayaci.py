@@ -0,0 +1,199 @@
+import logging
+import sys
+from sqlalchemy import Table, Column, String, Integer, MetaData
+from sqlalchemy.exc import OperationalError
+
+# Tablo ve filtre başına satır sayaçları.
+#
+# Masaüstü sayfalama her yenilemede COUNT(*) çalıştırmak yerine buradaki
+# sayacı okur. Sayaçlar kaynak tablolardaki tetikleyicilerle aynı işlem
+# içinde güncellenir: ekleme +1, silme -1; filtreli sayaçlarda (ör. aktif
+# kayıtlar) filtre kolonunun güncellenmesi eski ve yeni değerin farkı kadar.
+# Tetikleyiciler dışında bir yoldan (ör. tetikleyiciler kurulmadan önceki
+# bir araçla) yazılırsa sayaç kayabilir; denetle() gerçek sayılarla
+# karşılaştırır ve istenirse düzeltir.
+#
+# degisim, sayacın kapsadığı kayıt kümesi her değiştiğinde artar (ekleme,
+# silme, filtreye girme/çıkma). Kümeye bağlı önbellekler (ör. sayfa sınırı
+# dizini) bunu sürüm olarak kullanır.
+
+metadata = MetaData()
+
+satir_sayaci = Table(
+    'satir_sayaci', metadata,
+    Column('ad', String(50), primary_key=True),
+    Column('adet', Integer, nullable=False, default=0),
+    Column('degisim', Integer, nullable=False, server_default='0')
+)
+
+# sayaç adı: (tablo, filtre kolonu, filtre koşulu). Koşuldaki {} satır
+# önekiyle (NEW. / OLD. / boş) doldurulur.
+SAYACLAR = {
+    'kurye': ('kurye', None, None),
+    'kurye:aktif': ('kurye', 'aktif', '{}aktif = 1'),
+    'teslimat': ('teslimat', None, None),
+    'musteri': ('musteri', None, None),
+    'musteri:aktif': ('musteri', 'aktif', '{}aktif = 1'),
+    'kurye_gider': ('kurye_gider', None, None),
+}
+
+gunluk = logging.getLogger('kurye.satir_sayaci')
+
+
+def _kolonlar(baglanti, tablo):
+    return {satir[1] for satir in baglanti.exec_driver_sql(f'PRAGMA table_info("{tablo}")')}
+
+
+def _gecerli_sayaclar(baglanti):
+    # Veritabanında tablosu ve filtre kolonu bulunan sayaçlar
+    kolonlar = {}
+    sayaclar = {}
+    for ad, (tablo, kolon, kosul) in SAYACLAR.items():
+        if tablo not in kolonlar:
+            kolonlar[tablo] = _kolonlar(baglanti, tablo)
+        if kolonlar[tablo] and (kolon is None or kolon in kolonlar[tablo]):
+            sayaclar[ad] = (tablo, kolon, kosul)
+    return sayaclar
+
+
+def _katki(kosul, onek):
+    # Satırın sayaca katkısı: filtresiz sayaçta 1, filtrelide 0/1
+    if kosul is None:
+        return '1'
+    return f'coalesce({kosul.format(onek)}, 0)'
+
+
+def _sayim(tablo, kosul, secim='count(*)'):
+    return f'SELECT {secim} FROM {tablo} WHERE {kosul.format("") if kosul else 1}'
+
+
+def _sayac_ve_gercek(baglanti, ad, tablo, kosul):
+    # Sayaç ve gerçek sayı tek ifadede, aynı anlık görüntüden okunur
+    return tuple(baglanti.exec_driver_sql(
+        f'SELECT (SELECT adet FROM satir_sayaci WHERE ad = ?), ({_sayim(tablo, kosul)})', (ad,)
+    ).first())
+
+
+def _gercegi_yaz(baglanti, ad, tablo, kosul):
+    # Sayım ve yazma tek ifadededir: SQLite yazma kilidini ifade başında
+    # aldığından arada başka bir ekleme/silme araya giremez; sayaç gerçek
+    # sayıdan ayrı bir okumaya göre ezilmez
+    baglanti.exec_driver_sql(
+        f'INSERT INTO satir_sayaci (ad, adet) {_sayim(tablo, kosul, "?, count(*)")} '
+        'ON CONFLICT (ad) DO UPDATE SET adet = excluded.adet, degisim = degisim + 1 '
+        'WHERE adet != excluded.adet',
+        (ad,)
+    )
+
+
+def tetikleyicileri_kur(baglanti):
+    # Var olan tetikleyiciler silinip güncel tanımla yeniden kurulur
+    satir_sayaci.create(baglanti, checkfirst=True)
+    eskiler = baglanti.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'tr_satir_sayaci_%'"
+    ).scalars().all()
+    for ad in eskiler:
+        baglanti.exec_driver_sql(f'DROP TRIGGER IF EXISTS {ad}')
+    tablolar = {}
+    for ad, (tablo, kolon, kosul) in _gecerli_sayaclar(baglanti).items():
+        tablolar.setdefault(tablo, []).append((ad, kolon, kosul))
+    for tablo, sayaclar in tablolar.items():
+        ekle = ''.join(
+            f"UPDATE satir_sayaci SET adet = adet + {_katki(kosul, 'NEW.')}, "
+            f"degisim = degisim + {_katki(kosul, 'NEW.')} WHERE ad = '{ad}'; "
+            for ad, _, kosul in sayaclar
+        )
+        sil = ''.join(
+            f"UPDATE satir_sayaci SET adet = adet - {_katki(kosul, 'OLD.')}, "
+            f"degisim = degisim + {_katki(kosul, 'OLD.')} WHERE ad = '{ad}'; "
+            for ad, _, kosul in sayaclar
+        )
+        baglanti.exec_driver_sql(
+            f'CREATE TRIGGER tr_satir_sayaci_{tablo}_ekle AFTER INSERT ON {tablo} BEGIN '
+            + ekle + 'END'
+        )
+        baglanti.exec_driver_sql(
+            f'CREATE TRIGGER tr_satir_sayaci_{tablo}_sil AFTER DELETE ON {tablo} BEGIN '
+            + sil + 'END'
+        )
+        # Yumuşak silme: yalnızca filtre kolonu değişince
+        for ad, kolon, kosul in sayaclar:
+            if kolon is None:
+                continue
+            yeni, eski = _katki(kosul, 'NEW.'), _katki(kosul, 'OLD.')
+            baglanti.exec_driver_sql(
+                f"CREATE TRIGGER tr_satir_sayaci_{ad.replace(':', '_')}_guncelle "
+                f'AFTER UPDATE OF {kolon} ON {tablo} BEGIN '
+                f'UPDATE satir_sayaci SET adet = adet + {yeni} - {eski}, '
+                f"degisim = degisim + ({yeni} != {eski}) WHERE ad = '{ad}'; END"
+            )
+
+
+def yeniden_say(baglanti):
+    # Sayaçları gerçek sayılarla baştan yazar
+    satir_sayaci.create(baglanti, checkfirst=True)
+    sayaclar = _gecerli_sayaclar(baglanti)
+    for ad, (tablo, _, kosul) in sayaclar.items():
+        _gercegi_yaz(baglanti, ad, tablo, kosul)
+    return len(sayaclar)
+
+
+def oku(baglanti, ad):
+    # Sayaç yoksa (migrasyon uygulanmamış) None
+    try:
+        return baglanti.exec_driver_sql('SELECT adet FROM satir_sayaci WHERE ad = ?', (ad,)).scalar()
+    except OperationalError:
+        return None
+
+
+def durum(baglanti, ad):
+    # (adet, degisim); sayaç yoksa None
+    try:
+        return baglanti.exec_driver_sql(
+            'SELECT adet, degisim FROM satir_sayaci WHERE ad = ?', (ad,)
+        ).first()
+    except OperationalError:
+        return None
+
+
+def sayi(baglanti, ad, yedek):
+    # Sayaç okunamazsa yedek() ile (COUNT(*)) sayılır
+    adet = oku(baglanti, ad)
+    return yedek() if adet is None else adet
+
+
+def sayi_ve_degisim(baglanti, ad, yedek):
+    # (adet, degisim); sayaç okunamazsa (yedek(), None)
+    satir = durum(baglanti, ad)
+    return (yedek(), None) if satir is None else tuple(satir)
+
+
+def denetle(baglanti, duzelt=False):
+    # Kayan sayaçları [(ad, sayaç, gerçek)] olarak döner; duzelt ile gerçek
+    # sayı yazılır. COUNT(*) tam tablo taraması yaptığından arka planda çalışır.
+    # Karşılaştırma ve düzeltme ayrı ayrı tek ifadedir; eşzamanlı yazmalarla
+    # yarışıp doğru sayacı eski bir sayımla ezmez.
+    kayanlar = []
+    for ad, (tablo, _, kosul) in _gecerli_sayaclar(baglanti).items():
+        sayac, gercek = _sayac_ve_gercek(baglanti, ad, tablo, kosul)
+        if sayac == gercek:
+            continue
+        kayanlar.append((ad, sayac, gercek))
+        gunluk.warning('Satır sayacı kaymış: %s sayaç=%s gerçek=%s', ad, sayac, gercek)
+        if duzelt:
+            _gercegi_yaz(baglanti, ad, tablo, kosul)
+    return kayanlar
+
+
+if __name__ == '__main__':
+    # Kullanım: python satir_sayaci.py [veritabani_dosyasi] [--duzelt]
+    import veritabani
+    argumanlar = [a for a in sys.argv[1:] if not a.startswith('--')]
+    dosya = argumanlar[0] if argumanlar else 'kurye.db'
+    engine = veritabani.motor_olustur(f'sqlite:///{dosya}')
+    with engine.begin() as baglanti:
+        kayanlar = denetle(baglanti, duzelt='--duzelt' in sys.argv)
+    for ad, sayac, gercek in kayanlar:
+        print(f'[KAYMA] {ad}: sayaç {sayac}, gerçek {gercek}')
+    print(f'{len(kayanlar)} sayaç kaymış' if kayanlar else 'Tüm sayaçlar doğru')
+    sys.exit(1 if kayanlar and '--duzelt' not in sys.argv else 0)
@@ -0,0 +1,190 @@
+import threading
+from collections import namedtuple
+from sqlalchemy import func
+
+# Keyset (imleç) sayfalama: OFFSET yerine son görülen anahtardan devam eder,
+# böylece her sayfanın maliyeti tablo büyüklüğünden bağımsız kalır.
+Sayfa = namedtuple('Sayfa', ['ogeler', 'sonraki', 'onceki'])
+
+VARSAYILAN_LIMIT = 25
+AZAMI_LIMIT = 200
+
+
+def limit_oku(deger, varsayilan=VARSAYILAN_LIMIT):
+    try:
+        limit = int(deger)
+    except (TypeError, ValueError):
+        return varsayilan
+    return max(1, min(limit, AZAMI_LIMIT))
+
+
+def imlec_oku(deger):
+    try:
+        imlec = int(deger)
+    except (TypeError, ValueError):
+        return None
+    return imlec if imlec > 0 else None
+
+
+def keyset_sayfa(sorgu, anahtar, sonra=None, once=None, limit=VARSAYILAN_LIMIT):
+    # Liste anahtara göre azalan sırada gösterilir (en yeni kayıt üstte).
+    # sonra: bu anahtardan küçük kayıtlar (sonraki sayfa)
+    # once: bu anahtardan büyük kayıtlar (önceki sayfa)
+    if once is not None:
+        satirlar = sorgu.filter(anahtar > once)\
+            .order_by(anahtar.asc())\
+            .limit(limit + 1)\
+            .all()
+        daha_var = len(satirlar) > limit
+        satirlar = list(reversed(satirlar[:limit]))
+        if not satirlar:
+            return Sayfa([], None, None)
+        return Sayfa(
+            satirlar,
+            _anahtar_degeri(satirlar[-1], anahtar),
+            _anahtar_degeri(satirlar[0], anahtar) if daha_var else None
+        )
+
+    if sonra is not None:
+        sorgu = sorgu.filter(anahtar < sonra)
+    satirlar = sorgu.order_by(anahtar.desc()).limit(limit + 1).all()
+    daha_var = len(satirlar) > limit
+    satirlar = satirlar[:limit]
+    if not satirlar:
+        return Sayfa([], None, None)
+    return Sayfa(
+        satirlar,
+        _anahtar_degeri(satirlar[-1], anahtar) if daha_var else None,
+        _anahtar_degeri(satirlar[0], anahtar) if sonra is not None else None
+    )
+
+
+def _anahtar_degeri(satir, anahtar):
+    return getattr(satir, anahtar.key)
+
+
+# Masaüstü tabloları sayfa numarasıyla gezilir; N. sayfaya atlamak için
+# OFFSET yerine sınır dizini kullanılır. Dizin konumları en eski kayıttan
+# sayılan sıra (artan anahtar) üzerinden tutar: yeni kayıtlar en büyük
+# anahtarı aldığından ekleme eski kayıtların sırasını değiştirmez.
+#
+# - Seyrek dizin: her SINIR_ADIMI'ncı sıradaki anahtar. İlk derin atlamada
+#   tek bir pencere fonksiyonu taramasıyla kurulur; bir konuma en yakın
+#   sınırdan en fazla SINIR_ADIMI - 1 satır atlanarak ulaşılır.
+# - Bilinen sınırlar: okunan sayfaların baş ve son anahtarları; önceki /
+#   sonraki sayfa ve aynı sayfaya dönüş doğrudan anahtardan aranır.
+#
+# Kayıt kümesinin sürümü (satir_sayaci degisim) değiştiğinde, değişiklik
+# yalnızca eklemeyse (degisim ve adet farkı, en büyük anahtardan sonraki
+# kayıt sayısına eşit) dizin yalnızca yeni kayıtlar taranarak genişletilir.
+# Silme veya filtre değişikliğinden sonra dizin atılır ve gerekince yeniden
+# kurulur.
+SINIR_ADIMI = 100
+# Tablo başına hatırlanan en fazla sayfa sınırı
+AZAMI_BILINEN_SINIR = 10000
+
+
+class _Dizin:
+    def __init__(self, surum, adet, en_buyuk, sinirlar=None, bilinen=None):
+        self.surum = surum
+        self.adet = adet
+        self.en_buyuk = en_buyuk
+        # sıra // adım -> anahtar; kurulmadıysa None
+        self.sinirlar = sinirlar
+        # sıra -> (anahtar, dahil)
+        self.bilinen = {} if bilinen is None else bilinen
+
+
+class SinirDizini:
+    def __init__(self, adim=SINIR_ADIMI):
+        self.adim = adim
+        self._kilit = threading.Lock()
+        self._dizinler = {}
+
+    def _en_buyuk(self, sorgu, anahtar):
+        # max() birleştirmeli sorguda tablo taraması yapar; PK üzerinden ilk satır okunur
+        satir = sorgu.with_entities(anahtar).order_by(anahtar.desc()).limit(1).first()
+        return satir[0] if satir else None
+
+    def _sira_sinirlari(self, oturum, sorgu, anahtar, ilk_sira):
+        # sorgu'daki kayıtların (artan anahtar) ilk_sira'dan başlayarak sıraları
+        # içinden adımın katı olanların anahtarları
+        sira = func.row_number().over(order_by=anahtar.asc()).label('sira')
+        alt = sorgu.with_entities(anahtar.label('anahtar'), sira).subquery()
+        return [
+            satir[0] for satir in oturum.query(alt.c.anahtar)
+            .filter((alt.c.sira - 1 + ilk_sira) % self.adim == 0)
+            .order_by(alt.c.sira)
+        ]
+
+    def _dizin(self, oturum, ad, adet, surum, sorgu, anahtar):
+        with self._kilit:
+            eski = self._dizinler.get(ad)
+        if eski is not None and eski.surum == surum:
+            return eski
+        if eski is not None and surum < eski.surum:
+            # Daha eski bir anlık görüntüden okuyan iş; önbelleğe dokunmaz
+            return None
+        dizin = None
+        eklenen = surum - eski.surum if eski is not None else None
+        if eski is not None and eski.en_buyuk is not None and adet - eski.adet == eklenen:
+            yeniler = sorgu.filter(anahtar > eski.en_buyuk)
+            if yeniler.count() == eklenen:
+                # Yalnızca ekleme: eski sıralar geçerli, yeni kayıtlar sona eklenir
+                sinirlar = eski.sinirlar
+                if sinirlar is not None and eklenen:
+                    sinirlar = sinirlar + self._sira_sinirlari(oturum, yeniler, anahtar, eski.adet)
+                dizin = _Dizin(
+                    surum, adet, self._en_buyuk(yeniler, anahtar) or eski.en_buyuk,
+                    sinirlar, eski.bilinen
+                )
+        if dizin is None:
+            dizin = _Dizin(surum, adet, self._en_buyuk(sorgu, anahtar))
+        with self._kilit:
+            guncel = self._dizinler.get(ad)
+            if guncel is None or guncel.surum <= surum:
+                self._dizinler[ad] = dizin
+        return dizin
+
+    def oku(self, oturum, ad, adet, surum, sorgu, anahtar, konum, limit):
+        # Azalan anahtar sırasında 0 tabanlı konumdan başlayan limit satır
+        if konum >= adet:
+            return []
+        if konum < self.adim:
+            return sorgu.order_by(anahtar.desc()).offset(konum).limit(limit).all()
+        dizin = self._dizin(oturum, ad, adet, surum, sorgu, anahtar)
+        if dizin is None:
+            return sorgu.order_by(anahtar.desc()).offset(konum).limit(limit).all()
+        sira = adet - 1 - konum
+        bilinen = dizin.bilinen.get(sira)
+        if bilinen is not None:
+            deger, dahil = bilinen
+            parca = sorgu.filter(anahtar <= deger if dahil else anahtar < deger)
+            atla = 0
+        else:
+            if dizin.sinirlar is None:
+                dizin.sinirlar = self._sira_sinirlari(oturum, sorgu, anahtar, 0)
+            # sira'dan büyük veya eşit en yakın sınır
+            blok = -(-sira // self.adim)
+            if blok < len(dizin.sinirlar):
+                parca = sorgu.filter(anahtar <= dizin.sinirlar[blok])
+                atla = blok * self.adim - sira
+            else:
+                # Son sınırın üstü: en yeni kayıtlar, baştan en fazla adım kadar
+                parca, atla = sorgu, konum
+        satirlar = parca.order_by(anahtar.desc()).offset(atla).limit(limit).all()
+        if satirlar:
+            with self._kilit:
+                if len(dizin.bilinen) >= AZAMI_BILINEN_SINIR:
+                    dizin.bilinen.clear()
+                dizin.bilinen[sira] = (satirlar[0][0], True)
+                dizin.bilinen[sira - len(satirlar)] = (satirlar[-1][0], False)
+        return satirlar
+
+    def okuyucu(self, ad, adet, surum):
+        # tablo_modeli.sorgu_getirici için; sürüm bilinmiyorsa None (OFFSET)
+        if surum is None:
+            return None
+        return lambda oturum, sorgu, anahtar, konum, limit: self.oku(
+            oturum, ad, adet, surum, sorgu, anahtar, konum, limit
+        )
@@ -0,0 +1,292 @@
+import logging
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, QSize, QTimer
+from PyQt5.QtWidgets import (QApplication, QTableView, QHeaderView, QStyle,
+                             QStyledItemDelegate, QStyleOptionButton)
+
+# Masaüstü listeleri için sanal tablo: satırlar düz demet olarak modelde
+# tutulur, görünüm yalnızca ekrandaki hücreleri çizer. Eylem butonları
+# satır başına widget yerine temsilci (delegate) tarafından boyanır.
+#
+# Bir sayfanın satırları parça parça yüklenir; kaydırma sona yaklaştıkça
+# görünüm fetchMore ile sonraki parçayı ister. Tüm okumalar veritabanı
+# işçisinde (arka_plan) yapılır. getir(oturum, konum, limit, son) çağrısı
+# sonuç kümesindeki konumu ve son yüklenen satırı alır, böylece sonraki parça
+# OFFSET yerine son id'den devam edebilir; sayfa başına atlama sayfalama
+# modülündeki sınır dizinini kullanır.
+
+# Bir fetchMore çağrısında yüklenen satır sayısı
+PARCA_BOYUTU = 200
+SAYFA_BOYUTLARI = ['10', '25', '50', '100', '500', '1000', 'Tümü']
+SATIR_YUKSEKLIGI = 34
+BUTON_GENISLIGI = 100
+BUTON_ARALIGI = 4
+KENAR_BOSLUGU = 5
+
+gunluk = logging.getLogger('kurye.tablo_modeli')
+
+
+def sayfa_boyutu_oku(metin, toplam):
+    # 'Tümü' tüm kayıtları tek sayfada, parça parça yükler
+    if metin == 'Tümü':
+        return max(1, toplam)
+    return int(metin)
+
+
+def tarih_metni(deger):
+    return deger.strftime('%d.%m.%Y %H:%M') if deger else ''
+
+
+def para_metni(deger):
+    return f'₺{deger or 0:.2f}'
+
+
+class SatirModeli(QAbstractTableModel):
+    # kolonlar: [(başlık, biçimleyici)]; biçimleyici None ise str kullanılır.
+    # Satırın ilk değeri kaydın id'sidir. Son kolon eylem kolonu olabilir;
+    # onun hücresi boş kalır, butonları temsilci çizer.
+    def __init__(self, kolonlar, isci, kanal, parca_boyutu=PARCA_BOYUTU, parent=None):
+        super().__init__(parent)
+        self.kolonlar = list(kolonlar)
+        self.isci = isci
+        self.kanal = kanal
+        self.parca_boyutu = parca_boyutu
+        self._satirlar = []
+        self._getir = None
+        self._baslangic = 0
+        self._adet = 0
+        self._parca_bekleniyor = False
+
+    def sayfa_yukle(self, kaynak, sayfa, boyut_metni, tamam=None, hata=None):
+        # kaynak(oturum) -> (toplam_kayit, getir). İşçide kayıtlar sayılır ve
+        # sayfanın ilk parçası okunur; sonuç gelince model sıfırlanır ve
+        # tamam(toplam_kayit, sayfa_sayisi) çağrılır. Aynı modele yeni istek
+        # gelirse eskisinin sonucu atılır.
+        parca_boyutu = self.parca_boyutu
+
+        def oku(oturum):
+            toplam_kayit, getir = kaynak(oturum)
+            sayfa_boyutu = sayfa_boyutu_oku(boyut_metni, toplam_kayit)
+            sayfa_sayisi = max(1, (toplam_kayit + sayfa_boyutu - 1) // sayfa_boyutu)
+            baslangic = (min(sayfa, sayfa_sayisi) - 1) * sayfa_boyutu
+            adet = max(0, min(sayfa_boyutu, toplam_kayit - baslangic))
+            ilk = list(getir(oturum, baslangic, min(parca_boyutu, adet), None)) if adet else []
+            return toplam_kayit, sayfa_sayisi, getir, baslangic, adet, ilk
+
+        def geldi(sonuc):
+            toplam_kayit, sayfa_sayisi, getir, baslangic, adet, ilk = sonuc
+            self._sifirla(getir, baslangic, adet, ilk)
+            if tamam is not None:
+                tamam(toplam_kayit, sayfa_sayisi)
+
+        self.isci.calistir(self.kanal, oku, geldi, hata)
+
+    def _sifirla(self, getir, baslangic, adet, ilk):
+        # Önceki sayfanın yolda olan parçası artık geçersiz
+        self.isci.iptal(self.kanal + ':parca')
+        self.beginResetModel()
+        self._getir = getir
+        self._baslangic = baslangic
+        # Sayım ile okuma arasında silinen kayıtlar olabilir
+        self._adet = adet if len(ilk) == min(self.parca_boyutu, adet) else len(ilk)
+        self._satirlar = ilk
+        self._parca_bekleniyor = False
+        self.endResetModel()
+
+    def temizle(self):
+        self.isci.iptal(self.kanal)
+        self._sifirla(None, 0, 0, [])
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._parca_bekleniyor and len(self._satirlar) < self._adet
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._parca_bekleniyor:
+            return
+        ilk = len(self._satirlar)
+        adet = min(self.parca_boyutu, self._adet - ilk)
+        if adet <= 0:
+            return
+        getir, konum, son = self._getir, self._baslangic + ilk, self._satirlar[-1]
+        self._parca_bekleniyor = True
+        self.isci.calistir(
+            self.kanal + ':parca',
+            lambda oturum: list(getir(oturum, konum, adet, son)),
+            lambda yeni: self._parca_geldi(ilk, adet, yeni),
+            self._parca_hatasi
+        )
+
+    def _parca_geldi(self, ilk, adet, yeni):
+        self._parca_bekleniyor = False
+        if ilk != len(self._satirlar):
+            return
+        if len(yeni) < adet:
+            self._adet = ilk + len(yeni)
+        if not yeni:
+            return
+        self.beginInsertRows(QModelIndex(), ilk, ilk + len(yeni) - 1)
+        self._satirlar.extend(yeni)
+        self.endInsertRows()
+
+    def _parca_hatasi(self, hata):
+        gunluk.error('%s parçası yüklenemedi: %s', self.kanal, hata)
+        self._parca_bekleniyor = False
+        self._adet = len(self._satirlar)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._satirlar)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.kolonlar)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        satir = self._satirlar[index.row()]
+        if role == Qt.DisplayRole:
+            if index.column() >= len(satir):
+                return None
+            bicim = self.kolonlar[index.column()][1]
+            deger = satir[index.column()]
+            if bicim is not None:
+                return bicim(deger)
+            return '' if deger is None else str(deger)
+        if role == Qt.UserRole:
+            return satir[0]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.kolonlar[section][0]
+        return super().headerData(section, orientation, role)
+
+    def satir_id(self, satir):
+        if 0 <= satir < len(self._satirlar):
+            return self._satirlar[satir][0]
+        return None
+
+
+class ButonDelegesi(QStyledItemDelegate):
+    # eylemler: [(etiket, fonksiyon(kayit_id))]
+    def __init__(self, eylemler, parent=None):
+        super().__init__(parent)
+        self.eylemler = list(eylemler)
+        self._basili = None
+
+    def genislik(self):
+        return 2 * KENAR_BOSLUGU + len(self.eylemler) * (BUTON_GENISLIGI + BUTON_ARALIGI)
+
+    def _dikdortgenler(self, alan):
+        x = alan.x() + KENAR_BOSLUGU
+        yukseklik = alan.height() - 4
+        dikdortgenler = []
+        for _ in self.eylemler:
+            dikdortgenler.append(QRect(x, alan.y() + 2, BUTON_GENISLIGI, yukseklik))
+            x += BUTON_GENISLIGI + BUTON_ARALIGI
+        return dikdortgenler
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        stil = option.widget.style() if option.widget else QApplication.style()
+        for sira, ((etiket, _), dikdortgen) in enumerate(zip(self.eylemler, self._dikdortgenler(option.rect))):
+            buton = QStyleOptionButton()
+            buton.rect = dikdortgen
+            buton.text = etiket
+            buton.state = QStyle.State_Enabled
+            if self._basili == (index.row(), sira):
+                buton.state |= QStyle.State_Sunken
+            else:
+                buton.state |= QStyle.State_Raised
+            stil.drawControl(QStyle.CE_PushButton, buton, painter, option.widget)
+
+    def sizeHint(self, option, index):
+        return QSize(self.genislik(), SATIR_YUKSEKLIGI)
+
+    def _buton_bul(self, option, konum):
+        for sira, dikdortgen in enumerate(self._dikdortgenler(option.rect)):
+            if dikdortgen.contains(konum):
+                return sira
+        return None
+
+    def _yeniden_ciz(self, option):
+        if option.widget is not None:
+            option.widget.viewport().update(option.rect)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            sira = self._buton_bul(option, event.pos())
+            if sira is None:
+                return False
+            self._basili = (index.row(), sira)
+            self._yeniden_ciz(option)
+            return True
+        if event.type() == QEvent.MouseButtonRelease and self._basili is not None:
+            basili, self._basili = self._basili, None
+            sira = self._buton_bul(option, event.pos())
+            if basili == (index.row(), sira):
+                fonksiyon = self.eylemler[sira][1]
+                kayit_id = model.data(index, Qt.UserRole)
+                # Eylem modeli yenileyebilir; olay işlenirken sıfırlanmasın
+                QTimer.singleShot(0, lambda: fonksiyon(kayit_id))
+            self._yeniden_ciz(option)
+            return True
+        if event.type() == QEvent.MouseButtonDblClick:
+            return self._buton_bul(option, event.pos()) is not None
+        return False
+
+
+def sorgu_getirici(sorgu, anahtar, okuyucu=None):
+    # sorgu(oturum) anahtara göre azalan sırada listelenir. Sonraki parçalar
+    # son görülen id'den (keyset) okunur; derin kaydırmada atlanan satırlar
+    # yeniden taranmaz. Sayfanın ilk parçası okuyucu (sayfalama.SinirDizini)
+    # verilmişse sayfa sınırı anahtarından, verilmemişse OFFSET ile okunur.
+    def getir(oturum, konum, limit, son):
+        if son is not None:
+            parca = sorgu(oturum).filter(anahtar < son[0]).order_by(anahtar.desc())
+        elif okuyucu is not None:
+            return okuyucu(oturum, sorgu(oturum), anahtar, konum, limit)
+        else:
+            parca = sorgu(oturum).order_by(anahtar.desc()).offset(konum)
+        return parca.limit(limit).all()
+    return getir
+
+
+def id_getirici(sorgu, anahtar, idler):
+    # Arama sonuçları: satırlar verilen id listesinin sırasıyla okunur
+    def getir(oturum, konum, limit, son):
+        parca = idler[konum:konum + limit]
+        satirlar = {satir[0]: satir for satir in sorgu(oturum).filter(anahtar.in_(parca))}
+        return [satirlar[kayit_id] for kayit_id in parca if kayit_id in satirlar]
+    return getir
+
+
+def sayfa_siniri(spin, sayfa_sayisi):
+    # Sayfa kutusunun üst sınırı; değer kırpılırsa tablo yeniden istenmez
+    spin.blockSignals(True)
+    spin.setMaximum(sayfa_sayisi)
+    spin.blockSignals(False)
+
+
+def tablo_gorunumu(model, eylemler=(), parent=None):
+    gorunum = QTableView(parent)
+    gorunum.setModel(model)
+    gorunum.setSelectionBehavior(QTableView.SelectRows)
+    gorunum.setSelectionMode(QTableView.SingleSelection)
+    gorunum.setWordWrap(False)
+    # Sabit satır yüksekliği; görünüm satırları tek tek ölçmez
+    dikey = gorunum.verticalHeader()
+    dikey.setSectionResizeMode(QHeaderView.Fixed)
+    dikey.setDefaultSectionSize(SATIR_YUKSEKLIGI)
+    if eylemler:
+        kolon = model.columnCount() - 1
+        delege = ButonDelegesi(eylemler, gorunum)
+        gorunum.setItemDelegateForColumn(kolon, delege)
+        gorunum.horizontalHeader().setSectionResizeMode(kolon, QHeaderView.Fixed)
+        gorunum.setColumnWidth(kolon, delege.genislik())
+    return gorunum
+
+
+def secili_id(gorunum):
+    index = gorunum.currentIndex()
+    if not index.isValid():
+        return None
+    return gorunum.model().satir_id(index.row())
@@ -0,0 +1,19 @@
+import re
+
+# Telefon numaralarını karşılaştırılabilir tek bir anahtara indirger:
+# "0532 111 22 33", "+90 532 111 2233" ve "5321112233" aynı anahtarı verir.
+
+_RAKAM_DISI = re.compile(r'\D')
+
+
+def telefon_anahtari(telefon):
+    if not telefon:
+        return ''
+    rakamlar = _RAKAM_DISI.sub('', telefon)
+    if rakamlar.startswith('00'):
+        rakamlar = rakamlar[2:]
+    if len(rakamlar) == 12 and rakamlar.startswith('90'):
+        rakamlar = rakamlar[2:]
+    if len(rakamlar) == 11 and rakamlar.startswith('0'):
+        rakamlar = rakamlar[1:]
+    return rakamlar
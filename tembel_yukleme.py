@@ -0,0 +1,103 @@
+import logging
+import os
+import threading
+from collections import Counter
+from sqlalchemy import event
+
+# N+1 denetimi: bir istek (web) veya arka plan işi (masaüstü) boyunca hangi
+# ilişkinin kaç kez tembel (lazy) yüklendiğini sayar. Aynı ilişki eşikten
+# fazla yüklenirse liste satır satır sorgu atıyor demektir; uyarı kipinde
+# günlüğe yazılır, katı kipte o yüklemenin yapıldığı satırda hata fırlatılır.
+#
+# Kip KURYE_N1_DENETIMI ortam değişkeninden okunur: boş (kapalı), 'uyar'
+# veya 'kati'. Web tarafında TEMBEL_YUKLEME_DENETIMI ayarı önceliklidir.
+
+KIPLER = ('', 'uyar', 'kati')
+# Tek birimde aynı ilişki bundan fazla tembel yüklenirse N+1 sayılır
+ESIK = 2
+
+gunluk = logging.getLogger('kurye.tembel_yukleme')
+
+
+class TembelYuklemeHatasi(Exception):
+    pass
+
+
+def kip_oku(deger):
+    deger = (deger or '').strip().lower()
+    if deger in ('1', 'evet', 'acik'):
+        return 'uyar'
+    if deger not in KIPLER:
+        raise ValueError(f'Bilinmeyen N+1 denetim kipi: {deger}')
+    return deger
+
+
+class Denetci:
+    def __init__(self, kip='', esik=ESIK):
+        self.kip = kip_oku(kip)
+        self.esik = esik
+        self._yerel = threading.local()
+
+    def izle(self, hedef):
+        # hedef: Session sınıfı, sessionmaker veya scoped_session
+        event.listen(hedef, 'do_orm_execute', self._yukleme)
+        return self
+
+    def _yukleme(self, durum):
+        birim = getattr(self._yerel, 'birim', None)
+        # selectinload gibi toplu yüklemeler lazy_loaded_from taşımaz
+        if birim is None or durum.lazy_loaded_from is None:
+            return
+        ozellik = str(durum.loader_strategy_path.path[-1])
+        sayac = birim['yuklemeler']
+        sayac[ozellik] += 1
+        if birim['kip'] == 'kati' and sayac[ozellik] > self.esik:
+            raise TembelYuklemeHatasi(
+                f"{birim['ad']}: {ozellik} {sayac[ozellik]}. kez tembel yüklendi; "
+                f"sorguya joinedload/selectinload ekleyin"
+            )
+
+    def basla(self, ad, kip=None):
+        kip = self.kip if kip is None else kip_oku(kip)
+        if not kip:
+            self._yerel.birim = None
+            return None
+        self._yerel.birim = {'ad': ad, 'kip': kip, 'yuklemeler': Counter()}
+        return self._yerel.birim['yuklemeler']
+
+    def bitir(self):
+        birim = getattr(self._yerel, 'birim', None)
+        self._yerel.birim = None
+        if birim is None:
+            return {}
+        sorunlu = {ozellik: adet for ozellik, adet in birim['yuklemeler'].items() if adet > self.esik}
+        for ozellik, adet in sorted(sorunlu.items()):
+            gunluk.warning('N+1: %s içinde %s %d kez tembel yüklendi', birim['ad'], ozellik, adet)
+        return sorunlu
+
+
+def uygulamaya_bagla(app, oturum, denetci=None):
+    from flask import request
+
+    denetci = (denetci or Denetci()).izle(oturum)
+    app.config.setdefault('TEMBEL_YUKLEME_DENETIMI', os.environ.get('KURYE_N1_DENETIMI', ''))
+    app.config.setdefault('TEMBEL_YUKLEME_ESIGI', ESIK)
+
+    @app.before_request
+    def _denetim_basla():
+        kip = app.config['TEMBEL_YUKLEME_DENETIMI']
+        # Hata ayıklama kipinde ayrıca açmaya gerek kalmasın
+        if not kip and app.debug:
+            kip = 'uyar'
+        denetci.esik = app.config['TEMBEL_YUKLEME_ESIGI']
+        denetci.basla(request.endpoint or request.path, kip)
+
+    @app.teardown_request
+    def _denetim_bitir(hata=None):
+        denetci.bitir()
+
+    return denetci
+
+
+# Masaüstü için süreç geneli denetçi
+varsayilan = Denetci(os.environ.get('KURYE_N1_DENETIMI', ''))
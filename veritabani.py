@@ -0,0 +1,79 @@
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+
+# Web ve masaüstü uygulamasının ortak SQLite bağlantı profili. Pragmalar her
+# yeni bağlantıda (connect olayı) bir kez çalışır; havuz bağlantıları yeniden
+# kullandığı için istek başına ek maliyet yoktur.
+
+VARSAYILAN_URL = 'sqlite:///kurye.db'
+VARSAYILAN_PROFIL = os.environ.get('KURYE_DB_PROFIL', 'hizli')
+
+PROFILLER = {
+    # Her commit diske senkronlanır; elektrik kesintisinde bile veri kaybı olmaz
+    'guvenli': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'busy_timeout': 10000,
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    # WAL + NORMAL: uygulama çökmesine karşı güvenli, commit başına fsync yok
+    'hizli': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -32000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    # Salt okunur rapor bağlantısı: yazma denemeleri hata verir
+    'rapor': {
+        'query_only': 'ON',
+        'busy_timeout': 5000,
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+
+def profil_pragmalari(profil=None):
+    profil = profil or VARSAYILAN_PROFIL
+    if profil not in PROFILLER:
+        raise ValueError(f'Bilinmeyen veritabanı profili: {profil}')
+    return PROFILLER[profil]
+
+
+def motor_secenekleri(profil=None, havuz_boyutu=5):
+    # create_engine / SQLALCHEMY_ENGINE_OPTIONS için ortak seçenekler
+    pragmalar = profil_pragmalari(profil)
+    return {
+        'poolclass': QueuePool,
+        'pool_size': havuz_boyutu,
+        'max_overflow': 10,
+        'connect_args': {
+            'check_same_thread': False,
+            'timeout': pragmalar['busy_timeout'] / 1000,
+        },
+    }
+
+
+def pragmalari_kur(engine, profil=None):
+    pragmalar = profil_pragmalari(profil)
+
+    @event.listens_for(engine, 'connect')
+    def _pragmalari_uygula(dbapi_baglanti, baglanti_kaydi):
+        imlec = dbapi_baglanti.cursor()
+        for ad, deger in pragmalar.items():
+            imlec.execute(f'PRAGMA {ad} = {deger}')
+        imlec.close()
+
+    return engine
+
+
+def motor_olustur(url=VARSAYILAN_URL, profil=None, **secenekler):
+    ayarlar = motor_secenekleri(profil)
+    ayarlar.update(secenekler)
+    return pragmalari_kur(create_engine(url, **ayarlar), profil)
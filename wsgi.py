@@ -0,0 +1,4 @@
+from app import uygulama_olustur
+
+# gunicorn -c gunicorn.conf.py wsgi:app
+app = uygulama_olustur()
@@ -0,0 +1,336 @@
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from urllib.parse import urlencode, quote
+
+# Akşam yoğunluğunu taklit eden yük testi: çok sayıda eşzamanlı istemci,
+# yazma (teslimat ekle / tamamla) ve rapor okuma isteklerini belirlenen
+# oranlarda aynı SQLite dosyasına karşı gönderir.
+#
+#   python yuk_testi.py /tmp/bench.db --istemci 30 --sure 30
+#   python yuk_testi.py --adres 127.0.0.1:8000 --karisim ana_sayfa=5,teslimat_ekle=5
+#
+# Veritabanı verilirse geçici bir kopyası üzerinde gunicorn başlatılır; asıl
+# dosyaya yazılmaz. Kilit hataları sunucunun 503 (veritabanı meşgul)
+# yanıtlarıdır.
+
+VARSAYILAN_KARISIM = {
+    'ana_sayfa': 30,
+    'teslimat_ekle': 20,
+    'teslimat_tamamla': 15,
+    'kurye_performans': 15,
+    'teslimat_istatistikleri': 10,
+    'musteri_gecmis': 10,
+}
+
+
+class Havuz:
+    # İstemcilerin paylaştığı kurye ve devam eden teslimat id'leri
+    def __init__(self, adres, kuryeler, devam_edenler, telefonlar):
+        self.adres = adres
+        self.kuryeler = kuryeler
+        self.devam_edenler = list(devam_edenler)
+        self.telefonlar = telefonlar
+        self._kilit = threading.Lock()
+        self._son_doldurma = 0
+
+    def devam_eden_al(self, rastgele):
+        with self._kilit:
+            if not self.devam_edenler and time.monotonic() - self._son_doldurma > 0.5:
+                # Test sırasında eklenen teslimatlar da tamamlanabilsin
+                self._son_doldurma = time.monotonic()
+                try:
+                    self.devam_edenler = devam_eden_idler(self.adres)
+                except (OSError, http.client.HTTPException, ValueError):
+                    pass
+            if not self.devam_edenler:
+                return None
+            sira = rastgele.randrange(len(self.devam_edenler))
+            self.devam_edenler[sira], self.devam_edenler[-1] = self.devam_edenler[-1], self.devam_edenler[sira]
+            return self.devam_edenler.pop()
+
+
+def _form(govde):
+    return urlencode(govde), {'Content-Type': 'application/x-www-form-urlencoded'}
+
+
+def senaryo_istegi(ad, havuz, rastgele):
+    # (metot, yol, gövde, başlıklar) döner; uygun veri yoksa None
+    if ad == 'ana_sayfa':
+        return 'GET', rastgele.choice(['/', '/?durum=Devam+Ediyor', f'/?kurye_id={rastgele.choice(havuz.kuryeler)}']), None, {}
+    if ad == 'teslimat_ekle':
+        govde, basliklar = _form({
+            'kurye_id': rastgele.choice(havuz.kuryeler),
+            'adres': f'{rastgele.randint(1, 200)}. Sokak No:{rastgele.randint(1, 99)}',
+            'musteri_adi': 'Yük Testi',
+            'musteri_telefon': rastgele.choice(havuz.telefonlar),
+            'baslangic_zamani': datetime.now().strftime('%Y-%m-%dT%H:%M')
+        })
+        return 'POST', '/teslimat/ekle', govde, basliklar
+    if ad == 'teslimat_tamamla':
+        teslimat_id = havuz.devam_eden_al(rastgele)
+        if teslimat_id is None:
+            return None
+        govde, basliklar = _form({'ucret': rastgele.randint(30, 150)})
+        return 'POST', f'/teslimat/tamamla/{teslimat_id}', govde, basliklar
+    if ad == 'kurye_performans':
+        return 'GET', '/rapor/kurye-performans', None, {}
+    if ad == 'teslimat_istatistikleri':
+        return 'GET', '/rapor/teslimat-istatistikleri', None, {}
+    if ad == 'musteri_gecmis':
+        return 'GET', '/musteri/gecmis/' + quote(rastgele.choice(havuz.telefonlar)), None, {}
+    raise ValueError(f'Bilinmeyen senaryo: {ad}')
+
+
+def _json_getir(adres, yol):
+    baglanti = http.client.HTTPConnection(*adres, timeout=30)
+    try:
+        baglanti.request('GET', yol)
+        yanit = baglanti.getresponse()
+        return json.loads(yanit.read())
+    finally:
+        baglanti.close()
+
+
+def devam_eden_idler(adres):
+    return [t['id'] for t in _json_getir(adres, '/api/v1/teslimatlar?durum=Devam+Ediyor&alanlar=id&limit=200')['veri']]
+
+
+def havuz_hazirla(adres):
+    kuryeler = [k['id'] for k in _json_getir(adres, '/api/v1/kuryeler?alanlar=id&limit=200')['veri']]
+    son = _json_getir(adres, '/api/v1/teslimatlar?alanlar=musteri_telefon&limit=200')['veri']
+    telefonlar = sorted({t['musteri_telefon'] for t in son}) or ['0532 000 0000']
+    if not kuryeler:
+        raise SystemExit('Veritabanında aktif kurye yok; önce benchmark.py uret ile veri üretin')
+    return Havuz(adres, kuryeler, devam_eden_idler(adres), telefonlar)
+
+
+class Sonuclar:
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self.sureler = defaultdict(list)
+        self.durumlar = defaultdict(lambda: defaultdict(int))
+        self.baglanti_hatasi = defaultdict(int)
+
+    def ekle(self, ad, sure, durum):
+        with self._kilit:
+            self.sureler[ad].append(sure)
+            self.durumlar[ad][durum] += 1
+
+    def hata(self, ad):
+        with self._kilit:
+            self.baglanti_hatasi[ad] += 1
+
+
+def istemci_calistir(adres, karisim, havuz, sonuclar, bitis, tohum, isinma_bitisi):
+    rastgele = random.Random(tohum)
+    adlar = list(karisim)
+    agirliklar = [karisim[ad] for ad in adlar]
+    baglanti = http.client.HTTPConnection(*adres, timeout=60)
+    while time.monotonic() < bitis:
+        ad = rastgele.choices(adlar, agirliklar)[0]
+        istek = senaryo_istegi(ad, havuz, rastgele)
+        if istek is None:
+            time.sleep(0.01)
+            continue
+        metot, yol, govde, basliklar = istek
+        baslangic = time.monotonic()
+        try:
+            baglanti.request(metot, yol, body=govde, headers=basliklar)
+            yanit = baglanti.getresponse()
+            yanit.read()
+        except (OSError, http.client.HTTPException):
+            baglanti.close()
+            baglanti = http.client.HTTPConnection(*adres, timeout=60)
+            if baslangic >= isinma_bitisi:
+                sonuclar.hata(ad)
+            continue
+        if baslangic >= isinma_bitisi:
+            sonuclar.ekle(ad, time.monotonic() - baslangic, yanit.status)
+    baglanti.close()
+
+
+def yuzdelik(sirali, oran):
+    if not sirali:
+        return 0.0
+    # En yakın sıra yöntemi
+    return sirali[min(len(sirali) - 1, max(0, math.ceil(oran * len(sirali)) - 1))]
+
+
+def ozet(sonuclar, olcum_suresi):
+    satirlar = {}
+    hepsi = []
+    for ad, sureler in sorted(sonuclar.sureler.items()):
+        sureler.sort()
+        hepsi.extend(sureler)
+        durumlar = sonuclar.durumlar[ad]
+        adet = len(sureler)
+        kilit = durumlar.get(503, 0)
+        satirlar[ad] = {
+            'istek': adet,
+            'istek_saniye': round(adet / olcum_suresi, 2),
+            'p50_ms': round(yuzdelik(sureler, 0.50) * 1000, 2),
+            'p95_ms': round(yuzdelik(sureler, 0.95) * 1000, 2),
+            'p99_ms': round(yuzdelik(sureler, 0.99) * 1000, 2),
+            'kilit_hatasi': kilit,
+            'kilit_orani': round(kilit / adet, 4) if adet else 0,
+            'diger_hata': sum(n for d, n in durumlar.items() if d >= 500 and d != 503),
+            'baglanti_hatasi': sonuclar.baglanti_hatasi.get(ad, 0),
+            'durumlar': {str(d): n for d, n in sorted(durumlar.items())}
+        }
+    hepsi.sort()
+    toplam_kilit = sum(s['kilit_hatasi'] for s in satirlar.values())
+    genel = {
+        'istek': len(hepsi),
+        'istek_saniye': round(len(hepsi) / olcum_suresi, 2),
+        'p50_ms': round(yuzdelik(hepsi, 0.50) * 1000, 2),
+        'p95_ms': round(yuzdelik(hepsi, 0.95) * 1000, 2),
+        'p99_ms': round(yuzdelik(hepsi, 0.99) * 1000, 2),
+        'kilit_hatasi': toplam_kilit,
+        'kilit_orani': round(toplam_kilit / len(hepsi), 4) if hepsi else 0,
+        'diger_hata': sum(s['diger_hata'] for s in satirlar.values()),
+        'baglanti_hatasi': sum(s['baglanti_hatasi'] for s in satirlar.values()),
+    }
+    return genel, satirlar
+
+
+def _bos_port():
+    with socket.socket() as soket:
+        soket.bind(('127.0.0.1', 0))
+        return soket.getsockname()[1]
+
+
+def sunucu_baslat(veritabani, isci, is_parcacigi, isci_turu):
+    # Asıl dosyayı korumak için geçici kopya üzerinde gunicorn
+    if shutil.which('gunicorn') is None:
+        raise SystemExit('gunicorn bulunamadı; --adres ile çalışan bir sunucu verin')
+    dizin = tempfile.mkdtemp(prefix='kurye-yuk-')
+    kopya = os.path.join(dizin, 'kurye.db')
+    shutil.copyfile(veritabani, kopya)
+    port = _bos_port()
+    ortam = dict(os.environ)
+    ortam.update({
+        'KURYE_DB_URI': f'sqlite:///{kopya}',
+        'KURYE_BIND': f'127.0.0.1:{port}',
+        'KURYE_WORKERS': str(isci),
+        'KURYE_THREADS': str(is_parcacigi),
+        'KURYE_METRIK_DIZINI': os.path.join(dizin, 'metrikler'),
+    })
+    if isci_turu:
+        ortam['KURYE_WORKER_CLASS'] = isci_turu
+    proje = os.path.dirname(os.path.abspath(__file__))
+    surec = subprocess.Popen(
+        ['gunicorn', '-c', os.path.join(proje, 'gunicorn.conf.py'), '--access-logfile', '/dev/null', 'wsgi:app'],
+        cwd=proje, env=ortam, stdout=subprocess.DEVNULL, stderr=open(os.path.join(dizin, 'sunucu.log'), 'w')
+    )
+    adres = ('127.0.0.1', port)
+    for _ in range(100):
+        if surec.poll() is not None:
+            raise SystemExit(f'Sunucu başlatılamadı, bkz. {os.path.join(dizin, "sunucu.log")}')
+        try:
+            socket.create_connection(adres, timeout=0.2).close()
+            return surec, adres, dizin
+        except OSError:
+            time.sleep(0.1)
+    surec.terminate()
+    raise SystemExit('Sunucu zamanında açılmadı')
+
+
+def karisim_oku(metin):
+    if not metin:
+        return dict(VARSAYILAN_KARISIM)
+    karisim = {}
+    for parca in metin.split(','):
+        ad, _, agirlik = parca.partition('=')
+        ad = ad.strip()
+        if ad not in VARSAYILAN_KARISIM:
+            raise SystemExit(f'Bilinmeyen senaryo: {ad} (seçenekler: {", ".join(VARSAYILAN_KARISIM)})')
+        karisim[ad] = float(agirlik or 1)
+    return karisim
+
+
+def main(argumanlar=None):
+    ayristirici = argparse.ArgumentParser(description='Kurye Takip eşzamanlı yük testi')
+    ayristirici.add_argument('veritabani', nargs='?', help='Geçici kopyası üzerinde sunucu başlatılacak dosya')
+    ayristirici.add_argument('--adres', help='Zaten çalışan sunucu (host:port); verilirse sunucu başlatılmaz')
+    ayristirici.add_argument('--istemci', type=int, default=20, help='Eşzamanlı istemci sayısı')
+    ayristirici.add_argument('--sure', type=float, default=30, help='Ölçüm süresi (saniye)')
+    ayristirici.add_argument('--isinma', type=float, default=3, help='Ölçüme katılmayan ilk saniyeler')
+    ayristirici.add_argument('--karisim', help='ad=ağırlık,... (varsayılan: %s)' % ','.join(
+        f'{ad}={agirlik}' for ad, agirlik in VARSAYILAN_KARISIM.items()))
+    ayristirici.add_argument('--isci', type=int, default=2, help='Başlatılan sunucunun işçi sayısı')
+    ayristirici.add_argument('--is-parcacigi', type=int, default=4, help='İşçi başına iş parçacığı')
+    ayristirici.add_argument('--isci-turu', help='gthread veya gevent (varsayılan: gunicorn.conf.py)')
+    ayristirici.add_argument('--tohum', type=int, default=1)
+    ayristirici.add_argument('--cikti', help='Sonuçların yazılacağı JSON dosyası')
+    secenekler = ayristirici.parse_args(argumanlar)
+
+    karisim = karisim_oku(secenekler.karisim)
+    surec = dizin = None
+    if secenekler.adres:
+        host, _, port = secenekler.adres.rpartition(':')
+        adres = (host or '127.0.0.1', int(port))
+    elif secenekler.veritabani:
+        surec, adres, dizin = sunucu_baslat(secenekler.veritabani, secenekler.isci,
+                                           secenekler.is_parcacigi, secenekler.isci_turu)
+    else:
+        ayristirici.error('veritabani veya --adres gerekli')
+
+    try:
+        havuz = havuz_hazirla(adres)
+        sonuclar = Sonuclar()
+        baslangic = time.monotonic()
+        isinma_bitisi = baslangic + secenekler.isinma
+        bitis = isinma_bitisi + secenekler.sure
+        istemciler = [
+            threading.Thread(target=istemci_calistir, daemon=True, args=(
+                adres, karisim, havuz, sonuclar, bitis, secenekler.tohum * 1000 + i, isinma_bitisi))
+            for i in range(secenekler.istemci)
+        ]
+        for istemci in istemciler:
+            istemci.start()
+        for istemci in istemciler:
+            istemci.join()
+        olcum_suresi = time.monotonic() - isinma_bitisi
+    finally:
+        if surec is not None:
+            surec.send_signal(signal.SIGTERM)
+            surec.wait(30)
+            shutil.rmtree(dizin, ignore_errors=True)
+
+    genel, satirlar = ozet(sonuclar, olcum_suresi)
+    print(f'{secenekler.istemci} istemci, {olcum_suresi:.1f} sn, {genel["istek"]} istek, '
+          f'{genel["istek_saniye"]} istek/sn')
+    print(f'{"senaryo":26} {"istek":>7} {"ist/sn":>8} {"p50":>8} {"p95":>8} {"p99":>8} {"kilit%":>7} {"hata":>5}')
+    for ad, s in list(satirlar.items()) + [('TOPLAM', genel)]:
+        print(f'{ad:26} {s["istek"]:7} {s["istek_saniye"]:8.1f} {s["p50_ms"]:8.1f} {s["p95_ms"]:8.1f} '
+              f'{s["p99_ms"]:8.1f} {s["kilit_orani"] * 100:7.2f} {s["diger_hata"] + s["baglanti_hatasi"]:5}')
+    if secenekler.cikti:
+        with open(secenekler.cikti, 'w', encoding='utf-8') as dosya:
+            json.dump({
+                'ayarlar': {
+                    'istemci': secenekler.istemci, 'sure': secenekler.sure, 'karisim': karisim,
+                    'isci': secenekler.isci, 'is_parcacigi': secenekler.is_parcacigi,
+                    'isci_turu': secenekler.isci_turu, 'adres': secenekler.adres
+                },
+                'genel': genel,
+                'senaryolar': satirlar
+            }, dosya, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())